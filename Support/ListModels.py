@@ -0,0 +1,457 @@
+#!/usr/bin/env python3            #pylint: disable=invalid-name
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""[green]List model/view classes[black]<p>
+<p>
+Replacement for a QTableWidget list,  for large (filtered) tables:<p>
+- QueryTableModel only reads rows from the database as the view scrolls to them (canFetchMore/fetchMore),<p>
+  keeping plain python tuples instead of one QTableWidgetItem per cell<p>
+- rows are read fetch_size at a time,  each window by its own short query - so no read transaction is left open<p>
+  while the list is shown.  There is no separate SELECT COUNT(*),<p>
+  the total is only known once all rows were read,  and then cached for the next load of the same filter<p>
+- asynchronous models read rows in a db_async worker instead - the GUI stays responsive while a slow filter runs<p>
+- results are kept in a result cache when the model is reloaded,  and reused while their table is unchanged<p>
+- a completely read result can be narrowed in memory (narrow()),  without a new query - see TypeAhead.py<p>
+- ListTableView is a QTableView with the parts of the QTableWidget api used by list windows -<p>
+  cellClicked(row, col),  item(row, col).text(),  rowCount(),  columnCount()<p>
+<p>
+Used by Windows.ListWidget - see update_list_widget()
+"""
+
+#pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+#pylint:disable=unused-import, redefined-builtin
+#pylint:disable=invalid-name
+
+if "imports":
+    import sys
+    from collections import OrderedDict
+    from types import SimpleNamespace
+    try:
+        from Support.dev_tools import bp, log, print, console, inspect
+        from Support.db_methods import run_query, run_select, check_query_plan, result_version
+        from Support.db_async import submit_select
+    except ModuleNotFoundError:  # in case this module run solo
+        from dev_tools import bp, log, print, console, inspect
+        from db_methods import run_query, run_select, check_query_plan, result_version
+        from db_async import submit_select
+
+if __name__ == '__main__':
+    console.clear()
+    print(__doc__)
+    print("\n[red]ListModels.py module NOT written to be run alone\n")
+    sys.exit()
+
+if "more imports":
+    import PySide6.QtWidgets as W
+    import PySide6.QtCore as C
+    from PySide6.QtCore import Qt           #pylint:disable=no-name-in-module
+
+if "row counts":
+    """exact counts of completely read (table, where) results - used as total_hint by later loads
+    Note: only a hint for display - the model itself never relies on it"""
+    count_cache = {}   # (table, where) -> (result_version, count)
+    count_cache_size = 256
+
+def estimate_count(table_name, where_str, version):
+    """returns (count, exact) - cached exact count if still current,  else max(rowid) for an unfiltered table"""
+    cached_version, count = count_cache.get((table_name, where_str), (None, None))
+    if cached_version == version:
+        return count, True
+    if not where_str.strip():
+        query = run_select(F"SELECT max(rowid) FROM {table_name}")
+        count = query.value(0) or 0
+        query.finish()
+        return count, False
+    return None, False
+
+if "result cache":
+    """rows of recent list loads,  keyed on (table, where, fields, order) - so showing a window again does not re-run its query
+    - an entry is only used while result_version(table) is unchanged - ie no run_insert/update/delete on the table,
+      and no commit by another connection (PRAGMA data_version,  see db_methods.version_connection())
+    - partly read results are kept too - the model then continues with  OFFSET <cached rows>
+      every query gets key_column (id) as the last ORDER BY term (see unique_order_str()),  so continuing
+      neither skips nor repeats rows
+    - bounded by result_cache_bytes (estimated),  least recently used entries evicted first"""
+    result_cache = OrderedDict()      # key -> SimpleNamespace(version, headers_lst, rows, complete, size)
+    result_cache_bytes = 32 * 2**20
+    result_cache_stats = SimpleNamespace(hits=0, partial_hits=0, misses=0, stale=0, evictions=0, bytes=0)
+
+def unique_order_str(order_str, key_column="id"):
+    """order_str ('ORDER BY ...' or empty) with key_column added as the last term - a unique order,
+    so that rows continued with OFFSET are neither skipped nor repeated"""
+    order_str = order_str.strip()
+    return F"{order_str}, {key_column}" if order_str else F"ORDER BY {key_column}"
+
+def _estimate_bytes(rows):
+    """rows * average size of up to 64 sampled rows - tuples plus values"""
+    if not rows:
+        return 0
+    sample = rows[::max(1, len(rows) // 64)]
+    sampled = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in sample)
+    return 8 * len(rows) + sampled * len(rows) // len(sample)
+
+def _drop_result(key):
+    entry = result_cache.pop(key, None)
+    if entry is not None:
+        result_cache_stats.bytes -= entry.size
+
+def cached_result(key, version):
+    """returns cache entry for key,  or None if missing or out of date"""
+    entry = result_cache.get(key)
+    if entry is None:
+        result_cache_stats.misses += 1
+        return None
+    if entry.version != version:
+        result_cache_stats.stale += 1
+        _drop_result(key)
+        return None
+    result_cache.move_to_end(key)
+    if entry.complete:
+        result_cache_stats.hits += 1
+    else:
+        result_cache_stats.partial_hits += 1
+    return entry
+
+def store_result(key, version, headers_lst, rows, complete):
+    """rows is kept as is - the caller must not change it afterwards"""
+    _drop_result(key)
+    size = _estimate_bytes(rows)
+    if (not rows and not complete) or size > result_cache_bytes // 4:   # one huge list should not flush all others
+        return
+    result_cache[key] = SimpleNamespace(version=version, headers_lst=headers_lst, rows=rows, complete=complete, size=size)
+    result_cache_stats.bytes += size
+    while result_cache_stats.bytes > result_cache_bytes:
+        _drop_result(next(iter(result_cache)))
+        result_cache_stats.evictions += 1
+
+def print_result_cache_stats():
+    stats = result_cache_stats
+    total = stats.hits + stats.partial_hits + stats.misses + stats.stale
+    rate = 100 * (stats.hits + stats.partial_hits) / total if total else 0
+    print(F"[green]list results: {stats.hits} hits, {stats.partial_hits} partial hits, {stats.misses} misses, "
+          F"{stats.stale} out of date ({rate:.0f}% hit rate), {stats.evictions} evicted, "
+          F"{len(result_cache)} cached ~{stats.bytes / 2**20:.1f} MB")
+
+class QueryTableModel(C.QAbstractTableModel):
+    """Read only model for  SELECT fields FROM table WHERE filter ORDER BY order,  key_column
+    rows are read fetch_size at a time,  as the view needs them - each window by a query of its own
+    asynchronous  ->  the query runs in a db_async worker,  rows arrive through its signals
+    rows_loaded(loaded, total_hint, complete) is emitted after each fetch - total_hint is -1 when unknown
+    loading_changed(loading) while waiting for an asynchronous fetch,  load_failed(error_text) if the query failed"""
+
+    key_column = "id"   # unique column,  last term of every ORDER BY
+
+    rows_loaded = C.Signal(int, int, bool)
+    loading_changed = C.Signal(bool)
+    load_failed = C.Signal(str)
+
+    def __init__(self, fetch_size=256, asynchronous=False):
+        C.QAbstractTableModel.__init__(self)
+        self.fetch_size = fetch_size   # read ahead window,  in rows
+        self.asynchronous = asynchronous
+
+        self.table_name = ""
+        self.where_str = ""
+        self.fields_str = "*"
+        self.order_str = ""
+        self.headers_lst = []
+
+        self._select_str = None   # while more rows can be read - see _read_window()
+        self._handle = None       # db_async.AsyncSelect,  when asynchronous
+        self._fetching_all = False
+        self.loading = False
+        self._rows = []
+        self.total_hint = None    # see estimate_count()
+        self._key = None          # result cache key,  and table version when loaded
+        self._version = None
+        self.paged = False        # rows are one page of a larger result - see set_page()
+        self.page_sort = None     # page_sort(column_name, descending) replaces sort() while paged
+
+    # methods
+
+    def set_query(self, table_name, where_str="", fields_lst=None, order_str="", verbose=False):
+        """(re)load model - where_str is either empty or a complete ' WHERE ...' clause"""
+        self.beginResetModel()
+        self._close_query()
+
+        self.table_name = table_name
+        self.where_str = where_str
+        self.fields_str = ", ".join(fields_lst) if fields_lst else "*"
+        self.order_str = order_str
+
+        select_str = F"SELECT {self.fields_str} FROM {table_name} {where_str} {unique_order_str(order_str, self.key_column)}"
+        if verbose:
+            check_query_plan(select_str)
+        self._key = (table_name, where_str, self.fields_str, order_str)
+        self._version = result_version(table_name)
+        self.total_hint, _exact = estimate_count(table_name, where_str, self._version)
+
+        if "cached result":
+            entry = cached_result(self._key, self._version)
+            if entry is not None and entry.complete:
+                self.headers_lst = entry.headers_lst
+                self._rows = entry.rows    # not changed in place once complete - narrow() makes a new list
+                self.total_hint = len(self._rows)
+                self.endResetModel()
+                self.rows_loaded.emit(len(self._rows), len(self._rows), True)
+                return
+            if entry is not None:
+                self.headers_lst = entry.headers_lst
+                self._rows = list(entry.rows)
+
+        if self.asynchronous:   # continues after any cached rows
+            if not self._rows:
+                self.headers_lst = []   # until the worker reports them - see _async_columns()
+            self._handle = submit_select(select_str, None, self.fetch_size, 0 if self._rows else 1,
+                                         self._async_columns, self._async_rows, self._async_finished, self._async_failed,
+                                         True, len(self._rows))
+            self.endResetModel()
+            if self._rows:
+                self._emit_rows_loaded()
+            else:
+                self._set_loading(True)
+            return
+
+        if "rows are read by fetchMore() - after any cached rows":
+            self._select_str = select_str
+            if not self._rows:   # first window of rows,  so list is not empty until the view asks
+                self.headers_lst, self._rows, exhausted = self._read_window()
+                if exhausted:
+                    self._query_exhausted()
+
+        self.endResetModel()
+        self._emit_rows_loaded()
+
+    def set_page(self, table_name, where_str, headers_lst, rows):
+        """show one page of rows read by db_methods.run_select_page() - nothing more is fetched
+        header clicks call self.page_sort,  if set,  so the pager can restart paging in the new order"""
+        self.beginResetModel()
+        self._close_query()
+        self.table_name = table_name
+        self.where_str = where_str
+        self.headers_lst = headers_lst
+        self._rows = rows
+        self.paged = True
+        self.total_hint = None
+        self.endResetModel()
+        self.rows_loaded.emit(len(rows), -1, False)
+
+    def _close_query(self):
+        """keeps the rows read so far in the result cache,  then stops the query"""
+        if self._key is not None:
+            store_result(self._key, self._version, self.headers_lst, self._rows, self.is_complete())
+            self._key = None
+        if self._handle is not None:
+            self._handle.cancel()
+        self._select_str = None
+        self._handle = None
+        self._rows = []
+        self.paged = False
+        self._set_loading(False)
+
+    def _set_loading(self, loading):
+        if loading != self.loading:
+            self.loading = loading
+            self.loading_changed.emit(loading)
+
+    def _read_window(self):
+        """the next fetch_size rows,  read by a query of their own that is finished at once -
+        so no read transaction stays open between fetches - returns (headers_lst, rows, exhausted)"""
+        query = run_query(F"{self._select_str} LIMIT {self.fetch_size + 1} OFFSET {len(self._rows)}",
+                          None, None, "forward only")
+        record = query.record()
+        columns = record.count()
+        rows = []
+        while len(rows) <= self.fetch_size and query.next():   # one row more tells if there are more
+            rows.append(tuple(query.value(col) for col in range(columns)))
+        query.finish()
+        return [record.fieldName(col) for col in range(columns)], rows[:self.fetch_size], len(rows) <= self.fetch_size
+
+    def _query_exhausted(self):
+        """all rows read - remember exact count"""
+        self._select_str = None
+        self._remember_count()
+
+    def _remember_count(self):
+        if len(count_cache) >= count_cache_size:
+            count_cache.pop(next(iter(count_cache)))
+        count_cache[(self.table_name, self.where_str)] = (self._version, len(self._rows))
+        self.total_hint = len(self._rows)
+
+    def _emit_rows_loaded(self):
+        total_hint = -1 if self.total_hint is None else max(self.total_hint, len(self._rows))
+        self.rows_loaded.emit(len(self._rows), total_hint, self.is_complete())
+
+    def is_complete(self):
+        """True when every row of the current query is in memory"""
+        return bool(self.table_name) and self._select_str is None and self._handle is None and not self.paged
+
+    def narrow(self, keep, where_str):
+        """keep only rows for which keep(row_values) is True,  without querying again
+        only valid when is_complete(),  and where_str selects a subset of the current where_str"""
+        self.beginResetModel()
+        self._rows = [row for row in self._rows if keep(row)]
+        self.where_str = where_str
+        self._key = (self.table_name, where_str, self.fields_str, self.order_str)
+        self._remember_count()
+        self.endResetModel()
+        self.rows_loaded.emit(len(self._rows), len(self._rows), True)
+
+    def fetch_all(self):
+        """read any remaining rows - only for consumers that really need the whole list"""
+        if self._handle is not None:
+            self._fetching_all = True
+            self._set_loading(True)
+            self._handle.request_all()
+            while self._handle is not None:   # rows still arrive through (queued) signals,  user input waits
+                C.QCoreApplication.processEvents(C.QEventLoop.WaitForMoreEvents | C.QEventLoop.ExcludeUserInputEvents)
+            self._fetching_all = False
+        while self.canFetchMore(C.QModelIndex()):
+            self.fetchMore(C.QModelIndex())
+
+    # db_async slots - signals of a replaced (cancelled) query may still be queued,  so check sender first
+
+    def _current_sender(self):
+        return self._handle is not None and self.sender() is self._handle.signals
+
+    def _async_columns(self, names_lst):
+        if self._current_sender() and names_lst != self.headers_lst:
+            self.beginResetModel()
+            self.headers_lst = names_lst
+            self.endResetModel()
+
+    def _async_rows(self, rows_lst):
+        if not self._current_sender():
+            return
+        if rows_lst:
+            first = len(self._rows)
+            self.beginInsertRows(C.QModelIndex(), first, first + len(rows_lst) - 1)
+            self._rows.extend(rows_lst)
+            self.endInsertRows()
+        if len(rows_lst) < self.fetch_size:   # finished() follows right away
+            return
+        self._emit_rows_loaded()
+        if not self._fetching_all:
+            self._set_loading(False)
+
+    def _async_finished(self, _total, cancelled):
+        if not self._current_sender():
+            return
+        self._handle = None
+        if cancelled:
+            self._key = None   # rows so far would look like a complete result
+        else:
+            self._remember_count()
+        self.rows_loaded.emit(len(self._rows), len(self._rows), not cancelled)
+        self._set_loading(False)
+
+    def _async_failed(self, error_str):
+        if not self._current_sender():
+            return
+        self._handle = None
+        self._key = None   # rows so far would look like a complete result - the next load must query again
+        print(F"[red]list query failed - {error_str}")
+        self._set_loading(False)
+        self.load_failed.emit(error_str)
+
+    def row_values(self, row):
+        return self._rows[row]
+
+    def display_text(self, row, col):
+        value = self._rows[row][col]
+        return "" if value is None else str(value)
+
+    # QAbstractTableModel
+
+    def rowCount(self, parent=C.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=C.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers_lst)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.display_text(index.row(), index.column())
+        if role == Qt.TextAlignmentRole and index.column() == 0:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self.headers_lst):
+            return self.headers_lst[section]
+        return C.QAbstractTableModel.headerData(self, section, orientation, role)
+
+    def canFetchMore(self, parent=C.QModelIndex()):
+        if parent.isValid():
+            return False
+        if self.asynchronous:
+            return self._handle is not None and not self.loading
+        return self._select_str is not None
+
+    def fetchMore(self, parent=C.QModelIndex()):
+        if self.asynchronous:
+            self._set_loading(True)
+            self._handle.request_more()
+            return
+
+        _headers_lst, new_rows, exhausted = self._read_window()
+        if new_rows:
+            first = len(self._rows)
+            self.beginInsertRows(C.QModelIndex(), first, first + len(new_rows) - 1)
+            self._rows.extend(new_rows)
+            self.endInsertRows()
+        if exhausted:
+            self._query_exhausted()
+        self._emit_rows_loaded()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """re-query with ORDER BY,  instead of sorting rows in memory"""
+        if not self.table_name or not 0 <= column < len(self.headers_lst):
+            return
+        if self.paged and self.page_sort is not None:
+            self.page_sort(self.headers_lst[column], order == Qt.DescendingOrder)
+            return
+        direction_str = "DESC" if order == Qt.DescendingOrder else "ASC"
+        order_str = F"ORDER BY {self.headers_lst[column]} {direction_str}"
+        if order_str != self.order_str:
+            self.set_query(self.table_name, self.where_str, self.fields_str.split(", ") if self.fields_str != "*" else None, order_str)
+
+class ListTableView(W.QTableView):
+    """QTableView for a QueryTableModel,   compatible with the QTableWidget calls used by list windows"""
+
+    cellClicked = C.Signal(int, int)  # row, col - same as QTableWidget.cellClicked
+    painted = C.Signal()              # after each paint of the rows - used to measure keystroke to paint latency
+
+    def __init__(self, model=None):
+        W.QTableView.__init__(self)
+        self.setModel(model if model is not None else QueryTableModel())
+
+        self.setSelectionBehavior(W.QAbstractItemView.SelectRows)
+        self.setEditTriggers(W.QAbstractItemView.NoEditTriggers)
+        self.verticalHeader().setSectionResizeMode(W.QHeaderView.Fixed)   # uniform rows,  no per row size hints
+        self.horizontalHeader().setSectionsClickable(True)
+        self.horizontalHeader().setSortIndicatorShown(True)
+        self.horizontalHeader().sortIndicatorChanged.connect(lambda column, order: self.model().sort(column, order))
+
+        self.clicked.connect(lambda index: self.cellClicked.emit(index.row(), index.column()))
+
+    def paintEvent(self, event):
+        W.QTableView.paintEvent(self, event)
+        self.painted.emit()
+
+    # QTableWidget compatible methods
+
+    def rowCount(self):
+        return self.model().rowCount()
+
+    def columnCount(self):
+        return self.model().columnCount()
+
+    def item(self, row, col):
+        return W.QTableWidgetItem(self.model().display_text(row, col))
+
+    def fetch_all(self):
+        self.model().fetch_all()
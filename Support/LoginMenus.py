@@ -50,7 +50,14 @@ if "imports":
 
     import Support.msg_boxes as mbx
     import Support.screen_info as scr
-    from Support.Windows import ToolWindow, MenuWindow, prj, win, icn
+    from Support.Windows import ToolWindow, MenuWindow, prj, win, icn, oxygen_folder
+
+if "icons":
+    icn.add(
+        passwords=F"{oxygen_folder}/apps/preferences-desktop-user-password.png",
+        document_save=F"{oxygen_folder}/actions/document-save.png",
+        document_reload=F"{oxygen_folder}/actions/document-revert.png",
+        )
 
 class LoginMenuBase():
     """Add [login/Logout], Root options to menubar
@@ -193,8 +200,6 @@ class DecryptPasswords():    # add load and decrypt file into prj.passwords_list
     """
     def __init__(self):
         """ """
-        icn.passwords = G.QIcon("/usr/share/icons/oxygen/base/32x32/apps/preferences-desktop-user-password.png")
-
         self.get_password_list() # from encrypted file
 
         # edit password list
@@ -372,11 +377,6 @@ class PasswordEditor(ToolWindow):
     def __init__(self):
         ToolWindow.__init__(self)
 
-        # icons
-
-        icn.document_save = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/document-save.png")
-        icn.document_reload = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/document-revert.png")
-
         #attributes
 
         self.setWindowTitle("Passwords Editor")
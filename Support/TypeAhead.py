@@ -0,0 +1,198 @@
+#!/usr/bin/env python3            #pylint: disable=invalid-name
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""[green]Type ahead filtering of a ListTableView[black]<p>
+<p>
+Instead of reloading the list on every key release:<p>
+- keystrokes only (re)start a debounce timer - the list is refreshed once the user pauses typing<p>
+- a refresh that is superseded by a newer keystroke is dropped,  and the query still streaming rows<p>
+  for the previous filter is finished when the new one is opened<p>
+- when the new filters only extend the prefixes of the rows on display,  and all of those rows were read,<p>
+  the rows are narrowed in memory (QueryTableModel.narrow()),  without another query<p>
+- each refresh records its keystroke to paint latency - see print_stats()<p>
+<p>
+Usage - see FormListWindowDemo in single_table_template.py
+"""
+
+#pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+#pylint:disable=unused-import, redefined-builtin
+#pylint:disable=invalid-name
+
+if "imports":
+    import sys
+    import time
+    import string
+    from collections import deque
+    from types import SimpleNamespace
+    try:
+        from Support.dev_tools import bp, log, print, console, inspect
+    except ModuleNotFoundError:  # in case this module run solo
+        from dev_tools import bp, log, print, console, inspect
+
+if __name__ == '__main__':
+    console.clear()
+    print(__doc__)
+    print("\n[red]TypeAhead.py module NOT written to be run alone\n")
+    sys.exit()
+
+if "more imports":
+    import PySide6.QtCore as C
+
+if "prefix filters":
+    """{column: typed text} filters,  matched from the begining of each field - same as  column LIKE 'text%'
+    Note: sqlite LIKE only ignores case for ascii letters,  so in memory matching only folds ascii case too"""
+    _ascii_lower = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+    _like_wildcards = ("%", "_")
+
+def clean_filters(filters_dict):
+    """drops empty fields,  strips the rest"""
+    return {column: text.strip() for column, text in filters_dict.items() if text.strip()}
+
+def prefix_filter_str(filters_dict, exact_columns=("id",)):
+    """{column: text} -> "column LIKE 'text%' AND ..."  -  exact_columns are compared with ="""
+    parts = []
+    for column, text in clean_filters(filters_dict).items():
+        if column in exact_columns:
+            parts.append(F"{column} = {int(text)}" if text.isdigit() else F"{column} = '{text.replace(chr(39), chr(39)*2)}'")
+        else:
+            parts.append(F"{column} LIKE '{text.replace(chr(39), chr(39)*2)}%'")
+    return " AND ".join(parts)
+
+def is_refinement(old_dict, new_dict, exact_columns=("id",)):
+    """True if every row matching new_dict also matches old_dict - ie each old prefix was only extended"""
+    for column, text in new_dict.items():
+        if any(wildcard in text for wildcard in _like_wildcards):
+            return False
+    for column, text in old_dict.items():
+        new_text = new_dict.get(column)
+        if new_text is None:
+            return False
+        if column in exact_columns:
+            if new_text != text:
+                return False
+        elif not new_text.translate(_ascii_lower).startswith(text.translate(_ascii_lower)):
+            return False
+    return True
+
+class TypeAhead(C.QObject):
+    """debounced type ahead for a ListTableView
+    load(filters_dict) is called to (re)query the list,  when the rows on display can not just be narrowed
+    refreshed(sample) is emitted once the refreshed list was painted - see latency_samples"""
+
+    refreshed = C.Signal(dict)
+
+    def __init__(self, view, load, debounce_ms=150, narrow=True, exact_columns=("id",), verbose=False):
+        C.QObject.__init__(self)
+        self.view = view
+        self.load = load
+        self.narrow = narrow
+        self.exact_columns = exact_columns
+        self.verbose = verbose
+
+        self.timer = C.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self.refresh)
+
+        self._pending_dict = {}
+        self._keystroke_time = None
+        self._shown = None           # (filters_dict, model table_name, model where_str) of the rows on display
+        self._paint_pending = None   # latency sample waiting for the next paint
+
+        self.stats = SimpleNamespace(keystrokes=0, superseded=0, unchanged=0, narrowed=0, queried=0)
+        self.latency_samples = deque(maxlen=200)
+
+        self.view.painted.connect(self._painted)
+
+    # methods
+
+    def request(self, filters_dict):
+        """call on every keystroke - refresh happens debounce_ms after the last one"""
+        self.stats.keystrokes += 1
+        if self.timer.isActive():
+            self.stats.superseded += 1
+        self._pending_dict = dict(filters_dict)
+        self._keystroke_time = time.perf_counter()
+        self.timer.start()
+
+    def cancel(self):
+        """drop a pending refresh - eg when the list is reloaded some other way"""
+        self.timer.stop()
+        self._paint_pending = None
+        self._shown = None
+
+    def refresh(self):
+        self.timer.stop()
+        model = self.view.model()
+        filters_dict = clean_filters(self._pending_dict)
+        start = time.perf_counter()
+        keystroke_time = self._keystroke_time or start
+
+        shown_still_valid = self._shown is not None and self._shown[1:] == (model.table_name, model.where_str)
+        if shown_still_valid and filters_dict == self._shown[0]:
+            self.stats.unchanged += 1   # eg arrow,  shift or tab keys
+            return
+
+        if self.narrow and shown_still_valid and model.is_complete() and self._narrow_model(model, self._shown[0], filters_dict):
+            mode = "narrowed"
+            self.stats.narrowed += 1
+        else:
+            mode = "queried"
+            self.stats.queried += 1
+            self.load(filters_dict)
+
+        self._shown = (filters_dict, model.table_name, model.where_str)
+        self._paint_pending = SimpleNamespace(mode=mode, keystroke_time=keystroke_time, start=start, end=time.perf_counter())
+        self.view.viewport().update()
+
+    def _narrow_model(self, model, old_dict, new_dict):
+        if not is_refinement(old_dict, new_dict, self.exact_columns):
+            return False
+        prefixes_lst = []
+        for column, text in new_dict.items():
+            if column in old_dict and (column in self.exact_columns or old_dict[column] == text):
+                continue   # rows on display already match
+            if column in self.exact_columns or column not in model.headers_lst:
+                return False   # new exact match (a primary key lookup anyway),  or column not in the list
+            prefixes_lst.append((model.headers_lst.index(column), text.translate(_ascii_lower)))
+
+        def keep(row):
+            for col, prefix in prefixes_lst:
+                value = row[col]
+                if value is None or not str(value).translate(_ascii_lower).startswith(prefix):
+                    return False
+            return True
+
+        filter_str = prefix_filter_str(new_dict, self.exact_columns)
+        model.narrow(keep, F" WHERE {filter_str}" if filter_str else "")   # same where_str as update_list_widget()
+        return True
+
+    def _painted(self):
+        pending = self._paint_pending
+        if pending is None or self.view.model().loading:   # background query - wait for the paint of its first rows
+            return
+        self._paint_pending = None
+        now = time.perf_counter()
+        sample = {
+            "mode": pending.mode,
+            "rows": self.view.model().rowCount(),
+            "debounce_ms": (pending.start - pending.keystroke_time) * 1000,
+            "refresh_ms": (pending.end - pending.start) * 1000,
+            "paint_ms": (now - pending.end) * 1000,
+            "keystroke_to_paint_ms": (now - pending.keystroke_time) * 1000,
+            }
+        self.latency_samples.append(sample)
+        if self.verbose:
+            print(F"[blue]type ahead {sample['mode']}: {sample['rows']} rows,  {sample['keystroke_to_paint_ms']:.0f} ms keystroke to paint "
+                  F"({sample['refresh_ms']:.1f} ms refresh)")
+        self.refreshed.emit(sample)
+
+    def print_stats(self):
+        print(F"[green]type ahead: {self.stats.keystrokes} keystrokes, {self.stats.superseded} debounced, "
+              F"{self.stats.unchanged} unchanged, {self.stats.narrowed} narrowed in memory, {self.stats.queried} queried")
+        for mode in ("narrowed", "queried"):
+            latencies = sorted(sample["keystroke_to_paint_ms"] for sample in self.latency_samples if sample["mode"] == mode)
+            if latencies:
+                print(F"[green]  {mode}: keystroke to paint median {latencies[len(latencies)//2]:.0f} ms, "
+                      F"p95 {latencies[int(len(latencies)*0.95)]:.0f} ms, max {latencies[-1]:.0f} ms")
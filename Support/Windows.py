@@ -43,28 +43,136 @@ if __name__ == '__main__':
 if "more imports":
 
     from types import SimpleNamespace
+    from collections import OrderedDict
+    from functools import partial
     import os
-    import subprocess
+    import time
 
     try:                                     # where $pwd == project folder
         import Support.screen_info as scr
         import Support.msg_boxes as mbx
-        from Support.db_methods import run_select
+        from Support.db_methods import run_select, run_select_page
+        from Support.ListModels import ListTableView, QueryTableModel
+        from Support.lazy_imports import LazyModule
     except ModuleNotFoundError:              # where used locally in Support folder
         import screen_info as scr
         import msg_boxes as mbx
-        from db_methods import run_select
+        from db_methods import run_select, run_select_page
+        from ListModels import ListTableView, QueryTableModel
+        from lazy_imports import LazyModule
 
     import PySide6.QtWidgets as W
     import PySide6.QtCore as C
     import PySide6.QtGui as G
-    import PySide6.QtPrintSupport as P
     from PySide6.QtCore import Qt           #pylint:disable=no-name-in-module
 
+if "deferred imports - printing and help paths,  imported on first use,  see lazy_imports.py":
+    P = LazyModule("PySide6.QtPrintSupport")
+    screen_print = LazyModule("Support.screen_print", "screen_print")
+    subprocess = LazyModule("subprocess")
+
+class LazyNamespace(SimpleNamespace):
+    """SimpleNamespace whose entries can also be registered as factories,  built on first access
+        prj.register("list_window_demo", ListWindowDemo)
+        self.next_win_handler(prj.list_window_demo)    # ListWindowDemo() runs here,  the first time only
+    once built,  an entry is a plain attribute - later accesses cost nothing extra"""
+
+    def __init__(self, **kwargs):
+        SimpleNamespace.__init__(self, **kwargs)
+        object.__setattr__(self, "_factories", {})      # name -> factory,  until built
+        object.__setattr__(self, "build_ms", {})        # name -> milliseconds taken by its factory
+
+    def register(self, name, factory):
+        self.__dict__.pop(name, None)
+        self._factories[name] = factory
+
+    def pending(self):
+        """names registered but not built yet"""
+        return list(self._factories)
+
+    def build(self, name):
+        factory = self._factories.pop(name)
+        start = time.perf_counter()
+        value = factory()
+        self.build_ms[name] = (time.perf_counter() - start) * 1000
+        setattr(self, name, value)
+        return value
+
+    def __getattr__(self, name):   # only called for names not (yet) set
+        if name in self.__dict__.get("_factories", {}):
+            return self.build(name)
+        raise AttributeError(F"namespace has no attribute '{name}'")
+
+    def __repr__(self):
+        items = (F"{key}={value!r}" for key, value in self.__dict__.items() if key not in ("_factories", "build_ms"))
+        return F"{type(self).__name__}({', '.join(items)})"
+
+def prewarm(namespaces_lst, delay_ms=500, verbose=False):
+    """builds pending entries of namespaces_lst one at a time,  each from a zero timer - ie when the event loop is idle
+    call after the main window is shown:  first paint is not delayed,  and the first visit of each window is instant
+    an entry already built by then (the user was faster) is simply skipped"""
+    pending_lst = [(namespace, name) for namespace in namespaces_lst for name in namespace.pending()]
+
+    def build_next():
+        while pending_lst:
+            namespace, name = pending_lst.pop(0)
+            if name in namespace.pending():
+                namespace.build(name)
+                if verbose:
+                    print(F"[blue]pre-built {name} in {namespace.build_ms[name]:.0f} ms")
+                break
+        if pending_lst:
+            C.QTimer.singleShot(0, build_next)   # let queued input and paints run between windows
+
+    C.QTimer.singleShot(delay_ms, build_next)
+
+if "icons":
+    oxygen_folder = "/usr/share/icons/oxygen/base/32x32"
+    icon_stats = SimpleNamespace(loads=0, pixmap_hits=0, fallbacks=0, missing=0, load_ms=0.0)
+
+def load_icon(path):
+    """QIcon of the image file at path - its pixmap is shared through QPixmapCache,  so names with the same file load it once
+    if path does not exist (eg no oxygen theme installed),  the file of the same name in Support/images is used,  if any"""
+    start = time.perf_counter()
+    if not os.path.exists(path):
+        fallback_path = os.path.join(prj.images_folder, os.path.basename(path))
+        if os.path.exists(fallback_path):
+            icon_stats.fallbacks += 1
+            path = fallback_path
+        else:
+            icon_stats.missing += 1   # an empty icon,  as G.QIcon(path) would give - check_environ reports a missing theme
+            return G.QIcon()
+    pixmap = G.QPixmapCache.find(path)
+    if pixmap is None:
+        pixmap = G.QPixmap(path)
+        G.QPixmapCache.insert(path, pixmap)
+        icon_stats.loads += 1
+    else:
+        icon_stats.pixmap_hits += 1
+    icon_stats.load_ms += (time.perf_counter() - start) * 1000
+    return G.QIcon(pixmap)
+
+class IconRegistry(LazyNamespace):
+    """icn - icons by name,  each loaded by load_icon() on first use,  then a plain attribute
+        icn.add(print_screen=F"{oxygen_folder}/actions/document-print-direct.png")   # once,  at module level
+        self.print_screen_act.setIcon(icn.print_screen)
+    icn.name = G.QIcon(...) still works,  for icons made some other way"""
+
+    def add(self, **paths):
+        """registers name=path pairs - names already added or set are left as they are"""
+        for name, path in paths.items():
+            if name not in self.__dict__ and name not in self._factories:
+                self.register(name, partial(load_icon, path))
+
+def print_icon_stats():
+    print(F"[blue]icons: {len(icn.build_ms)} used,  {len(icn.pending())} not used yet,  "
+          F"{icon_stats.loads} files loaded,  {icon_stats.pixmap_hits} from QPixmapCache,  "
+          F"{icon_stats.fallbacks} from Support/images,  {icon_stats.missing} missing,  {icon_stats.load_ms:.1f} ms")
+
 if "create global namespaces":
-    prj = SimpleNamespace()
-    win = SimpleNamespace()
-    icn = SimpleNamespace()
+    prj = LazyNamespace()   # project windows and state -  windows registered as factories,  see LazyNamespace
+    win = LazyNamespace()
+    icn = IconRegistry()    # icons by name,  loaded on first use - see IconRegistry
 
 if "set default fonts":
     prj.serifFont = G.QFont("Times", 16)
@@ -88,6 +196,31 @@ if "locale":
 if "images":
     prj.images_folder = F"{os.getcwd()}/Support/images"
 
+if "icons of the classes below":
+    icn.add(
+        previous_win=F"{oxygen_folder}/actions/go-previous.png",
+        about_win=F"{oxygen_folder}/categories/system-help.png",
+        readme=F"{oxygen_folder}/mimetypes/text-x-readme.png",
+        about_qt="/usr/share/doc/qt/global/template/images/Qt-logo.png",
+        quit=F"{oxygen_folder}/actions/application-exit.png",
+        default_icon="/usr/share/doc/qt6/global/template/images/spinner.gif",   # or F"{oxygen_folder}/actions/draw-star.png"
+        qt_logo="/usr/share/doc/qt/global/template/images/logo.png",
+        cancel=F"{oxygen_folder}/actions/dialog-cancel.png",
+        insert=F"{oxygen_folder}/actions/document-save.png",                  # insert new record
+        update=F"{oxygen_folder}/actions/edit-text-frame-update.png",         # update current record
+        undo=F"{oxygen_folder}/actions/edit-undo.png",                        # undo any unsaved updates
+        delete=F"{oxygen_folder}/actions/archive-remove.png",
+        open_new_form=F"{oxygen_folder}/actions/list-add.png",                # open new record input form
+        remove_filter=F"{prj.images_folder}/list-unfilter.png",
+        run_filter=F"{prj.images_folder}/list-filter.png",                    # open filtered list window
+        first_page=F"{oxygen_folder}/actions/go-top.png",
+        previous_page=F"{oxygen_folder}/actions/go-up.png",
+        next_page=F"{oxygen_folder}/actions/go-down.png",
+        print_screen=F"{oxygen_folder}/actions/document-print-direct.png",
+        print_document=F"{oxygen_folder}/actions/document-print.png",
+        print_preview=F"{oxygen_folder}/actions/document-print-preview.png",
+        )
+
 class WinStack():
     """window navigation handler provides
      a stack for object addresses of all windows created in a project,  where all are automatically hidden except for the last
@@ -95,8 +228,8 @@ class WinStack():
      next_win_handler(window) method to open a new window and hide previous
     """
     def __init__(self):
-        icn.previous_win = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/go-previous.png")
-        win.win_stack = [] # current window stack - must be in project scope namespace to work
+        if not hasattr(win, "win_stack"):   # windows can be built later,  on first use - keep the stack of those already open
+            win.win_stack = [] # current window stack - must be in project scope namespace to work
 
         if "previous window action":  # see corresponding handler note below """
             self.previous_win_act = G.QAction()
@@ -143,16 +276,6 @@ class Window(W.QWidget, WinStack):
         self.setGeometry(scr.window_rect)
         self.setWindowTitle("self.setWindowTitle() - Basic Window")
 
-        # icons
-
-        icn.about_win = G.QIcon("/usr/share/icons/oxygen/base/32x32/categories/system-help.png")
-        icn.readme = G.QIcon("/usr/share/icons/oxygen/base/32x32/mimetypes/text-x-readme.png")
-        icn.about_qt = G.QIcon("/usr/share/doc/qt/global/template/images/Qt-logo.png")
-        icn.quit = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/application-exit.png")
-
-        #icn.default_icon = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/draw-star.png")
-        icn.default_icon = G.QIcon("/usr/share/doc/qt6/global/template/images/spinner.gif")
-
         # QGridLayout window layout for all content
 
         #assumes all children windows will use QGridLayout for menubars, toolbars and content widgets etc
@@ -227,7 +350,6 @@ class MenuWindow(Window):
     def __init__(self):
         Window.__init__(self)
 
-        icn.qt_logo = G.QIcon("/usr/share/doc/qt/global/template/images/logo.png")
         pixmap = G.QPixmap(G.QImage("/usr/share/doc/qt/global/template/images/logo.png"))
 
         #  quit QAction
@@ -288,20 +410,6 @@ class ToolWindow(Window):
 
         self.list_font = G.QFont("Times", 12)
 
-        # icons
-
-        icn.cancel = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/dialog-cancel.png")
-
-        icn.insert = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/document-save.png")  # insert new record
-        icn.update = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/edit-text-frame-update.png") # update current record
-        icn.undo = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/edit-undo.png") # undo any unsaved updates
-        icn.delete = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/archive-remove.png")
-
-        icn.open_new_form = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/list-add.png") # open new record input form
-        #icn.open_filters_form_icn = "/usr/share/icons/oxygen/base/32x32/actions/view-filter.png"
-
-        icn.remove_filter = G.QIcon(F"{prj.images_folder}/list-unfilter.png")
-        icn.run_filter = G.QIcon(F"{prj.images_folder}/list-filter.png")     # open filtered list window
 
         # create right side toolbar
 
@@ -459,20 +567,32 @@ class FormWidget():
 
 class ListWidget():
     """List Widget class
-    include generic function to populate list_widget,   given table, filter, fields, widths"""
+    include generic function to populate list_widget,   given table, filter, fields, widths
+    Note: list_widget is a ListTableView - rows are only read from the database as they are scrolled into view,
+    by a background worker (db_async),  so a slow filter shows "loading..." instead of freezing the window
+    but item(row, col).text(), rowCount(), columnCount() and cellClicked(row, col) work as with a QTableWidget"""
     def __init__(self):
 
-        self.list_widget = W.QTableWidget()  # Note: actual cols and rows are set in children classes
+        self.list_widget = ListTableView(QueryTableModel(asynchronous=True))  # Note: actual cols and rows are set by update_list_widget()
         self.list_widget.setFont(self.list_font)
+        self.list_widths_lst = []
 
         self.list_header = W.QLabel()
         self.list_header.font().setBold(True)
         self.list_header.setText("subclass self.list_header.setText() - Click on row to open corresponding record")
 
+        self.list_count_lbl = W.QLabel()   # rows loaded so far,  and total when known
+        self.list_count_lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
         self.list_widget.cellClicked.connect(self.list_widget_click_handler)
+        self.list_widget.model().rows_loaded.connect(self.update_list_count)
+        self.list_widget.model().loading_changed.connect(self.update_list_loading)
+        self.list_widget.model().load_failed.connect(self.update_list_failed)
+        self.list_widget.model().modelReset.connect(self.set_list_column_widths)   # columns of a background query arrive later
 
-    def update_list_widget(self, table_name,  filter_str="", table_fields_lst=None, widths_lst=None, verbose=False):
+    def update_list_widget(self, table_name,  filter_str="", table_fields_lst=None, widths_lst=None, verbose=False, order_str=""):
         """this is a generic function to fill self.list_widget,   depending on table, filter, fields, widths
+        order_str  ->  eg "ORDER BY paterno" - rows in table order if empty
         Assumes single table only - will need to subclass for multi table queries
         """
         if "adjust filter string":
@@ -483,53 +603,39 @@ class ListWidget():
                 else:
                     filter_str = ""
 
-        if "get total rows":
-            query = run_select(F"SELECT COUNT (*) FROM {table_name} {filter_str}", verbose)
-            total_rows = query.value(0)
-
-        if "adjust table_fields string and list":
-            if not table_fields_lst:  # == None or []
-                table_fields_lst = []
-                table_fields_str = '*'  # all fields
-            else:
-                table_fields_str = ', '.join(table_fields_lst)
-
-        if "get indicated records":
-            query = run_select(F"SELECT {table_fields_str} FROM {table_name} {filter_str}", verbose)
-            total_columns = query.record().count()
-
-        if table_fields_str == '*':
-            for col in range(total_columns):
-                table_fields_lst.append(query.record().fieldName(col))
-
-        if "recreate table rows, cols and headers":
-            self.list_widget.setRowCount(total_rows)
-            self.list_widget.setColumnCount(total_columns)
-            self.list_widget.setHorizontalHeaderLabels(table_fields_lst)
+        if "load model - only first rows are read here,  no SELECT COUNT(*)":
+            self.list_widget.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+            self.list_widget.model().set_query(table_name, filter_str, table_fields_lst, order_str, verbose)
 
         if "set column widths":
-            if widths_lst is None:
-                widths_lst = []
-
-            #for col in range(len(widths_lst)):
-            #    self.list_widget.setColumnWidth(col, widths_lst[col])
-
-            for tpl in enumerate(widths_lst):
-                col, width = tpl
-                self.list_widget.setColumnWidth(col, width)
-
-        if "put query records in table":
-            self.list_widget.setSortingEnabled(False)
-
-            for row in range(total_rows):
-                for col in range(total_columns):
-                    if col == 0:
-                        self.list_widget.setItem(row, col, W.QTableWidgetItem(str(query.value(col)).rjust(5))) # needed for proper sorting
-                    else:
-                        self.list_widget.setItem(row, col, W.QTableWidgetItem(str(query.value(col))))
-                query.next()
-
-            self.list_widget.setSortingEnabled(True)
+            self.list_widths_lst = [] if widths_lst is None else widths_lst
+            self.set_list_column_widths()
+
+    def set_list_column_widths(self):
+        for tpl in enumerate(self.list_widths_lst):
+            col, width = tpl
+            self.list_widget.setColumnWidth(col, width)
+
+    def update_list_loading(self, loading):
+        if loading:
+            self.list_widget.viewport().setCursor(Qt.BusyCursor)
+            rows = self.list_widget.rowCount()
+            self.list_count_lbl.setText(F"{rows} rows,  loading..." if rows else "loading...")
+        else:
+            self.list_widget.viewport().unsetCursor()
+
+    def update_list_failed(self, error_str):
+        self.list_count_lbl.setText("[query failed]")
+        self.list_count_lbl.setToolTip(error_str)
+
+    def update_list_count(self, loaded, total_hint, complete):
+        self.list_count_lbl.setToolTip("")
+        if complete:
+            self.list_count_lbl.setText(F"{loaded} rows")
+        elif total_hint < 0:
+            self.list_count_lbl.setText(F"{loaded}+ rows")
+        else:
+            self.list_count_lbl.setText(F"{loaded} of ~{total_hint} rows")
 
     def list_widget_click_handler(self, row, col):
         mbx.pending(F"list_widget_click_handler() needs subclassing in this window<p>"
@@ -538,13 +644,122 @@ class ListWidget():
 
 #-----------------------------------------------------------------------------
 
+class ListPager():
+    """ListPager class - browse list_widget a page at a time,  with first / previous / next page actions in tool_bar
+     for huge tables:  each page is read by db_methods.run_select_page(),  at the same cost for the first or the
+     10000th page,  and only one page is ever held in memory
+     Note: for windows that also inherit ListWidget - use show_list_page() instead of update_list_widget()
+     clicking a column header restarts paging ordered by that column"""
+
+    def __init__(self, page_size=200):
+
+        self.list_page = SimpleNamespace(table_name="", where_str="", order_lst=[], fields_lst=None, size=page_size,
+                                         number=0, first_key=None, last_key=None, has_previous=False, has_next=False)
+
+        if "first page":
+            self.first_page_act = G.QAction()
+            self.first_page_act.setIcon(icn.first_page)
+            self.first_page_act.triggered.connect(self.first_page_handler)
+            self.first_page_act.setText({'en':'First Page',
+                                         'es':'Primera Pagina'}[prj.locale])
+
+        if "previous page":
+            self.previous_page_act = G.QAction()
+            self.previous_page_act.setIcon(icn.previous_page)
+            self.previous_page_act.triggered.connect(self.previous_page_handler)
+            self.previous_page_act.setText({'en':'Previous Page',
+                                            'es':'Pagina Anterior'}[prj.locale])
+
+        if "next page":
+            self.next_page_act = G.QAction()
+            self.next_page_act.setIcon(icn.next_page)
+            self.next_page_act.triggered.connect(self.next_page_handler)
+            self.next_page_act.setText({'en':'Next Page',
+                                        'es':'Pagina Siguiente'}[prj.locale])
+
+        self.tool_bar.addAction(self.next_page_act)
+        self.tool_bar.addAction(self.previous_page_act)
+        self.tool_bar.addAction(self.first_page_act)
+
+        self.list_widget.model().page_sort = self.sort_list_pages
+        self.update_page_actions()
+
+    def show_list_page(self, table_name, filter_str="", order_lst=None, fields_lst=None, widths_lst=None):
+        """shows first page of table_name,  filtered and ordered - same filter_str as update_list_widget()
+        order_lst as for run_select_page(),  eg ['paterno COLLATE NOCASE', 'nombres COLLATE NOCASE']"""
+        filter_str = filter_str.strip()
+        if filter_str.count("'%%'"):
+            filter_str = ""
+
+        self.list_page.table_name = table_name
+        self.list_page.where_str = filter_str
+        self.list_page.order_lst = list(order_lst or [])
+        self.list_page.fields_lst = fields_lst
+        self.list_widget.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.load_list_page(None, False)
+
+        self.list_widths_lst = [] if widths_lst is None else widths_lst
+        self.set_list_column_widths()
+
+    def load_list_page(self, after_key, reverse):
+        page = self.list_page
+        result = run_select_page(page.table_name, page.where_str, page.order_lst, after_key, page.size, reverse, page.fields_lst)
+        if not result.rows and after_key is not None:   # rows deleted meanwhile - stay on this page
+            page.has_next = page.has_next and not reverse
+            page.has_previous = page.has_previous and reverse
+            self.update_page_actions()
+            return
+
+        if reverse:
+            page.number = max(page.number - 1, 1) if result.has_more else 1
+            page.has_previous = result.has_more
+            page.has_next = True
+        else:
+            page.number = page.number + 1 if after_key is not None else 1
+            page.has_previous = after_key is not None
+            page.has_next = result.has_more
+        page.first_key = result.first_key
+        page.last_key = result.last_key
+
+        self.list_widget.model().set_page(page.table_name, F" WHERE {page.where_str}" if page.where_str else "",
+                                          result.headers_lst, result.rows)
+        self.update_page_actions()
+
+        first_row = (page.number - 1) * page.size + 1
+        self.list_count_lbl.setText(F"page {page.number},  rows {first_row}-{first_row + len(result.rows) - 1}"
+                                    F"{'' if page.has_next else ' (last)'}")
+
+    def update_page_actions(self):
+        self.first_page_act.setEnabled(self.list_page.has_previous)
+        self.previous_page_act.setEnabled(self.list_page.has_previous)
+        self.next_page_act.setEnabled(self.list_page.has_next)
+
+    def sort_list_pages(self, column_name, descending):
+        """header click - restart at first page,  ordered by column_name (case insensitive,  as managed indexes)"""
+        collate_str = "" if column_name == "id" else " COLLATE NOCASE"
+        self.list_page.order_lst = [F"{column_name}{collate_str}{' DESC' if descending else ''}"]
+        self.load_list_page(None, False)
+
+    def first_page_handler(self):
+        self.load_list_page(None, False)
+
+    def previous_page_handler(self):
+        if self.list_page.has_previous:
+            self.load_list_page(self.list_page.first_key, "reverse")
+
+    def next_page_handler(self):
+        if self.list_page.has_next:
+            self.load_list_page(self.list_page.last_key, not "reverse")
+
+#-----------------------------------------------------------------------------
+
 class PrintScreen():
-    """PrintScreen class
+    """PrintScreen class - window to printer,  PDF or PNG file
+     only the capture runs in the GUI thread - scaling,  encoding and spooling run on a worker,  see Support/screen_print.py
      Note:  this works on any window that inherits PrintScreen and has print_screen_act enabled in tool_bar     """
 
     def __init__(self):
 
-        icn.print_screen = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/document-print-direct.png")
         self.print_screen_act = G.QAction()
         self.print_screen_act.setIcon(icn.print_screen)
         self.print_screen_act.triggered.connect(lambda: self.print_screen_handler(self))
@@ -556,20 +771,40 @@ class PrintScreen():
 
     def print_screen_handler(self, win_prm):
         """generic,  works on any screen """
-        if mbx.confirm("Confirm Screen Print ..."):
-            printer = P.QPrinter()
-            painter = G.QPainter()
-            painter.begin(printer)
-            screen_ = win_prm.grab()  # to print whole window
-            #painter.drawPixmap(10, 10, screen_)
-            painter.end()
+        targets_lst = {'en': ["Printer", "PDF file", "PNG file"],
+                       'es': ["Impresora", "Archivo PDF", "Archivo PNG"]}[prj.locale]
+        choice, ok = W.QInputDialog.getItem(win_prm, self.print_screen_act.text(), "", targets_lst, 0, False)
+        if not ok:
+            return
+        target = ("printer", "pdf", "png")[targets_lst.index(choice)]
+
+        printer = path = None
+        if target == "printer":
+            printer = P.QPrinter(P.QPrinter.HighResolution)
+            if P.QPrintDialog(printer, win_prm).exec() != W.QDialog.Accepted:
+                return
+        else:
+            path, _filter = W.QFileDialog.getSaveFileName(win_prm, self.print_screen_act.text(),
+                                                          os.path.join(os.getcwd(), F"screen.{target}"), F"{target.upper()} (*.{target})")
+            if not path:
+                return
+
+        self.print_screen_act.setEnabled(False)   # until the worker is done
+        self.print_screen_job = screen_print.start_screen_print(win_prm, target, path, printer,
+                                                                self.print_screen_finished_handler, self.print_screen_failed_handler)
+
+    def print_screen_finished_handler(self, result):
+        self.print_screen_act.setEnabled(True)
+        print(F"[green]screen printed to {result.path or 'printer'} - {screen_print.timings_str(result.timings)}")
+
+    def print_screen_failed_handler(self, error_str):
+        self.print_screen_act.setEnabled(True)
+        mbx.warning(error_str)
 
 class PrintDocument():
     """ """
     def __init__(self):
 
-        icn.print_document = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/document-print.png")
-
         if "create document and cursor":
             self.doc = G.QTextDocument()
             self.cursor = G.QTextCursor(self.doc)
@@ -597,12 +832,59 @@ class PrintDocument():
         dialog = P.QPrintPreviewDialog()
         self.doc.print_(dialog.printer())
 
+if "print preview cache":
+    """pages of print preview documents,  recorded once as QPicture and replayed on every paintRequested
+    (zoom, page setup, print) instead of generating and laying out the document again
+    - preview_pages:  (window class, preview_cache_key(), page setup) -> list of QPicture
+    - preview_docs:   (window class, preview_cache_key()) -> QTextDocument,  so a new page setup only lays it out again
+    preview_cache_key() includes the data version of the tables shown,  so a changed table is never served from cache"""
+    preview_pages = OrderedDict()
+    preview_docs = OrderedDict()
+    preview_cache_size = 8
+    preview_cache_stats = SimpleNamespace(hits=0, layouts=0, documents=0)
+
+def _lru_store(cache, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > preview_cache_size:
+        cache.popitem(last=False)
+
+def page_setup_key(printer):
+    layout = printer.pageLayout()
+    margins = layout.margins(G.QPageLayout.Millimeter)
+    return (layout.pageSize().key(), layout.orientation(),
+            (margins.left(), margins.top(), margins.right(), margins.bottom()), printer.resolution())
+
+def render_doc_pages(doc, printer):
+    """lays doc out for the paint rect of printer,  returns a QPicture of each page"""
+    rect = printer.pageLayout().paintRectPixels(printer.resolution())
+    doc.documentLayout().setPaintDevice(printer)   # font metrics of the printer resolution
+    doc.setPageSize(C.QSizeF(rect.width(), rect.height()))
+    pages_lst = []
+    for page in range(doc.pageCount()):
+        clip = C.QRectF(0, page * rect.height(), rect.width(), rect.height())
+        picture = G.QPicture()
+        painter = G.QPainter(picture)
+        painter.translate(0, -clip.top())
+        doc.drawContents(painter, clip)
+        painter.end()
+        pages_lst.append(picture)
+    doc.documentLayout().setPaintDevice(None)   # printer belongs to the dialog - doc may outlive it
+    return pages_lst
+
+def clear_preview_cache():
+    preview_pages.clear()
+    preview_docs.clear()
+
+def print_preview_cache_stats():
+    stats = preview_cache_stats
+    print(F"[green]print preview: {stats.hits} cached, {stats.layouts} laid out, {stats.documents} documents generated, "
+          F"{len(preview_pages)} page sets cached")
+
 class PrintPreview():
     """ """
     def __init__(self):
 
-        icn.print_preview = G.QIcon("/usr/share/icons/oxygen/base/32x32/actions/document-print-preview.png")
-
         if "QAction":
             self.print_preview_act = G.QAction()
             self.print_preview_act.setIcon(icn.print_preview)
@@ -646,11 +928,56 @@ class PrintPreview():
 
         return doc
 
+    def preview_cache_key(self):
+        """subclass to cache previews of this window - a hashable key for the content of generate_doc(),
+        including result_version() of the tables it reads,  eg  (prj.filter_str, result_version("Pacientes"))
+        None  ->  generate_doc() for each preview,  as before"""
+        return None
+
+    def preview_doc_pages(self, printer):
+        """QPicture of each page of generate_doc(),  laid out for printer - from cache when possible"""
+        content_key = self.preview_cache_key()
+        if content_key is None:
+            preview_cache_stats.documents += 1
+            preview_cache_stats.layouts += 1
+            return render_doc_pages(self.generate_doc(), printer)
+
+        doc_key = (type(self).__name__, content_key)
+        pages_key = (*doc_key, page_setup_key(printer))
+        pages_lst = preview_pages.get(pages_key)
+        if pages_lst is not None:
+            preview_cache_stats.hits += 1
+            preview_pages.move_to_end(pages_key)
+            return pages_lst
+
+        doc = preview_docs.get(doc_key)
+        if doc is None:
+            preview_cache_stats.documents += 1
+            doc = self.generate_doc()
+            _lru_store(preview_docs, doc_key, doc)
+        preview_cache_stats.layouts += 1
+        pages_lst = render_doc_pages(doc, printer)
+        _lru_store(preview_pages, pages_key, pages_lst)
+        return pages_lst
+
+    def paint_preview(self, printer):
+        """paintRequested slot - replays the recorded pages,  scaled from QPicture to printer resolution"""
+        pages_lst = self.preview_doc_pages(printer)
+        painter = G.QPainter()
+        if not painter.begin(printer):
+            return
+        for page, picture in enumerate(pages_lst):
+            if page:
+                printer.newPage()
+            painter.resetTransform()
+            painter.scale(picture.logicalDpiX() / printer.logicalDpiX(), picture.logicalDpiY() / printer.logicalDpiY())
+            painter.drawPicture(0, 0, picture)
+        painter.end()
+
     def print_preview_handler(self):
         """handler for print preview QAction"""
-        doc = self.generate_doc()
         dialog = P.QPrintPreviewDialog()
-        dialog.paintRequested.connect(lambda: doc.print_(dialog.printer()))
+        dialog.paintRequested.connect(self.paint_preview)
         dialog.exec()
 
 #-----------------------------------------------------------------------------
@@ -758,7 +1085,8 @@ class WindowsList(ToolWindow, ListWidget):
 
         # place form widgets
 
-        self.window_grid_layout.addWidget(self.list_header, 2, 0, 1, 4)
+        self.window_grid_layout.addWidget(self.list_header, 2, 0, 1, 3)
+        self.window_grid_layout.addWidget(self.list_count_lbl, 2, 3)
         self.window_grid_layout.addWidget(self.list_widget, 3, 0, 1, 4)
         self.window_grid_layout.addWidget(self.window_grid_footer, 4, 0, 1, 4)
 
@@ -803,7 +1131,8 @@ class WindowsFormList(ToolWindow, FormWidget, ListWidget):
 
         self.window_grid_layout.addWidget(self.form_widget_header, 2, 0, 1, 4)
         self.window_grid_layout.addWidget(self.form_widget, 3, 0, 1, 4)
-        self.window_grid_layout.addWidget(self.list_header, 4, 0, 1, 4)
+        self.window_grid_layout.addWidget(self.list_header, 4, 0, 1, 3)
+        self.window_grid_layout.addWidget(self.list_count_lbl, 4, 3)
         self.window_grid_layout.addWidget(self.list_widget, 5, 0, 1, 4)
         self.window_grid_layout.setRowStretch(5, 800) # layout will expand list to fill window
 
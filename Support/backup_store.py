@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Incremental,  deduplicated backups - a content addressed store of SQLite pages plus one manifest per snapshot
+
+Store layout (default db_backups/store):
+    pages/ab/ab12...ef          zlib compressed page,  named by the blake2b hash of its content
+    manifests/<db name>_<date>_<time>.json.gz
+                                page size, page count, sha256 of the whole file,  and the hash of each page in order
+
+A snapshot hashes every page of a consistent copy of the database (db_backup.online_copy()),
+but only writes the pages not already in the store - usually a small part of a daily backup.
+Manifests are written last,  so an interrupted snapshot only leaves unreferenced pages,  removed by prune_store().
+A snapshot being written and a prune never overlap - both hold store.lock (see store_lock()),  also across processes.
+
+Command line,  from the project folder:
+    python3 Support/backup_store.py snapshot archivos.db [--store db_backups/store]
+    python3 Support/backup_store.py list
+    python3 Support/backup_store.py restore <manifest name or path> <new file>
+    python3 Support/backup_store.py verify [--deep]     # --deep also restores each snapshot and runs integrity_check
+    python3 Support/backup_store.py prune               # rotation as db_backup.retention_policy,  then unused pages
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+    #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+
+if "imports":
+    import os
+    import sys
+    import gzip
+    import json
+    import time
+    import zlib
+    import hashlib
+    import argparse
+    import datetime
+    import tempfile
+    import contextlib
+    from types import SimpleNamespace
+    try:
+        import fcntl
+    except ModuleNotFoundError:   # Windows
+        fcntl = None
+        import msvcrt
+
+    try:
+        from Support.dev_tools import console, log, bp, print, inspect
+        from Support.db_backup import online_copy, check_integrity, kept_by_policy
+    except ModuleNotFoundError:
+        from dev_tools import console, log, bp, print, inspect
+        from db_backup import online_copy, check_integrity, kept_by_policy
+
+if "store layout":
+    default_store = os.path.join("db_backups", "store")
+    page_hash_size = 20           # bytes of blake2b digest - collisions are not a practical concern
+    manifest_suffix = ".json.gz"
+    lock_file_name = "store.lock"
+
+def page_hash(page):
+    return hashlib.blake2b(page, digest_size=page_hash_size).hexdigest()
+
+def _page_path(store, hash_str):
+    return os.path.join(store, "pages", hash_str[:2], hash_str)
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = F"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+@contextlib.contextmanager
+def store_lock(store):
+    """exclusive lock of store,  between processes and threads - waits for the current holder to release it
+    held by add_snapshot() and prune_store(),  so a prune never runs while a snapshot is being written"""
+    os.makedirs(store, exist_ok=True)
+    with open(os.path.join(store, lock_file_name), "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)   # gives up after 10 s - then try again
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def manifest_names(store, db_stem=None):
+    """manifest file names,  oldest first - only those of db_stem if given"""
+    folder = os.path.join(store, "manifests")
+    if not os.path.isdir(folder):
+        return []
+    names_lst = [name for name in os.listdir(folder) if name.endswith(manifest_suffix)]
+    if db_stem is not None:
+        names_lst = [name for name in names_lst if name.startswith(F"{db_stem}_")]
+    return sorted(names_lst, key=lambda name: name[-len(manifest_suffix) - 17:])   # by date_time stamp
+
+def read_manifest(store, name_or_path):
+    path = name_or_path if os.path.exists(name_or_path) else os.path.join(store, "manifests", name_or_path)
+    with gzip.open(path, "rt", encoding="UTF-8") as file:
+        return json.load(file)
+
+def add_snapshot(store, copy_file, db_stem, created=None):
+    """stores the pages of copy_file (a consistent,  closed database file) not yet in store,  then its manifest
+    holds store_lock() throughout - so prune_store() can not delete pages this snapshot uses
+    returns SimpleNamespace(manifest, pages, new_pages, new_bytes, seconds)"""
+    start = time.perf_counter()
+    created = created or datetime.datetime.now()
+    with store_lock(store):   # pages found in the store must stay there until the manifest is written
+        with open(copy_file, "rb") as file:
+            header = file.read(100)
+            page_size = int.from_bytes(header[16:18], "big")
+            page_size = 65536 if page_size == 1 else page_size
+            file.seek(0)
+
+            file_hash = hashlib.sha256()
+            hashes_lst = []
+            new_pages = new_bytes = 0
+            while True:
+                page = file.read(page_size)
+                if not page:
+                    break
+                file_hash.update(page)
+                hash_str = page_hash(page)
+                hashes_lst.append(hash_str)
+                path = _page_path(store, hash_str)
+                if not os.path.exists(path):
+                    data = zlib.compress(page, 6)
+                    _write_atomic(path, data)
+                    new_pages += 1
+                    new_bytes += len(data)
+
+        manifest = {
+            "database": db_stem,
+            "created": created.isoformat(timespec="seconds"),
+            "page_size": page_size,
+            "page_count": len(hashes_lst),
+            "sha256": file_hash.hexdigest(),
+            "pages": hashes_lst,
+            }
+        manifest_name = F"{db_stem}_{created:%Y-%m-%d_%H%M%S}{manifest_suffix}"
+        data = gzip.compress(json.dumps(manifest).encode("UTF-8"))
+        _write_atomic(os.path.join(store, "manifests", manifest_name), data)
+    return SimpleNamespace(manifest=manifest_name, pages=len(hashes_lst), new_pages=new_pages,
+                           new_bytes=new_bytes + len(data), seconds=time.perf_counter() - start)
+
+def snapshot(db_file, store=default_store, pages_per_step=256, progress=None):
+    """consistent snapshot of a live database - online copy to a temporary file,  integrity check,  add_snapshot()"""
+    db_stem = os.path.splitext(os.path.basename(db_file))[0]
+    os.makedirs(store, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=store) as tmp_folder:
+        copy_file = os.path.join(tmp_folder, F"{db_stem}.db")
+        online_copy(db_file, copy_file, pages_per_step, progress)
+        check_integrity(copy_file)
+        return add_snapshot(store, copy_file, db_stem)
+
+def restore_snapshot(store, manifest_name, target_file):
+    """rebuilds the database file of a snapshot - raises ValueError if a page is missing or the file hash differs"""
+    manifest = read_manifest(store, manifest_name)
+    file_hash = hashlib.sha256()
+    tmp_file = F"{target_file}.restoring"
+    with open(tmp_file, "wb") as file:
+        for hash_str in manifest["pages"]:
+            try:
+                with open(_page_path(store, hash_str), "rb") as page_file:
+                    page = zlib.decompress(page_file.read())
+            except FileNotFoundError as error:
+                raise ValueError(F"{manifest_name}: page {hash_str} missing from store") from error
+            file_hash.update(page)
+            file.write(page)
+    if file_hash.hexdigest() != manifest["sha256"]:
+        os.remove(tmp_file)
+        raise ValueError(F"{manifest_name}: restored file does not match its sha256")
+    os.replace(tmp_file, target_file)
+    return manifest
+
+def verify_store(store=default_store, deep=False, verbose=True):
+    """checks that every page of every manifest is present and matches its hash - each page read once
+    deep  ->  also restores each snapshot to a temporary file and runs PRAGMA integrity_check on it
+    returns list of problem strings,  empty if all is well"""
+    problems_lst = []
+    checked = {}   # page hash -> ok
+    for manifest_name in manifest_names(store):
+        manifest = read_manifest(store, manifest_name)
+        bad_pages = 0
+        for hash_str in manifest["pages"]:
+            if hash_str not in checked:
+                try:
+                    with open(_page_path(store, hash_str), "rb") as page_file:
+                        checked[hash_str] = page_hash(zlib.decompress(page_file.read())) == hash_str
+                except (OSError, zlib.error):
+                    checked[hash_str] = False
+            bad_pages += not checked[hash_str]
+        if bad_pages:
+            problems_lst.append(F"{manifest_name}: {bad_pages} missing or corrupt pages")
+        elif deep:
+            with tempfile.TemporaryDirectory(dir=store) as tmp_folder:
+                restored_file = os.path.join(tmp_folder, "restored.db")
+                try:
+                    restore_snapshot(store, manifest_name, restored_file)
+                    check_integrity(restored_file)
+                except Exception as error:   #pylint:disable=broad-except
+                    problems_lst.append(F"{manifest_name}: {error}")
+        if verbose:
+            print(F"[{'red' if bad_pages else 'green'}]{manifest_name}: {manifest['page_count']} pages"
+                  F"{'' if not bad_pages else F',  {bad_pages} bad'}")
+    return problems_lst
+
+def prune_store(store=default_store, policy=None, verbose=False):
+    """deletes manifests not kept by policy (see db_backup.kept_by_policy()),  then pages no manifest uses
+    holds store_lock() - pages of a snapshot still being written have no manifest yet,  they must not look unused
+    returns (deleted manifests list,  deleted pages count)"""
+    with store_lock(store):
+        deleted_lst = []
+        db_stems = {read_manifest(store, name)["database"] for name in manifest_names(store)}
+        for db_stem in db_stems:
+            dated_lst = [(datetime.datetime.fromisoformat(read_manifest(store, name)["created"]), name)
+                         for name in manifest_names(store, db_stem)]
+            keep = kept_by_policy(dated_lst, policy)
+            for _stamp, name in dated_lst:
+                if name not in keep:
+                    os.remove(os.path.join(store, "manifests", name))
+                    deleted_lst.append(name)
+                    if verbose:
+                        print(F"[yellow]snapshot rotated out - {name}")
+
+        used = set()
+        for name in manifest_names(store):
+            used.update(read_manifest(store, name)["pages"])
+        deleted_pages = 0
+        pages_folder = os.path.join(store, "pages")
+        for prefix in os.listdir(pages_folder) if os.path.isdir(pages_folder) else []:
+            for hash_str in os.listdir(os.path.join(pages_folder, prefix)):
+                if hash_str not in used:   # also removes .tmp files of an interrupted snapshot
+                    os.remove(os.path.join(pages_folder, prefix, hash_str))
+                    deleted_pages += 1
+    return deleted_lst, deleted_pages
+
+def store_size(store=default_store):
+    """bytes used by pages and manifests"""
+    total = 0
+    for folder, _dirs, files_lst in os.walk(store):
+        total += sum(os.path.getsize(os.path.join(folder, name)) for name in files_lst)
+    return total
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="incremental deduplicated sqlite backups")
+    parser.add_argument("--store", default=default_store)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("snapshot").add_argument("db_file")
+    commands.add_parser("list")
+    restore_parser = commands.add_parser("restore")
+    restore_parser.add_argument("manifest")
+    restore_parser.add_argument("target_file")
+    commands.add_parser("verify").add_argument("--deep", action="store_true")
+    commands.add_parser("prune")
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        result = snapshot(args.db_file, args.store)
+        print(F"[green]{result.manifest}: {result.pages} pages,  {result.new_pages} new ({result.new_bytes / 2**20:.2f} MB written),  "
+              F"{result.seconds:.1f} s")
+    elif args.command == "list":
+        for name in manifest_names(args.store):
+            manifest = read_manifest(args.store, name)
+            print(F"{name}  {manifest['page_count']} pages x {manifest['page_size']}")
+        print(F"[green]store size {store_size(args.store) / 2**20:.1f} MB")
+    elif args.command == "restore":
+        if os.path.exists(args.target_file):
+            print(F"[red]{args.target_file} already exists - restore to a new file")
+            sys.exit(1)
+        restore_snapshot(args.store, args.manifest, args.target_file)
+        check_integrity(args.target_file)
+        print(F"[green]restored {args.manifest} to {args.target_file}")
+    elif args.command == "verify":
+        problems = verify_store(args.store, args.deep)
+        for problem in problems:
+            print(F"[red]{problem}")
+        sys.exit(1 if problems else 0)
+    elif args.command == "prune":
+        deleted, pages = prune_store(args.store, None, verbose=True)
+        print(F"[green]{len(deleted)} snapshots and {pages} unused pages deleted")
@@ -10,6 +10,10 @@ Can be run
 - optionally imported once, early in a project's main module.
 
 import Support/check_environ
+
+When imported,  the full check only runs if the environment fingerprint changed since the last
+full check without problems (see "fingerprint" below),  or when the project is started with --check-environ
+- otherwise importing this module costs a few stat calls and file reads
 """
 
 # pylint disables
@@ -21,14 +25,12 @@ import Support/check_environ
 
 verbose = eval("__name__ == '__main__'")
 
-print("\u001b[2J\u001b[H")  # clear terminal
-
 if "__inits__":
 
     if "imports":
         import sys
         import os
-        import subprocess
+        import zlib     # crc32 - hashlib and json would double the cost of a skipped check
 
     if "get shell environment":
         _HOME = os.environ['HOME']
@@ -41,15 +43,61 @@ if "__inits__":
         major:int = 10
         micro:int = 7
 
+if "fingerprint":
+    """everything the checks below depend on,  hashed - python version and prefix,  mtimes of the sys.path folders
+    (a site-packages folder changes with every pip install/uninstall),  the Support/*.py files,  shell variables,
+    and which of the checked folders/files exist
+    Note: the project folder itself is left out - its mtime changes whenever any file in it is added or removed"""
+    _support_folder = os.path.dirname(os.path.abspath(__file__))
+    _stamp_file = F"{_PWD}/.check_environ_stamp"
+
+def environ_fingerprint() -> str:
+    """one line of text - environment values and stats in clear,  crc32 of each Support/*.py file"""
+    lines_lst = [sys.version.replace("\n", " "), sys.executable, sys.prefix, _HOME, _USER, _SHELL,
+                 os.environ.get("PATH", ""), os.environ.get("PYTHONPATH", "")]
+    for folder in sys.path:
+        if folder and os.path.isdir(folder) and os.path.abspath(folder) not in (_PWD, _support_folder):
+            lines_lst.append(F"{folder} {os.stat(folder).st_mtime_ns}")
+    for name in sorted(os.listdir(_support_folder)):
+        if name.endswith(".py"):
+            with open(os.path.join(_support_folder, name), "rb") as file:
+                lines_lst.append(F"{name} {zlib.crc32(file.read()):08x}")
+    for path in ("/usr/share/icons/oxygen", F"{_PWD}/images", F"{_PWD}/Support/images", F"{_PWD}/README.md"):
+        lines_lst.append(F"{path} {os.path.exists(path)}")
+    return F"{zlib.crc32(chr(10).join(lines_lst).encode()):08x} {len(lines_lst)}"
+
+def read_stamp() -> str:
+    try:
+        with open(_stamp_file, encoding="UTF-8") as file:
+            return file.read().strip()
+    except OSError:
+        return ""
+
+def write_stamp(_fingerprint:str):
+    try:
+        with open(_stamp_file, "w", encoding="UTF-8") as file:
+            file.write(F"{_fingerprint}\n")
+    except OSError:
+        pass   # read only project folder - check again next time
+
+if "decide":
+    fingerprint = environ_fingerprint()
+    full_check = verbose or "--check-environ" in sys.argv or read_stamp() != fingerprint
+    problems_lst = []   # missing modules or folders - no stamp is written while there are any
+
+    if full_check:
+        print("\u001b[2J\u001b[H")  # clear terminal
+
 def run_subprocess(_statement:str):
     """wraps subprocess.run to catch any errors"""
+    import subprocess   # only needed when something is missing
     try:
         subprocess.run(_statement, check=True)
     except subprocess.CalledProcessError:
         print(F"CalledProcessError for statement\n {_statement})")
         sys.exit(1) #  since following will not run correctly if any errors with _statement
 
-if "rich":
+if "rich" and full_check:
     """improved print, inspect and console functions  """
     #https://rich.readthedocs.io/en/stable/introduction.html
     #https://github.com/Textualize/rich
@@ -62,9 +110,10 @@ if "rich":
     except ModuleNotFoundError:
         print("\nrich module not found - install with"
         "    pip3 install --user rich\n")
+        problems_lst.append("rich")
         run_subprocess("pip3 install --user rich")
 
-if "PySide6":
+if "PySide6" and full_check:
     """
     base system         https://pypi.org/project/PySide6/
     Examples            https://pypi.org/project/PySide6-Addons/
@@ -79,6 +128,7 @@ if "PySide6":
         "Make sure PySide6 was installed with"
         "    pip3 install PySide6-Addons"
         "    pip3 install PySide6-Essentials")
+        problems_lst.append("PySide6")
         run_subprocess("pip3 install --user PySide6")
 
     if verbose:
@@ -89,7 +139,7 @@ if "PySide6":
             print("PySide6-Addons        [red]not available")
             print("PySide6-Essentials    [red]not available\n")
 
-if "sqlite3":
+if "sqlite3" and full_check:
     """alternative to using  QSqlDatabase class"""
     # https://www.sqlite.org/download.html
     try:
@@ -100,9 +150,10 @@ if "sqlite3":
         print("\n sqlite3 module not found - try installing with"
         "   sudo apt install sqlite3  or"
         "   pacman -S sqlite3")
+        problems_lst.append("sqlite3")
         run_subprocess("pacman -S sqlite")
 
-if "pyAesCrypt":
+if "pyAesCrypt" and full_check:
     """cryptography tools,  used in my login menus class"""
     # https://pypi.org/project/pyAesCrypt/
     try:
@@ -112,9 +163,10 @@ if "pyAesCrypt":
         print("\npyAesCrypt module not found - install with"
         "   pip3  install  pyAesCrypt"
         "and update PYTHONPATH variable if needed")
+        problems_lst.append("pyAesCrypt")
         run_subprocess("pip3 install --user pyAesCrypt")
 
-if "num2words":
+if "num2words" and full_check:
     """ensure available in projects that convert numbers <-> words"""
     # https://pypi.org/project/num2words/
     try:
@@ -123,25 +175,10 @@ if "num2words":
     except ModuleNotFoundError:
         print("\n num2words module not found - try installing with"
         "   pip3 install num2words \n")
+        problems_lst.append("num2words")
         run_subprocess("pip3 install --user num2wtoords")
 
-if "screeninfo":
-    """python module to find current monitor dimensions for project window layouts"""
-    # https://doc.qt.io/qt-6/qscreen.html
-    # https://pypi.org/project/screeninfo/
-    try:
-        import screeninfo
-        if verbose: print("screeninfo            [green]is available\n")
-
-    except ModuleNotFoundError:
-        print("\n screeninfo module not found - try\n"
-            "pip3 show screeninfo\n"
-            "and update MRO\n"
-            "If not found,  install withnnn\n"
-            "pip3  install --user  screeninfo \n")
-        run_subprocess("pip3 install --user screeninfo")
-
-if "oxygen":
+if "oxygen" and full_check:
     # https://github.com/KDE/oxygen-icons5
     if os.path.exists("/usr/share/icons/oxygen"):
         if verbose: print("KDE oxygen icons      [green]are available\n")
@@ -151,7 +188,7 @@ if "oxygen":
         "`git clone https://github.com/KDE/oxygen-icons.git`\n "
         )
 
-if "Support/images":
+if "Support/images" and full_check:
     """place to put my default images - ensure availability
     Note: need to cover cases where module run
     - solo in Terminal with 'Run in Konsole'   PWD == HOME
@@ -173,12 +210,13 @@ if "Support/images":
         else:
             print(F"[red]Folder Support/images   is not available from\n"
             F"[black]   {_PWD}\n")
+            problems_lst.append("Support/images")
 
-if "current user":
+if "current user" and full_check:
 
     if verbose: print(F"Current user          is [blue]{_USER}")
 
-if "current shell":
+if "current shell" and full_check:
 
     if verbose: print(F"Current shell         is [blue]{_SHELL}")
     if _SHELL == "/usr/bin/zsh":
@@ -188,7 +226,7 @@ if "current shell":
     else:
         CONFIG:str =  'UNKOWN'
 
-if "locale":
+if "locale" and full_check:
     try:
         import locale
         if verbose: print(F"Current locale        is[blue] {locale.getlocale()[0]}\n")
@@ -203,7 +241,7 @@ if "virtual environment" and verbose:
     else:
         print("running in virtual environment?      [green] True\n")
 
-if "python3_version":
+if "python3_version" and full_check:
 
     if sys.version_info[0] == 3 or  sys.version_info[1] >= major:
         if verbose:
@@ -214,8 +252,9 @@ if "python3_version":
         print(F"This script was written for Python version 3.{major}.{micro}\n"
             "[red]Currently running")
         print(F"{sys.version_info}\n")
+        problems_lst.append("python3_version")
 
-if "set PATH":
+if "set PATH" and full_check:
     """ `pip --user install <package>`   will install <package> into   /home/user/.local/bin
     make sure it is in python's MRO (module resolucion order)    """
 
@@ -241,7 +280,7 @@ if "PYTHONPATH" and verbose:
     except KeyError:
         print("[yellow]PYTHONPATH system variable is apparently not set or needed\n")
 
-if "README.md":
+if "README.md" and full_check:
     """markdown file for project related notes, guides, comments, observations, whatever ... """
 
     if os.path.exists(F"{_PWD}/README.md"):
@@ -252,8 +291,11 @@ if "README.md":
         print("[yellow]local README.md not found in")
         print("[black]    {_PWD}\n")
 
+if "stamp" and full_check and not problems_lst:
+    write_stamp(fingerprint)   # next imports skip the checks,  until something changes
+
 if verbose:
     print("[cyan]Note: This module is optional and only needs to be imported once.\n"
     "Place first in list of imports in main module of a project.")
-else:
+elif full_check:
     print("\n[blue]check_environ module was run\n")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Streaming CSV importer,  for loading (legacy) records into a table
+
+Rows are read from the csv file as a stream and inserted by db_methods.run_insert_many(),
+so memory use does not depend on file size,  and a chunk that fails is rolled back without
+losing the chunks before or after it.
+
+Usage:
+    from Support.csv_import import import_csv
+    result = import_csv("legacy.csv", "Pacientes", ["nombres", "paterno", "materno", "cumpleanos", "carnet", "ultima"])
+
+    # from the GUI - on a worker of QThreadPool.globalInstance(),  with its own connection
+    handle = start_import("legacy.csv", "Pacientes", [...same columns...], 5000, on_progress, on_finished, on_failed)
+    handle.cancel()      # after the chunk being inserted - chunks already committed stay imported
+
+A file with a header row,  like a db_export CSV file,  is read by column name - its id column is ignored,
+so imported rows get new ids.  A first row naming only some of the columns (eg one misspelled) is not
+taken for data - import_csv() raises CsvHeaderError before importing anything.
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+
+if "imports":
+    import sys
+    import csv
+    import PySide6.QtCore as C
+
+    try:
+        from Support.dev_tools import console, log, bp, print, inspect
+        from Support.db_methods import run_insert_many, thread_connection, DatabaseBusy
+    except ModuleNotFoundError:
+        from dev_tools import console, log, bp, print, inspect
+        from db_methods import run_insert_many, thread_connection, DatabaseBusy
+
+if __name__ == '__main__':
+    console.clear()
+    print("[red][bold]\ncsv_import.py not designed as a run alone module\n")
+    sys.exit(0)
+
+class CsvHeaderError(ValueError):
+    """first row names some of the wanted columns,  but not all - a header with mistakes,  not a row of data"""
+
+class ImportCancelled(Exception):
+    pass
+
+def read_csv_rows(csv_file, columns_lst, rejected_lines_lst):
+    """generator - yields the values of columns_lst from each row of csv_file
+    with a first row holding column names (in any order,  eg as written by db_export),  fields are picked by name
+    and other columns,  like id,  are ignored - without one,  rows must have exactly len(columns_lst) fields in order
+    appends line numbers of malformed rows to rejected_lines_lst
+    raises CsvHeaderError if the first row names some of columns_lst,  but not all"""
+    wanted_lst = [col.lower() for col in columns_lst]
+    positions = None    # field index of each of columns_lst,  from the header row
+    fields = len(columns_lst)
+    with open(csv_file, "r", encoding="UTF-8", newline="") as file:
+        reader = csv.reader(file)
+        for row in reader:
+            if not row:
+                continue
+            if reader.line_num == 1:
+                header_lst = [field.strip().lower() for field in row]
+                if set(wanted_lst) <= set(header_lst):
+                    positions = [header_lst.index(col) for col in wanted_lst]
+                    fields = len(header_lst)
+                    continue
+                if set(wanted_lst) & set(header_lst):
+                    missing_lst = [col for col in wanted_lst if col not in header_lst]
+                    raise CsvHeaderError(F"{csv_file}: header row has no column {', '.join(missing_lst)}")
+            if len(row) != fields:
+                rejected_lines_lst.append(reader.line_num)
+                continue
+            yield row if positions is None else [row[pos] for pos in positions]
+
+def import_csv(csv_file, table_name, columns_lst, chunk_size=5000, verbose=False, progress=None, conn=None):
+    """imports csv_file into table_name,  chunk_size rows per transaction - on conn,  default connection if None
+    progress(rows_done, rows_per_second) is called after each chunk,  if given - raise from it to stop
+    returns db_methods.run_insert_many() result,  plus .rejected_lines - csv lines with the wrong number of fields"""
+
+    def report(rows_done, rows_per_second):
+        if verbose:
+            print(F"[blue]{csv_file}: {rows_done} rows,  {rows_per_second:.0f} rows/s")
+        if progress:
+            progress(rows_done, rows_per_second)
+
+    rejected_lines_lst = []
+    rows = read_csv_rows(csv_file, columns_lst, rejected_lines_lst)
+    result = run_insert_many(table_name, columns_lst, rows, chunk_size, verbose, conn, report)
+    result.rejected_lines = rejected_lines_lst
+
+    if verbose and rejected_lines_lst:
+        print(F"[yellow]{len(rejected_lines_lst)} malformed csv lines skipped - first ones: {rejected_lines_lst[:10]}")
+    return result
+
+class ImportSignals(C.QObject):
+    progress = C.Signal(int, float)   # rows done,  rows per second
+    finished = C.Signal(object)       # import_csv() result
+    failed = C.Signal(str)            # error text - also for cancelled imports
+
+class CsvImport(C.QRunnable):
+    """one import,  run by QThreadPool.globalInstance() - also the handle to cancel it"""
+
+    def __init__(self, csv_file, table_name, columns_lst, chunk_size=5000):
+        C.QRunnable.__init__(self)
+        self.setAutoDelete(False)   # python owns the handle - it outlives run()
+        self.signals = ImportSignals()
+        self.csv_file = csv_file
+        self.table_name = table_name
+        self.columns_lst = columns_lst
+        self.chunk_size = chunk_size
+        self.rows_done = 0
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _chunk_done(self, rows_done, rows_per_second):
+        self.rows_done = rows_done
+        if self._cancelled:
+            raise ImportCancelled()
+        self.signals.progress.emit(rows_done, rows_per_second)
+
+    def run(self):
+        try:
+            result = import_csv(self.csv_file, self.table_name, self.columns_lst, self.chunk_size, False,
+                                self._chunk_done, thread_connection())
+            self.signals.finished.emit(result)
+        except ImportCancelled:
+            self.signals.failed.emit(F"import cancelled - the first {self.rows_done} rows were already imported")
+        except DatabaseBusy as error:
+            self.signals.failed.emit(F"import failed - database busy,  try again\n{error}")
+        except (OSError, ValueError, csv.Error) as error:   # also CsvHeaderError,  UnicodeDecodeError
+            self.signals.failed.emit(F"import failed - {error}")
+        except SystemExit:   # thread_connection() could not open the database - error already printed
+            self.signals.failed.emit(F"import failed - see console\n{self.csv_file}")
+
+def start_import(csv_file, table_name, columns_lst, chunk_size=5000, on_progress=None, on_finished=None, on_failed=None):
+    """starts a CsvImport of csv_file in QThreadPool.globalInstance() - returns its handle
+    on_... slots are connected before the worker starts,  so no signal is missed"""
+    handle = CsvImport(csv_file, table_name, columns_lst, chunk_size)
+    for signal, slot in ((handle.signals.progress, on_progress), (handle.signals.finished, on_finished),
+                         (handle.signals.failed, on_failed)):
+        if slot is not None:
+            signal.connect(slot)
+    C.QThreadPool.globalInstance().start(handle)
+    return handle
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Background SELECT queries,  so that large list loads do not freeze the GUI
+
+A query submitted with submit_select() runs in a worker of query_pool,  on that worker's own read only
+connection (db_methods.thread_connection()),  and delivers its rows in chunks through Qt signals
+- connected slots run in the GUI thread as usual.
+
+Rows are read on demand - the worker reads prefetch_chunks chunks,  then waits until the consumer
+asks for more with request_more(),  so a list of a million rows is not read just to show the first screen.
+While waiting,  its query is finished - an open statement would hold a read transaction,  blocking writers
+(or WAL checkpoints) for as long as the list stays unscrolled.  More rows are then read by running
+select_str again,  with  LIMIT -1 OFFSET <rows delivered>  appended - so select_str must have no LIMIT of its own,
+and should have a unique ORDER BY (eg ending in id),  or rows may be skipped or repeated.
+The returned AsyncSelect is also the cancellation handle - cancel() stops the worker and finishes its query.
+
+Usage:
+    from Support.db_async import submit_select
+    handle = submit_select("SELECT * FROM Pacientes WHERE paterno LIKE ?", ["Gar%"], 256, 1,
+                           on_columns,      # list of field names,  before the first rows
+                           on_rows,         # list of row tuples
+                           on_finished,     # total rows read,  cancelled
+                           on_failed)       # error text
+    handle.request_more()
+    handle.cancel()
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+    #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+
+if "imports":
+    import sys
+    import threading
+    import PySide6.QtCore as C
+    import PySide6.QtSql as S
+
+    try:
+        from Support.dev_tools import console, log, bp, print, inspect
+        from Support.db_methods import thread_connection
+    except ModuleNotFoundError:
+        from dev_tools import console, log, bp, print, inspect
+        from db_methods import thread_connection
+
+if __name__ == '__main__':
+    console.clear()
+    print("[red][bold]\ndb_async.py not designed as a run alone module\n")
+    sys.exit(0)
+
+if "worker pool":
+    """own pool,  so that workers waiting for demand never hold up QThreadPool.globalInstance() users
+    Note: an idle worker thread exits after expiryTimeout,  which also removes its connection"""
+    query_pool = C.QThreadPool()
+    query_pool.setMaxThreadCount(4)
+    _active_handles = set()
+    _active_lock = threading.Lock()
+
+class AsyncSignals(C.QObject):
+    columns = C.Signal(object)        # list of field names
+    rows = C.Signal(object)           # list of row tuples
+    finished = C.Signal(int, bool)    # total rows delivered (after offset),  cancelled
+    failed = C.Signal(str)            # error text
+
+class AsyncSelect(C.QRunnable):
+    """one SELECT,  run by query_pool - also the handle to ask for more rows or to cancel it"""
+
+    def __init__(self, select_str, values=None, chunk_size=256, prefetch_chunks=1, read_only=True, offset=0):
+        C.QRunnable.__init__(self)
+        self.setAutoDelete(False)   # python owns the handle - it outlives run()
+        self.signals = AsyncSignals()
+        self.select_str = select_str
+        self.values = values
+        self.chunk_size = chunk_size
+        self.read_only = read_only
+        self.offset = offset        # rows of select_str to skip - eg already read from a cache
+
+        self._demand = threading.Condition()
+        self._wanted_chunks = prefetch_chunks
+        self._cancelled = False
+
+    # handle - called from the GUI thread
+
+    def request_more(self, chunks=1):
+        with self._demand:
+            self._wanted_chunks += chunks
+            self._demand.notify()
+
+    def request_all(self):
+        self.request_more(sys.maxsize // 2)
+
+    def cancel(self):
+        with self._demand:
+            self._cancelled = True
+            self._demand.notify()
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    # worker
+
+    def _wait_for_demand(self):
+        """blocks until the consumer wants another chunk - returns False if cancelled meanwhile"""
+        with self._demand:
+            while self._wanted_chunks <= 0 and not self._cancelled:
+                self._demand.wait()
+            self._wanted_chunks -= 1
+            return not self._cancelled
+
+    def _has_demand(self):
+        with self._demand:
+            return self._wanted_chunks > 0 and not self._cancelled
+
+    def _exec(self, offset):
+        """runs select_str from row offset on - returns the query,  or None after emitting failed"""
+        select_str = F"{self.select_str} LIMIT -1 OFFSET {offset}" if offset else self.select_str
+        query = S.QSqlQuery(thread_connection(self.read_only))
+        query.setForwardOnly(True)
+        query_ok = query.prepare(select_str)
+        if query_ok:
+            for pos, value in enumerate(self.values or []):
+                query.bindValue(pos, value)
+            query_ok = query.exec()
+        if not query_ok:
+            self.signals.failed.emit(F"{query.lastError().text()}\n{select_str}")
+            return None
+        return query
+
+    def run(self):
+        total = 0
+        query = None
+        try:
+            if self._cancelled:   # cancelled while still queued in query_pool
+                self.signals.finished.emit(0, True)
+                return
+            query = self._exec(self.offset)
+            if query is None:
+                return
+
+            record = query.record()
+            columns = record.count()
+            self.signals.columns.emit([record.fieldName(col) for col in range(columns)])
+
+            exhausted = False
+            while not exhausted:
+                if query is not None and not self._has_demand():   # no read transaction left open while waiting
+                    query.finish()
+                    query = None
+                if not self._wait_for_demand():
+                    break
+                if query is None:   # continue after the rows already delivered
+                    query = self._exec(self.offset + total)
+                    if query is None:
+                        return
+                chunk = []
+                while len(chunk) < self.chunk_size and not self._cancelled:
+                    if not query.next():
+                        exhausted = True
+                        break
+                    chunk.append(tuple(query.value(col) for col in range(columns)))
+                if self._cancelled:
+                    break
+                total += len(chunk)
+                self.signals.rows.emit(chunk)
+
+            if query is not None:
+                query.finish()
+                query = None
+            self.signals.finished.emit(total, self._cancelled)
+        except SystemExit:   # thread_connection() could not open the database
+            self.signals.failed.emit(F"no database connection for\n{self.select_str}")
+        finally:
+            if query is not None:
+                query.finish()
+            with _active_lock:
+                _active_handles.discard(self)
+
+def submit_select(select_str, values=None, chunk_size=256, prefetch_chunks=1,
+                  on_columns=None, on_rows=None, on_finished=None, on_failed=None, read_only=True, offset=0):
+    """starts select_str (a template with ? placeholders if values given) in query_pool - returns its AsyncSelect handle
+    offset skips the first rows - as when continuing a partly read result
+    on_... slots are connected before the worker starts,  so no signal is missed
+    Note: use methods of a QObject living in the GUI thread as slots - they are then called in the GUI thread"""
+    handle = AsyncSelect(select_str, values, chunk_size, prefetch_chunks, read_only, offset)
+    for signal, slot in ((handle.signals.columns, on_columns), (handle.signals.rows, on_rows),
+                         (handle.signals.finished, on_finished), (handle.signals.failed, on_failed)):
+        if slot is not None:
+            signal.connect(slot)
+    with _active_lock:
+        _active_handles.add(handle)
+    query_pool.start(handle)
+    return handle
+
+def cancel_all_selects(wait_ms=-1):
+    """on application exit,  before db_methods.close_all_connections() - workers waiting for demand would never end"""
+    with _active_lock:
+        handles = list(_active_handles)
+    for handle in handles:
+        handle.cancel()
+    query_pool.waitForDone(wait_ms)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Online backup of the open sqlite database,  without freezing the GUI
+
+Unlike copying the file,  the SQLite backup API always produces a consistent copy,  even while
+other users keep writing - pages are copied pages_per_step at a time,  and the copy restarts
+by itself if the database changes under it.
+
+Each backup runs on a worker of QThreadPool.globalInstance():
+    1. copy pages into  <folder>/<db name>_<date>_<time>.db          progress(pages done, pages total)
+    2. PRAGMA integrity_check on the copy - a corrupt copy is deleted and reported as failed
+    3. gzip the copy to  ....db.gz,  if compress
+       or,  if a store folder is given,  add only its changed pages to that incremental store - see backup_store.py
+    4. rotate_backups() - keeps the newest backup of each of the last days/weeks/months in retention_policy
+
+Usage:
+    from Support.db_backup import start_backup
+    handle = start_backup("archivos.db", "db_backups", on_progress=..., on_stage=..., on_finished=..., on_failed=...)
+    handle.cancel()
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+    #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+
+if "imports":
+    import os
+    import re
+    import sys
+    import gzip
+    import time
+    import shutil
+    import sqlite3
+    import datetime
+    from types import SimpleNamespace
+    import PySide6.QtCore as C
+
+    try:
+        from Support.dev_tools import console, log, bp, print, inspect
+    except ModuleNotFoundError:
+        from dev_tools import console, log, bp, print, inspect
+
+if __name__ == '__main__':
+    console.clear()
+    print("[red][bold]\ndb_backup.py not designed as a run alone module\n")
+    sys.exit(0)
+
+if "rotation":
+    """grandfather-father-son retention - the newest backup of each of the last 'daily' days,
+    'weekly' ISO weeks and 'monthly' months is kept,  all other backups of the same database are deleted"""
+    retention_policy = {"daily": 7, "weekly": 4, "monthly": 12}
+    _stamp_re = re.compile(r"_(\d{4}-\d{2}-\d{2})(?:_(\d{6}))?\.db(?:\.gz)?$")
+
+def backup_stamp(file_name):
+    """datetime from a backup file name,  or None if not a backup - old copyfile() backups only have a date"""
+    match = _stamp_re.search(file_name)
+    if match is None:
+        return None
+    return datetime.datetime.strptime(F"{match.group(1)} {match.group(2) or '000000'}", "%Y-%m-%d %H%M%S")
+
+def kept_by_policy(dated_lst, policy=None):
+    """returns the set of names kept by policy,  from dated_lst - list of (datetime, name)"""
+    policy = dict(retention_policy, **(policy or {}))
+    dated_lst = sorted(dated_lst, reverse=True)   # newest first
+    keep = set()
+    for period, period_of in (("daily", lambda stamp: stamp.date()),
+                              ("weekly", lambda stamp: stamp.isocalendar()[:2]),
+                              ("monthly", lambda stamp: (stamp.year, stamp.month))):
+        periods_seen = set()
+        for stamp, name in dated_lst:
+            period_key = period_of(stamp)
+            if period_key in periods_seen:
+                continue
+            if len(periods_seen) >= policy[period]:
+                break
+            periods_seen.add(period_key)
+            keep.add(name)
+    return keep
+
+def rotate_backups(folder, db_stem, policy=None, verbose=False):
+    """deletes backups of db_stem in folder not kept by policy - returns list of deleted files"""
+    backups_lst = []
+    for file_name in os.listdir(folder):
+        stamp = backup_stamp(file_name)
+        if file_name.startswith(F"{db_stem}_") and stamp is not None:
+            backups_lst.append((stamp, file_name))
+    keep = kept_by_policy(backups_lst, policy)
+
+    deleted_lst = []
+    for _stamp, file_name in sorted(backups_lst):
+        if file_name not in keep:
+            os.remove(os.path.join(folder, file_name))
+            deleted_lst.append(file_name)
+            if verbose:
+                print(F"[yellow]backup rotated out - {file_name}")
+    return deleted_lst
+
+if "copy and check":
+    """also used by backup_store.py - no Qt needed"""
+
+def online_copy(db_file, target_path, pages_per_step=256, progress=None, pause_seconds=0.005):
+    """consistent copy of db_file into target_path,  with the SQLite backup API - returns page count
+    progress(status, remaining, total) is called after each step - raise from it to abort the copy"""
+    def step_done(status, remaining, total):
+        if progress:
+            progress(status, remaining, total)
+        time.sleep(pause_seconds)   # between steps,  so writers in rollback journal mode get their turn
+
+    source = sqlite3.connect(F"file:{os.path.abspath(db_file)}?mode=ro", uri=True)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target, pages=pages_per_step, progress=step_done)
+        target.execute("PRAGMA journal_mode = DELETE")   # one self contained file,  even from a WAL database
+        return target.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        target.close()
+        source.close()
+
+def check_integrity(db_file):
+    """raises sqlite3.DatabaseError unless PRAGMA integrity_check of db_file is ok"""
+    conn = sqlite3.connect(F"file:{os.path.abspath(db_file)}?mode=ro", uri=True)
+    try:
+        check_lst = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    finally:
+        conn.close()
+    if check_lst != ["ok"]:
+        raise sqlite3.DatabaseError(F"integrity check failed - {'; '.join(check_lst[:5])}")
+
+class BackupCancelled(Exception):
+    pass
+
+class BackupSignals(C.QObject):
+    progress = C.Signal(int, int)     # pages done,  pages total
+    stage = C.Signal(str)             # "copying", "checking", "compressing", "rotating"
+    finished = C.Signal(object)       # SimpleNamespace(path, size, pages, seconds, deleted_lst) - size is bytes written
+    failed = C.Signal(str)            # error text - also for cancelled backups
+
+class OnlineBackup(C.QRunnable):
+    """one backup,  run by QThreadPool.globalInstance() - also the handle to cancel it"""
+
+    def __init__(self, db_file, folder="db_backups", pages_per_step=256, pause_seconds=0.005,
+                 compress=True, policy=None, store=None):
+        C.QRunnable.__init__(self)
+        self.setAutoDelete(False)   # python owns the handle - it outlives run()
+        self.signals = BackupSignals()
+        self.db_file = db_file
+        self.folder = folder
+        self.pages_per_step = pages_per_step
+        self.pause_seconds = pause_seconds
+        self.compress = compress
+        self.policy = policy
+        self.store = store   # incremental store folder,  instead of a full copy per backup
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _step_done(self, _status, remaining, total):
+        if self._cancelled:
+            raise BackupCancelled()
+        self.signals.progress.emit(total - remaining, total)
+
+    def run(self):
+        start = time.perf_counter()
+        db_stem = os.path.splitext(os.path.basename(self.db_file))[0]
+        os.makedirs(self.folder, exist_ok=True)
+        backup_path = os.path.join(self.folder, F"{db_stem}_{datetime.datetime.now():%Y-%m-%d_%H%M%S}.db")
+        result = SimpleNamespace(path=backup_path, size=0, pages=0, seconds=0.0, deleted_lst=[])
+        try:
+            if "copy pages":
+                self.signals.stage.emit("copying")
+                result.pages = online_copy(self.db_file, backup_path, self.pages_per_step, self._step_done, self.pause_seconds)
+
+            if "integrity check":
+                self.signals.stage.emit("checking")
+                check_integrity(backup_path)
+
+            if self.store:
+                try:   # here,  not at the top - backup_store imports this module
+                    from Support.backup_store import add_snapshot, prune_store   #pylint:disable=import-outside-toplevel
+                except ModuleNotFoundError:
+                    from backup_store import add_snapshot, prune_store           #pylint:disable=import-outside-toplevel
+                self.signals.stage.emit("storing")
+                stored = add_snapshot(self.store, backup_path, db_stem)
+                os.remove(backup_path)
+                self.signals.stage.emit("rotating")
+                result.deleted_lst, _pages = prune_store(self.store, self.policy)
+                result.path = os.path.join(self.store, "manifests", stored.manifest)
+                result.size = stored.new_bytes
+                result.seconds = time.perf_counter() - start
+                self.signals.finished.emit(result)
+                return
+
+            if self.compress:
+                self.signals.stage.emit("compressing")
+                with open(backup_path, "rb") as file, gzip.open(F"{backup_path}.gz", "wb", compresslevel=6) as gz_file:
+                    shutil.copyfileobj(file, gz_file, 1024 * 1024)
+                os.remove(backup_path)
+                result.path = F"{backup_path}.gz"
+
+            if "rotation":
+                self.signals.stage.emit("rotating")
+                result.deleted_lst = rotate_backups(self.folder, db_stem, self.policy)
+
+            result.size = os.path.getsize(result.path)
+            result.seconds = time.perf_counter() - start
+            self.signals.finished.emit(result)
+
+        except Exception as error:   #pylint:disable=broad-except
+            # any error - eg ValueError/KeyError of a corrupt store manifest - must end in failed,
+            # an exception leaving run() would leave the GUI waiting for ever
+            for path in (backup_path, F"{backup_path}.gz", F"{backup_path}-journal", F"{backup_path}-wal", F"{backup_path}-shm"):
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                except OSError:
+                    pass
+            if isinstance(error, BackupCancelled):
+                self.signals.failed.emit("backup cancelled")
+            else:
+                self.signals.failed.emit(F"backup failed - {type(error).__name__}: {error}")
+
+def start_backup(db_file, folder="db_backups", pages_per_step=256, compress=True, policy=None,
+                 on_progress=None, on_stage=None, on_finished=None, on_failed=None, store=None):
+    """starts an OnlineBackup of db_file in QThreadPool.globalInstance() - returns its handle
+    on_... slots are connected before the worker starts,  so no signal is missed"""
+    handle = OnlineBackup(db_file, folder, pages_per_step, 0.005, compress, policy, store)
+    for signal, slot in ((handle.signals.progress, on_progress), (handle.signals.stage, on_stage),
+                         (handle.signals.finished, on_finished), (handle.signals.failed, on_failed)):
+        if slot is not None:
+            signal.connect(slot)
+    C.QThreadPool.globalInstance().start(handle)
+    return handle
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Streaming export of a (filtered) table to CSV or JSON lines,  without freezing the GUI
+
+Rows go straight from a forward only query,  through a generator,  into the file - memory use does not
+depend on the number of rows,  and the list widget is not involved at all.
+CSV files have a header row and are UTF-8,  so csv_import.import_csv() can read them back -
+it picks its columns by name from the header,  and ignores the id column (imported rows get new ids).
+JSON lines files hold one {"column": value, ...} object per row.
+
+Each export runs on a worker of QThreadPool.globalInstance(),  with its own read only connection
+(db_methods.thread_connection()),  and writes to <file>.part - renamed to <file> only when complete,
+so a cancelled or failed export never leaves a truncated file behind.
+
+Usage:
+    from Support.db_export import start_export
+    handle = start_export("Pacientes", prj.filter_str, "pacientes.csv", on_progress=..., on_finished=..., on_failed=...)
+    handle.cancel()
+
+    # without Qt signals,  eg from a script - on the default connection
+    result = export_query("SELECT * FROM Pacientes", None, "pacientes.jsonl")
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+    #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+
+if "imports":
+    import os
+    import sys
+    import csv
+    import json
+    import time
+    from types import SimpleNamespace
+    import PySide6.QtCore as C
+
+    try:
+        from Support.dev_tools import console, log, bp, print, inspect
+        from Support.db_methods import run_query, thread_connection, DatabaseBusy
+    except ModuleNotFoundError:
+        from dev_tools import console, log, bp, print, inspect
+        from db_methods import run_query, thread_connection, DatabaseBusy
+
+if __name__ == '__main__':
+    console.clear()
+    print("[red][bold]\ndb_export.py not designed as a run alone module\n")
+    sys.exit(0)
+
+if "formats":
+    export_formats = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+    progress_seconds = 0.1   # at most 10 progress reports a second,  however fast rows are written
+
+def export_format(path):
+    """"csv" or "jsonl",  from the file extension - csv if unknown"""
+    return export_formats.get(os.path.splitext(path)[1].lower(), "csv")
+
+def filter_where_str(filter_str):
+    """prj.filter_str -> ' WHERE ...' clause,  or '' - same rules as ListWidget.update_list_widget()"""
+    filter_str = filter_str.strip()
+    if not filter_str or filter_str.count("'%%'"):
+        return ""
+    return F" WHERE {filter_str}"
+
+class ExportCancelled(Exception):
+    pass
+
+def query_rows(query):
+    """generator - yields the rows of an executed forward only query as tuples,  then finishes it"""
+    columns = query.record().count()
+    try:
+        while query.next():
+            yield tuple(query.value(col) for col in range(columns))
+    finally:
+        query.finish()
+
+def _json_value(value):
+    """values json can not write as is - eg QByteArray of a BLOB column"""
+    return str(value)
+
+def write_rows(rows, headers_lst, file, fmt="csv", progress=None):
+    """writes rows (any iterable of tuples) to an open text file - returns rows written
+    progress(rows_written) is called now and then - raise from it to stop"""
+    if fmt == "csv":
+        writer = csv.writer(file)
+        writer.writerow(headers_lst)
+        write_row = writer.writerow
+    else:
+        def write_row(row):
+            file.write(json.dumps(dict(zip(headers_lst, row)), ensure_ascii=False, default=_json_value))
+            file.write("\n")
+
+    written = 0
+    next_report = time.perf_counter() + progress_seconds
+    for row in rows:
+        write_row(row)   # csv writes None as an empty field,  json as null
+        written += 1
+        if progress and not written % 1000 and time.perf_counter() >= next_report:
+            progress(written)
+            next_report = time.perf_counter() + progress_seconds
+    if progress:
+        progress(written)
+    return written
+
+def export_query(select_str, values, path, fmt=None, progress=None, conn=None):
+    """streams the rows of select_str into path (via path.part) - returns SimpleNamespace(path, rows, size, seconds)
+    fmt "csv" or "jsonl",  from the extension of path if None - see write_rows() for progress"""
+    start = time.perf_counter()
+    fmt = fmt or export_format(path)
+    query = run_query(select_str, values, conn, "forward only")
+    record = query.record()
+    headers_lst = [record.fieldName(col) for col in range(record.count())]
+
+    part_path = F"{path}.part"
+    try:
+        with open(part_path, "w", encoding="UTF-8", newline="") as file:
+            rows = write_rows(query_rows(query), headers_lst, file, fmt, progress)
+        os.replace(part_path, path)
+    except BaseException:
+        query.finish()
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return SimpleNamespace(path=path, rows=rows, size=os.path.getsize(path), seconds=time.perf_counter() - start)
+
+class ExportSignals(C.QObject):
+    progress = C.Signal(int, int)     # rows written,  total rows (-1 until counted)
+    finished = C.Signal(object)       # SimpleNamespace(path, rows, size, seconds)
+    failed = C.Signal(str)            # error text - also for cancelled exports
+
+class ListExport(C.QRunnable):
+    """one export,  run by QThreadPool.globalInstance() - also the handle to cancel it"""
+
+    def __init__(self, table_name, filter_str, path, fields_lst=None, order_str="", fmt=None, count_rows=True):
+        C.QRunnable.__init__(self)
+        self.setAutoDelete(False)   # python owns the handle - it outlives run()
+        self.signals = ExportSignals()
+        self.path = path
+        self.fmt = fmt
+        self.count_rows = count_rows
+        where_str = filter_where_str(filter_str)
+        fields_str = ", ".join(fields_lst) if fields_lst else "*"
+        self.select_str = F"SELECT {fields_str} FROM {table_name}{where_str} {order_str}"
+        self.count_str = F"SELECT COUNT(*) FROM {table_name}{where_str}"
+        self._total = -1
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _rows_written(self, rows):
+        if self._cancelled:
+            raise ExportCancelled()
+        self.signals.progress.emit(rows, self._total)
+
+    def write(self, conn):
+        """the export itself - subclassed for other file types,  see pdf_report.PdfReport"""
+        return export_query(self.select_str, None, self.path, self.fmt, self._rows_written, conn)
+
+    def run(self):
+        try:
+            conn = thread_connection("read only")
+            if self.count_rows:   # only for the progress bar - usually an index scan,  much faster than the export
+                query = run_query(self.count_str, None, conn)
+                self._total = query.value(0) if query.next() else -1
+                query.finish()
+            self._rows_written(0)
+            self.signals.finished.emit(self.write(conn))
+        except ExportCancelled:
+            self.signals.failed.emit("export cancelled")
+        except OSError as error:
+            self.signals.failed.emit(F"export failed - {error}")
+        except DatabaseBusy as error:
+            self.signals.failed.emit(F"export failed - database busy,  try again\n{error}")
+        except SystemExit:   # run_query() could not run the query - error already printed
+            self.signals.failed.emit(F"export failed - see console\n{self.select_str}")
+
+def start_export(table_name, filter_str, path, fields_lst=None, order_str="", fmt=None,
+                 on_progress=None, on_finished=None, on_failed=None):
+    """starts a ListExport of table_name filtered by filter_str (as prj.filter_str) in QThreadPool.globalInstance()
+    returns its handle - on_... slots are connected before the worker starts,  so no signal is missed"""
+    handle = ListExport(table_name, filter_str, path, fields_lst, order_str, fmt)
+    for signal, slot in ((handle.signals.progress, on_progress), (handle.signals.finished, on_finished),
+                         (handle.signals.failed, on_failed)):
+        if slot is not None:
+            signal.connect(slot)
+    C.QThreadPool.globalInstance().start(handle)
+    return handle
@@ -6,19 +6,33 @@
 Methods to open sqlite database and to execute SELECT, DELETE, UPDATE, INSERT statements
 with error handling and option for verbose diagnostics during development
 
+All methods use the default connection opened by open_database(),  unless given a _conn argument -
+worker threads must use their own connection,  from thread_connection()
+
+Statements can be passed either as fully formatted strings,  or as an SQL template with ? placeholders
+plus a list of values - templates are prepared once per connection and reused (see prepared_query())
+
 See below for usage examples
 """
 #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
 
 if "imports":
+    import re
     import sys
+    import time
+    import threading
+    from itertools import islice
+    from collections import OrderedDict
+    from types import SimpleNamespace
     import PySide6.QtSql as S
     #pylint:disable=unused-import, redefined-builtin
     try:
         import msg_boxes as mbx
+        from config_json import open_json
         from dev_tools import bp, log, print, console, inspect
     except ModuleNotFoundError:
         import Support.msg_boxes as mbx
+        from Support.config_json import open_json
         from Support.dev_tools import bp, log, print, console, inspect
 
 if __name__ == '__main__':
@@ -26,8 +40,62 @@ if __name__ == '__main__':
     "[blue]Note: This module should be imported by all project modules, that may need these database functions.")
     sys.exit()
 
-def open_database(_database_name, _verbose_diagnostics=False):
-    """ """
+if "sqlite performance profiles":
+    """Named sets of PRAGMA settings applied to each connection by open_database() and thread_connection()
+    Profile is selected by "sqlite_profile" in config.json,   which can also add/override profiles under "sqlite_profiles"
+    - default   SQLite defaults:  rollback journal,  synchronous=FULL,  small page cache,  no mmap
+    - office    WAL,  so list refreshes do not block while someone saves a form (and vice versa)
+                only while every query is finished after use - an open read keeps its connection on an old snapshot,
+                and its next write then fails with DatabaseBusy (SQLITE_BUSY_SNAPSHOT) - see run_select()
+    Note: cache_size < 0 is in KiB,  mmap_size in bytes,  busy_timeout in milliseconds
+    """
+    sqlite_profiles = {
+        "default": {},
+        "office": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -16000,
+            "mmap_size": 64 * 1024 * 1024,
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+            },
+        }
+    sqlite_pragma_order = ["busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store"]
+    sqlite_pragma_names = {  # PRAGMA read back returns numbers for these
+        "synchronous": {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"},
+        "temp_store": {0: "DEFAULT", 1: "FILE", 2: "MEMORY"},
+        }
+    active_profile = SimpleNamespace(name="default", pragmas={})
+
+def load_sqlite_profile(_profile_name=None, _config_json_file="config.json"):
+    """returns (name, pragmas dict) for _profile_name,  or for the profile named in config.json"""
+    config_dict = open_json(_config_json_file) or {}
+    profiles = dict(sqlite_profiles)
+    profiles.update(config_dict.get("sqlite_profiles", {}))
+    profile_name = _profile_name or config_dict.get("sqlite_profile", "default")
+    if profile_name not in profiles:
+        print(F"[yellow]sqlite profile '{profile_name}' not found in {_config_json_file} - using SQLite defaults")
+        profile_name = "default"
+    return profile_name, profiles[profile_name]
+
+def apply_sqlite_profile(_conn, _read_only=False):
+    """applies active_profile PRAGMAs to _conn,  returns dict of the values that actually took effect
+    journal_mode is stored in the database file,  so is not set from read only connections"""
+    effective = {}
+    for pragma in sqlite_pragma_order:
+        if pragma not in active_profile.pragmas or (_read_only and pragma == "journal_mode"):
+            continue
+        query = run_query(F"PRAGMA {pragma} = {active_profile.pragmas[pragma]}", None, _conn)
+        query.finish()
+        query = run_query(F"PRAGMA {pragma}", None, _conn)
+        if query.next():
+            effective[pragma] = sqlite_pragma_names.get(pragma, {}).get(query.value(0), query.value(0))
+        query.finish()
+    return effective
+
+def open_database(_database_name, _verbose_diagnostics=False, _profile_name=None):
+    """opens default connection,  then applies sqlite performance profile - see load_sqlite_profile()"""
+    clear_prepared_cache(default_connection_name)  # in case reopened
     conn = S.QSqlDatabase.addDatabase("QSQLITE")
     conn.setDatabaseName(_database_name)
     if not conn.open("", ""):
@@ -35,10 +103,18 @@ def open_database(_database_name, _verbose_diagnostics=False):
         print(F"[red]{conn.databaseName()} {msg1}")
         sys.exit(1)
 
+    active_profile.name, active_profile.pragmas = load_sqlite_profile(_profile_name)
+    effective = apply_sqlite_profile(conn)
+
     if _verbose_diagnostics:
         print("\n[green]Database Connection:")
         print(F"con               = {conn}")
         print(F"database name     = {conn.databaseName()}")
+        print(F"sqlite profile    = {active_profile.name}")
+        for pragma, value in effective.items():
+            requested = active_profile.pragmas[pragma]
+            color = "green" if str(value).lower() == str(requested).lower() else "yellow"
+            print(F"    {pragma.ljust(14)}= [{color}]{value}[/{color}]   (requested {requested})")
         #print(F"conn.lastError()  = {conn.lastError().text()}")
         print(F"conn.tables       = {conn.tables()}", end='  ')
 
@@ -51,27 +127,257 @@ def open_database(_database_name, _verbose_diagnostics=False):
             print()
         print()
 
-def run_query(_sql_str):
-    """shared by following """
-    query = S.QSqlQuery()
-    # query.exec() returns False if query was unsuccessful
-    if not query.exec(_sql_str):
-        print(F"\n{_sql_str}")
+if "prepared statement cache":
+    """LRU caches of prepared QSqlQuery objects,  one per connection,  keyed on SQL template
+    so that hot statements like  SELECT * FROM Pacientes WHERE id = ?  are only parsed/planned once per connection
+    Note: each connection (and so its cache) is only used by the thread that owns it - see thread_connection()"""
+    prepared_cache_size = 64
+    _prepared_caches = {}  # connection name -> OrderedDict((SQL template, forward only) -> QSqlQuery)
+    prepared_stats = SimpleNamespace(hits=0, misses=0)   # of all threads - updated under _stats_lock
+    _stats_lock = threading.Lock()
+
+def prepared_query(_sql_template, _conn=None, _forward_only=False):
+    """returns a prepared QSqlQuery for _sql_template,  from cache if available
+    a cached query is finished first,  so a result left unread by its last user no longer holds a read transaction
+    Note: the returned query is shared - copy its values (eg query.record()) before running the same template again"""
+    if _conn is None:
+        _conn = S.QSqlDatabase.database()
+    cache = _prepared_caches.setdefault(_conn.connectionName(), OrderedDict())
+    key = (_sql_template, bool(_forward_only))
+
+    query = cache.get(key)
+    if query is not None:
+        query.finish()
+        cache.move_to_end(key)
+        with _stats_lock:
+            prepared_stats.hits += 1
+        return query
+
+    with _stats_lock:
+        prepared_stats.misses += 1
+    query = S.QSqlQuery(_conn)
+    query.setForwardOnly(bool(_forward_only))
+    if not query.prepare(_sql_template):
+        print(F"\n{_sql_template}")
         print(F"[red]\n{query.lastError()}")
         sys.exit(1)
+
+    cache[key] = query
+    if len(cache) > prepared_cache_size:
+        cache.popitem(last=False)[1].finish()
+    return query
+
+def clear_prepared_cache(_conn_name=None):
+    """drop cached queries - for all connections,  or only those of _conn_name (before closing that connection)"""
+    conn_names = list(_prepared_caches) if _conn_name is None else [_conn_name]
+    for conn_name in conn_names:
+        for query in _prepared_caches.pop(conn_name, {}).values():
+            query.finish()
+
+def print_prepared_stats():
+    with _stats_lock:
+        hits, misses = prepared_stats.hits, prepared_stats.misses
+    total = hits + misses
+    rate = 100 * hits / total if total else 0
+    print(F"[green]prepared statements: {hits} hits, {misses} misses ({rate:.0f}% hit rate), "
+          F"{sum(len(cache) for cache in _prepared_caches.values())} cached")
+
+if "per thread connections":
+    """A QSqlDatabase connection can only be used in the thread that created it,
+    so each worker thread gets its own named connection,  cloned from the default connection of open_database()
+    Connections are removed by release_thread_connections(),  or automatically when the thread exits
+    - always by the thread that opened them,  as Qt requires"""
+    _thread_local = threading.local()
+    _pool_lock = threading.Lock()
+    pool_connection_owners = {}   # connection name -> threading.get_ident() of the thread that opened it
+    default_connection_name = "qt_sql_default_connection"  # QSqlDatabase::defaultConnection,  not exposed by PySide6
+
+class _ThreadConnections():
+    """connection names owned by one thread - kept in _thread_local,  so __del__ runs when the thread exits"""
+    def __init__(self):
+        self.names = {}  # read_only flag -> connection name
+
+    def __del__(self):
+        for conn_name in self.names.values():
+            _remove_connection(conn_name)
+        self.names.clear()
+
+def _remove_connection(_conn_name):
+    clear_prepared_cache(_conn_name)
+    conn = S.QSqlDatabase.database(_conn_name, False)
+    conn.close()
+    del conn  # removeDatabase() requires no remaining references to the connection
+    S.QSqlDatabase.removeDatabase(_conn_name)
+    with _pool_lock:
+        pool_connection_owners.pop(_conn_name, None)
+
+def thread_connection(_read_only=False):
+    """returns the QSqlDatabase connection for the current thread
+    GUI (main) thread  ->  default connection of open_database(),  unless _read_only
+    other threads      ->  one named connection per thread,  opened on first use
+    _read_only connections are opened with QSQLITE_OPEN_READONLY - use for list loads, exports, backups"""
+    if threading.current_thread() is threading.main_thread() and not _read_only:
+        return S.QSqlDatabase.database()
+
+    holder = getattr(_thread_local, "connections", None)
+    if holder is None:
+        holder = _thread_local.connections = _ThreadConnections()
+
+    conn_name = holder.names.get(_read_only)
+    if conn_name is not None:
+        return S.QSqlDatabase.database(conn_name)
+
+    conn_name = F"thread_{threading.get_ident()}_{'ro' if _read_only else 'rw'}"
+    if S.QSqlDatabase.contains(conn_name):  # left over by an earlier thread with the same ident
+        _remove_connection(conn_name)
+
+    conn = S.QSqlDatabase.cloneDatabase(default_connection_name, conn_name)
+    conn.setConnectOptions("QSQLITE_OPEN_READONLY" if _read_only else "")
+    if not conn.open():
+        print(F"[red]Cannot open connection {conn_name} to {conn.databaseName()}\n{conn.lastError().text()}")
+        sys.exit(1)
+    apply_sqlite_profile(conn, _read_only)
+
+    holder.names[_read_only] = conn_name
+    with _pool_lock:
+        pool_connection_owners[conn_name] = threading.get_ident()
+    return conn
+
+def release_thread_connections():
+    """close and remove connections of the current thread - call at the end of a worker task"""
+    holder = getattr(_thread_local, "connections", None)
+    if holder is not None:
+        del _thread_local.connections
+
+def close_all_connections():
+    """on application exit - closes the default connection and the other connections of this (GUI) thread,
+    after letting SQLite refresh planner statistics for the indexes,  if needed
+    Connections of worker threads are removed by their own thread when its task ends - Qt does not support
+    removing them from another thread - so stop the workers first,  eg db_async.cancel_all_selects()"""
+    release_thread_connections()
+    with _pool_lock:
+        own_lst = [name for name, owner in pool_connection_owners.items() if owner == threading.get_ident()]
+        others_lst = [name for name in pool_connection_owners if name not in own_lst]
+    for conn_name in own_lst:
+        _remove_connection(conn_name)
+    if others_lst:
+        print(F"[yellow]connections still open in worker threads - left to them: {', '.join(sorted(others_lst))}")
+    clear_prepared_cache(default_connection_name)
+    run_query("PRAGMA optimize").finish()
+    S.QSqlDatabase.database(open=False).close()
+
+class DatabaseBusy(Exception):
+    """raised by run_query() when another connection kept the database locked beyond busy_timeout,
+    or (WAL) when this connection's snapshot is older than a commit it would overwrite (SQLITE_BUSY_SNAPSHOT)
+    - the statement did not run,  so the caller can tell the user and let them try again"""
+
+busy_error_codes = {5, 6}   # SQLITE_BUSY, SQLITE_LOCKED - extended codes (eg 517 BUSY_SNAPSHOT) share the low byte
+
+def is_busy_error(_sql_error):
+    code = _sql_error.nativeErrorCode()
+    return code.isdigit() and int(code) & 0xff in busy_error_codes
+
+def run_query(_sql_str, _values=None, _conn=None, _forward_only=False):
+    """shared by following
+    _values is None  ->  _sql_str is a complete statement,  executed directly
+    otherwise        ->  _sql_str is a template with ? placeholders,  bound to _values in a cached prepared query
+    _conn            ->  connection to use,  default connection if None
+    _forward_only    ->  rows can only be read once,  with next() - Qt does not keep them for first()/previous()/seek()
+    raises DatabaseBusy if the database is locked by another connection - any other error ends the program
+    """
+    if _values is None:
+        query = S.QSqlQuery(_conn) if _conn is not None else S.QSqlQuery()
+        query.setForwardOnly(bool(_forward_only))
+        # query.exec() returns False if query was unsuccessful
+        query_ok = query.exec(_sql_str)
+    else:
+        query = prepared_query(_sql_str, _conn, _forward_only)
+        for pos, value in enumerate(_values):
+            query.bindValue(pos, value)
+        query_ok = query.exec()
+
+    if not query_ok:
+        error = query.lastError()
+        query.finish()
+        if is_busy_error(error):
+            raise DatabaseBusy(F"{error.databaseText()} ({error.nativeErrorCode()})")
+        print(F"\n{_sql_str}")
+        if _values is not None:
+            print(F"values = {list(_values)}")
+        print(F"[red]\n{error}")
+        sys.exit(1)
     return query
 
-def run_select(_select_str, _verbose=False):
+if "table versions":
+    """change counters,  so cached query results can tell whether they are still current - see result_version()
+    - table_versions are bumped by run_insert(), run_update(), run_delete() and run_batch() for the table they write
+    - PRAGMA data_version changes when any OTHER connection commits,  for example another copy of the program
+      using the same database file - but only once the connection asking has no read transaction open,
+      so it is read on a connection of its own (version_connection()),  which never has one"""
+    version_connection_name = "data_version"
+    table_versions = {}    # lower case table name -> writes through this module
+    unknown_writes = 0     # writes whose table could not be parsed - invalidate everything
+    _write_table_re = re.compile(
+        r"^\s*(?:INSERT|REPLACE)(?:\s+OR\s+\w+)?\s+INTO\s+[\[\"`]?(\w+)"
+        r"|^\s*UPDATE(?:\s+OR\s+\w+)?\s+[\[\"`]?(\w+)"
+        r"|^\s*DELETE\s+FROM\s+[\[\"`]?(\w+)", re.IGNORECASE)
+
+def note_table_write(_sql_str):
+    """bumps the version of the table written by _sql_str"""
+    global unknown_writes   #pylint:disable=global-statement
+    match = _write_table_re.match(_sql_str)
+    if match is None:
+        unknown_writes += 1
+        return
+    table_name = next(name for name in match.groups() if name).lower()
+    table_versions[table_name] = table_versions.get(table_name, 0) + 1
+
+def version_connection():
+    """read only connection used only by data_version() - opened on first use,  GUI (main) thread only
+    its queries are always finished,  so each PRAGMA data_version sees the latest commit of every other connection
+    - including the default connection's own writes"""
+    if S.QSqlDatabase.contains(version_connection_name):
+        return S.QSqlDatabase.database(version_connection_name)
+    conn = S.QSqlDatabase.cloneDatabase(default_connection_name, version_connection_name)
+    conn.setConnectOptions("QSQLITE_OPEN_READONLY")
+    if not conn.open():
+        print(F"[red]Cannot open connection {version_connection_name} to {conn.databaseName()}\n{conn.lastError().text()}")
+        sys.exit(1)
+    with _pool_lock:
+        pool_connection_owners[version_connection_name] = threading.get_ident()   # closed by close_all_connections()
+    return conn
+
+def data_version(_conn=None):
+    """PRAGMA data_version of _conn,  or of version_connection() if None"""
+    query = run_query("PRAGMA data_version", None, _conn if _conn is not None else version_connection())
+    query.first()
+    version = query.value(0)
+    query.finish()
+    return version
+
+def result_version(_table_name):
+    """compare with the value saved when a result was read - equal means the table did not change since"""
+    return (data_version(), unknown_writes, table_versions.get(_table_name.lower(), 0))
+
+def run_select(_select_str, _verbose=False, _values=None, _conn=None):
     """returns query to parent module so can use query.isValid(), query.value(), query.next() as needed
      SELECT [column1, column2, columnN | * ] FROM table_name [WHERE condition]
      SELECT COUNT [* | column_name] FROM table_name [WHERE condition]
      SELECT SUM(column_name) FROM table_name [WHERE condition]
+     with _values,  _select_str is a template -  SELECT * FROM table_name WHERE id = ?
+     _verbose also checks the query plan,  warning when a WHERE condition needs a full table SCAN
+     Note: call query.finish() once the values are read - until then the query holds a read transaction,
+     which blocks writers (or checkpoints in WAL mode) and keeps this connection on an old snapshot
+     for a single row,  run_select_record() returns a copy and finishes the query itself
      """
 
-    query = run_query(_select_str)
+    query = run_query(_select_str, _values, _conn)
     query.first()
     if _verbose:
+        check_query_plan(_select_str, _values, _conn)
         print(F"\n{query.lastQuery()}")
+        if _values is not None:
+            print(F"values = {list(_values)}")
         if query.isValid():
             if _verbose:
                 print("[green]SELECT query successful\n")
@@ -79,36 +385,348 @@ def run_select(_select_str, _verbose=False):
                 print("[yellow]query okay but found no records\n")
     return query
 
-def run_insert(_insert_str, _verbose=False):
+def run_select_record(_select_str, _values=None, _conn=None):
+    """returns a copy (QSqlRecord) of the first row of _select_str,  or None if there is none - with the query finished,
+    so no read transaction is left open,  and later runs of the same template do not change the copy
+     record = run_select_record("SELECT * FROM Pacientes WHERE id = ?", [pte_id])
+     record.value("paterno")  or  record.value(2)"""
+    query = run_query(_select_str, _values, _conn)
+    record = query.record() if query.first() else None
+    query.finish()
+    return record
+
+def run_insert(_insert_str, _verbose=False, _values=None, _conn=None):
     """returns query to parent module so can get query.lastInsertId(), if needed
      INSERT INTO table (column1 [, column2, column3 ... ]) VALUES (value1 [, value2, value3 ... ])"""
 
-    query = run_query(_insert_str)
+    query = run_query(_insert_str, _values, _conn)
+    note_table_write(_insert_str)
     if _verbose:
         print(F"\n{query.lastQuery()}")
         print(F"[green]INSERT query succesful - inserted to index {query.lastInsertId()}")
     return query
 
-def run_delete(_delete_str, _verbose=False):
+def run_delete(_delete_str, _verbose=False, _values=None, _conn=None):
     """query returned to parent,  in case needed
      DELETE FROM table_name WHERE [condition];"""
 
-    query = run_query(_delete_str)
+    query = run_query(_delete_str, _values, _conn)
+    note_table_write(_delete_str)
     if _verbose:
         print(F"\n{query.lastQuery()}")
         print("[green]DELETE query succesful")
     return query
 
-def run_update(_update_str, _verbose=False):
+def run_update(_update_str, _verbose=False, _values=None, _conn=None):
     """query returned to parent,  in case needed
      UPDATE table_name SET column_name = value [, column_name = value ...] [WHERE condition]"""
 
-    query = run_query(_update_str)
+    query = run_query(_update_str, _values, _conn)
+    note_table_write(_update_str)
     if _verbose:
         print(F"\n{query.lastQuery()}")
         print("[green]UPDATE query succesful")
     return query
 
+if "index management":
+    """Indexes for prefix searches like  paterno LIKE 'Gar%'
+    LIKE is case insensitive,  so SQLite can only use an index for it when the index has NOCASE collation
+    Managed indexes are named  idx_<table>_<column>[_nocase]  and created by managed_index_sql(),
+    so ensure_indexes() can tell them from hand made or migration indexes - only managed ones are ever dropped"""
+    _managed_index_re = re.compile(r"^CREATE INDEX \w+ ON \w+ \((\w+)(?: COLLATE NOCASE)?\)$")
+
+def managed_index_name(_table_name, _column, _nocase=True):
+    return F"idx_{_table_name}_{_column}{'_nocase' if _nocase else ''}".lower()
+
+def managed_index_sql(_table_name, _column, _nocase=True):
+    collate_str = " COLLATE NOCASE" if _nocase else ""
+    return F"CREATE INDEX {managed_index_name(_table_name, _column, _nocase)} ON {_table_name} ({_column}{collate_str})"
+
+def ensure_indexes(_table_name, _columns_lst, _nocase=True, _verbose=False, _conn=None):
+    """creates missing indexes for _columns_lst of _table_name,  drops managed indexes (same collation) for other columns,
+    then refreshes planner statistics (PRAGMA optimize) if anything changed
+    an index only counts as managed if both its name and its SQL are exactly as managed_index_sql() makes them -
+    UNIQUE,  multi column,  partial and hand made indexes,  and those of the other collation,  are left alone"""
+    wanted = {managed_index_name(_table_name, col, _nocase): col for col in _columns_lst}
+
+    query = run_query("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND name LIKE ?",
+                      [_table_name, F"idx_{_table_name.lower()}_%"], _conn)
+    existing = set()
+    managed = set()
+    while query.next():
+        index_name = query.value(0).lower()
+        existing.add(index_name)
+        match = _managed_index_re.match(query.value(1) or "")
+        if match and query.value(1) == managed_index_sql(_table_name, match.group(1), _nocase):
+            managed.add(index_name)
+    query.finish()
+
+    changed = False
+    for index_name in sorted(managed - set(wanted)):
+        run_query(F"DROP INDEX IF EXISTS {index_name}", None, _conn)
+        changed = True
+        if _verbose:
+            print(F"[yellow]dropped index {index_name}")
+
+    for index_name, column in wanted.items():
+        if index_name not in existing:
+            run_query(managed_index_sql(_table_name, column, _nocase), None, _conn)
+            changed = True
+            if _verbose:
+                print(F"[green]created index {index_name}")
+
+    if changed:
+        run_query("PRAGMA optimize", None, _conn).finish()
+
+def explain_query_plan(_select_str, _values=None, _conn=None):
+    """returns list of EXPLAIN QUERY PLAN detail strings,  for example  ['SEARCH Pacientes USING INDEX ...']"""
+    query = run_query(F"EXPLAIN QUERY PLAN {_select_str}", _values, _conn)
+    details = []
+    while query.next():
+        details.append(query.value(3))
+    query.finish()
+    return details
+
+def check_query_plan(_select_str, _values=None, _conn=None):
+    """prints query plan,   with a warning when a filtered (WHERE) query falls back to a full table SCAN"""
+    details = explain_query_plan(_select_str, _values, _conn)
+    has_where = " where " in F" {_select_str.lower()} "
+    for detail in details:
+        if has_where and detail.startswith("SCAN") and "INDEX" not in detail:
+            print(F"[yellow]query plan: {detail}   <- full table scan,  consider ensure_indexes()")
+        else:
+            print(F"[blue]query plan: {detail}")
+    return details
+
+if "full text search":
+    """Optional FTS5 shadow table <table>_fts over some text columns of <table>,  kept in sync by triggers
+    The trigram tokenizer indexes every 3 character substring,  so fragments match anywhere in any of the columns
+    - for example 'arci' finds Garcia in paterno or materno
+    Needs SQLite >= 3.34 compiled with FTS5 - ensure_fts_index() returns False when not available"""
+
+def fts_table_name(_table_name):
+    return F"{_table_name}_fts"
+
+def ensure_fts_index(_table_name, _columns_lst, _verbose=False, _conn=None, _key_column="id"):
+    """creates <table>_fts (external content,  so text is not stored twice) and its insert/delete/update triggers,
+    then fills it from _table_name when newly created - returns True if full text search is available"""
+    if _conn is None:
+        _conn = S.QSqlDatabase.database()
+    fts_name = fts_table_name(_table_name)
+    if fts_name in _conn.tables():
+        return True
+
+    columns_str = ", ".join(_columns_lst)
+    new_str = ", ".join(F"new.{col}" for col in _columns_lst)
+    old_str = ", ".join(F"old.{col}" for col in _columns_lst)
+    statements = [
+        F"CREATE VIRTUAL TABLE {fts_name} USING fts5({columns_str}, "
+        F"content='{_table_name}', content_rowid='{_key_column}', tokenize='trigram')",
+        F"CREATE TRIGGER IF NOT EXISTS {fts_name}_ai AFTER INSERT ON {_table_name} BEGIN "
+        F"INSERT INTO {fts_name} (rowid, {columns_str}) VALUES (new.{_key_column}, {new_str}); END",
+        F"CREATE TRIGGER IF NOT EXISTS {fts_name}_ad AFTER DELETE ON {_table_name} BEGIN "
+        F"INSERT INTO {fts_name} ({fts_name}, rowid, {columns_str}) VALUES ('delete', old.{_key_column}, {old_str}); END",
+        F"CREATE TRIGGER IF NOT EXISTS {fts_name}_au AFTER UPDATE ON {_table_name} BEGIN "
+        F"INSERT INTO {fts_name} ({fts_name}, rowid, {columns_str}) VALUES ('delete', old.{_key_column}, {old_str}); "
+        F"INSERT INTO {fts_name} (rowid, {columns_str}) VALUES (new.{_key_column}, {new_str}); END",
+        F"INSERT INTO {fts_name} ({fts_name}) VALUES ('rebuild')",
+        ]
+
+    _conn.transaction()
+    query = S.QSqlQuery(_conn)
+    for statement in statements:
+        if not query.exec(statement):
+            print(F"[yellow]full text search not available - {query.lastError().text()}")
+            _conn.rollback()
+            return False
+    _conn.commit()
+    if _verbose:
+        print(F"[green]created full text index {fts_name} ({columns_str})")
+    return True
+
+def run_fts_search(_table_name, _search_str, _columns_lst, _limit=200, _conn=None):
+    """returns list of ids matching all words of _search_str,  best matches (bm25 rank) first
+    trigram matching needs 3 characters - shorter words are matched as prefixes of _columns_lst instead,
+    while the longer words are still matched (and ranked) by the full text index
+    % and _ are removed from words - a word of only wildcards is ignored"""
+    words = [word.replace("%", "").replace("_", "") for word in _search_str.split()]
+    words = [word for word in words if word]
+    if not words:
+        return []
+    fts_name = fts_table_name(_table_name)
+    long_words = [word for word in words if len(word) >= 3]
+    short_words = [word for word in words if len(word) < 3]
+
+    # each short word must be the start of one of _columns_lst
+    prefix_str = " AND ".join("(" + " OR ".join(F"{_table_name}.{col} LIKE ?" for col in _columns_lst) + ")"
+                              for word in short_words)
+    prefix_values = [word + "%" for word in short_words for col in _columns_lst]
+
+    if long_words:
+        match_str = " ".join('"' + word.replace('"', '""') + '"' for word in long_words)
+        if short_words:
+            query = run_query(F"SELECT {fts_name}.rowid FROM {fts_name} JOIN {_table_name} ON {_table_name}.rowid = {fts_name}.rowid "
+                              F"WHERE {fts_name} MATCH ? AND {prefix_str} ORDER BY {fts_name}.rank LIMIT ?",
+                              [match_str] + prefix_values + [_limit], _conn)
+        else:
+            query = run_query(F"SELECT rowid FROM {fts_name} WHERE {fts_name} MATCH ? ORDER BY rank LIMIT ?",
+                              [match_str, _limit], _conn)
+    else:
+        query = run_query(F"SELECT rowid FROM {_table_name} WHERE {prefix_str} LIMIT ?", prefix_values + [_limit], _conn)
+
+    ids = []
+    while query.next():
+        ids.append(query.value(0))
+    query.finish()
+    return ids
+
+def run_batch(_sql_template, _rows, _chunk_size=1000, _verbose=False, _conn=None, _progress=None):
+    """runs _sql_template once for each row in _rows (any iterable of value sequences,  consumed as a stream)
+    with one prepared query and _chunk_size rows per explicit transaction
+    A chunk that fails is rolled back and skipped - earlier and later chunks are still committed
+    _progress(rows_done, rows_per_second) is called after each chunk,  if given
+    returns SimpleNamespace(rows_ok, rows_failed, failed_chunks, seconds, rows_per_second)
+
+    Note: QSqlQuery.execBatch() is not used - QSQLITE only emulates it,  and with PySide6 the
+    conversion of the bound value lists is quadratic in chunk size (1.5 s for 4000 rows)"""
+    if _conn is None:
+        _conn = S.QSqlDatabase.database()
+    query = prepared_query(_sql_template, _conn)
+    result = SimpleNamespace(rows_ok=0, rows_failed=0, failed_chunks=[], seconds=0.0, rows_per_second=0.0)
+    start = time.perf_counter()
+
+    rows = iter(_rows)
+    chunk_number = 0
+    while True:
+        chunk = list(islice(rows, _chunk_size))
+        if not chunk:
+            break
+        chunk_number += 1
+
+        _conn.transaction()
+        chunk_ok = True
+        for row in chunk:
+            for pos, value in enumerate(row):
+                query.bindValue(pos, value)
+            if not query.exec():
+                chunk_ok = False
+                break
+
+        if chunk_ok and _conn.commit():
+            result.rows_ok += len(chunk)
+        else:
+            error_str = query.lastError().text() or _conn.lastError().text()
+            _conn.rollback()
+            result.rows_failed += len(chunk)
+            result.failed_chunks.append((chunk_number, error_str))
+            if _verbose:
+                print(F"[red]chunk {chunk_number} rolled back - {error_str}")
+
+        note_table_write(_sql_template)
+        result.seconds = time.perf_counter() - start
+        result.rows_per_second = (result.rows_ok + result.rows_failed) / result.seconds if result.seconds else 0.0
+        if _progress:
+            _progress(result.rows_ok + result.rows_failed, result.rows_per_second)
+
+    if _verbose:
+        print(F"\n{_sql_template}")
+        print(F"[green]batch done - {result.rows_ok} rows ok, {result.rows_failed} failed, "
+              F"{result.seconds:.1f} s, {result.rows_per_second:.0f} rows/s")
+    return result
+
+def run_insert_many(_table_name, _columns_lst, _rows, _chunk_size=1000, _verbose=False, _conn=None, _progress=None):
+    """bulk INSERT of _rows (iterable of value sequences in _columns_lst order) - see run_batch()
+     INSERT INTO table (column1 [, column2 ... ]) VALUES (?, [?, ... ])"""
+    placeholders_str = ", ".join("?" * len(_columns_lst))
+    insert_str = F"INSERT INTO {_table_name} ({', '.join(_columns_lst)}) VALUES ({placeholders_str})"
+    return run_batch(insert_str, _rows, _chunk_size, _verbose, _conn, _progress)
+
+if "keyset pagination":
+    """One page of a (filtered) table at a time,  at the same cost for page 1 or page 10000
+    LIMIT/OFFSET reads and throws away every row before the page,  so it slows down page by page -
+    instead each page continues after the order key of the last row of the previous page:
+        WHERE (filter) AND (paterno, id) > (?, ?) ORDER BY paterno, id LIMIT ?
+    which an index on the order columns answers by seeking straight to the key (see ensure_indexes())
+    Note: the key column (id) is always added as last order column,  so every row has a unique key,
+    and order columns should not contain NULLs - rows with a NULL key can not be paged past"""
+
+def _order_terms(_order_lst, _key_column="id"):
+    """['paterno COLLATE NOCASE', 'nombres DESC'] -> [(expression, descending), ...] plus (_key_column, False)"""
+    terms = []
+    for order_str in _order_lst or []:
+        words = order_str.split()
+        descending = words[-1].upper() == "DESC"
+        if words[-1].upper() in ("ASC", "DESC"):
+            words = words[:-1]
+        terms.append((" ".join(words), descending))
+    if _key_column not in [expression.split()[0] for expression, _descending in terms]:
+        terms.append((_key_column, False))
+    return terms
+
+def _after_key_str(_terms, _reverse):
+    """condition for rows after (before if _reverse) a key - see _after_key_values()
+    starts with a plain range on the first order column,  which is what lets sqlite seek the index -
+    on its own,  neither the row value comparison nor the OR chain is used for an index SEARCH"""
+    def operator(descending):
+        return "<" if descending != _reverse else ">"
+
+    range_str = F"{_terms[0][0]} {operator(_terms[0][1])}= ?"
+    if len({descending for _expression, descending in _terms}) == 1:   # all ASC or all DESC - row value comparison
+        columns_str = ", ".join(expression for expression, _descending in _terms)
+        return F"{range_str} AND ({columns_str}) {operator(_terms[0][1])} ({', '.join('?' * len(_terms))})"
+
+    ors_lst = []   # mixed directions -  a > ? OR (a = ? AND b < ?) OR ...
+    for pos, (expression, descending) in enumerate(_terms):
+        ands_lst = [F"{previous} = ?" for previous, _descending in _terms[:pos]]
+        ands_lst.append(F"{expression} {operator(descending)} ?")
+        ors_lst.append(F"({' AND '.join(ands_lst)})")
+    return F"{range_str} AND ({' OR '.join(ors_lst)})"
+
+def _after_key_values(_after_key, _terms):
+    if len({descending for _expression, descending in _terms}) == 1:
+        return [_after_key[0]] + list(_after_key)
+    return [_after_key[0]] + [value for pos in range(len(_terms)) for value in _after_key[:pos + 1]]
+
+def run_select_page(_table_name, _where_str="", _order_lst=None, _after_key=None, _limit=100, _reverse=False,
+                    _fields_lst=None, _values=None, _conn=None, _key_column="id"):
+    """returns the _limit rows after _after_key in _order_lst order - the first page if _after_key is None
+     _where_str     condition without WHERE,  with ? placeholders for _values if given
+     _order_lst     ['paterno COLLATE NOCASE', 'nombres DESC', ...] - _key_column is added as tie breaker
+     _after_key     first_key or last_key of a page returned before,  for the same table, filter and order
+     _reverse       rows BEFORE _after_key (the previous page) - the last page if _after_key is None
+    rows are always returned in _order_lst order
+    returns SimpleNamespace(headers_lst, rows, first_key, last_key, has_more)
+     has_more       there are more rows after the page (before it,  if _reverse)"""
+    terms = _order_terms(_order_lst, _key_column)
+    fields_str = ", ".join(_fields_lst) if _fields_lst else "*"
+    key_fields_str = ", ".join(expression for expression, _descending in terms)
+
+    conditions_lst = [F"({_where_str})"] if _where_str.strip() else []
+    values = list(_values or [])
+    if _after_key is not None:
+        conditions_lst.append(_after_key_str(terms, _reverse))
+        values += _after_key_values(_after_key, terms)
+    where_str = F"WHERE {' AND '.join(conditions_lst)}" if conditions_lst else ""
+    order_str = ", ".join(F"{expression} {'DESC' if descending != _reverse else 'ASC'}" for expression, descending in terms)
+
+    select_str = F"SELECT {fields_str}, {key_fields_str} FROM {_table_name} {where_str} ORDER BY {order_str} LIMIT ?"
+    query = run_query(select_str, values + [_limit + 1], _conn, "forward only")   # one more row tells if there are more
+
+    record = query.record()
+    columns = record.count() - len(terms)
+    rows, keys = [], []
+    while len(rows) < _limit and query.next():
+        rows.append(tuple(query.value(col) for col in range(columns)))
+        keys.append(tuple(query.value(col) for col in range(columns, record.count())))
+    has_more = query.next()
+    query.finish()
+
+    if _reverse:
+        rows.reverse()
+        keys.reverse()
+    return SimpleNamespace(headers_lst=[record.fieldName(col) for col in range(columns)], rows=rows,
+                           first_key=keys[0] if keys else None, last_key=keys[-1] if keys else None, has_more=has_more)
+
 """Usage Examples
 
 QSqlRecord =  PySide6.QtSql.QSqlDatabase.record(tablename)
@@ -116,12 +734,44 @@ field_names_rec = conn.record(tableName)
 
 query = run_select(F"SELECT COUNT(*) FROM {table} {where_str} ", "verbose")
 total_rows = query.value(0)
+query.finish()
 
 query = run_select(F"SELECT * FROM {table} {where_str} ", not "verbose")
 total_columns = query.record().count()
+query.finish()
 
 query = run_delete(F"DELETE FROM {table} {where_str} ", not "verbose")
 
+# parameterized - prepared once,  then reused from cache
+record = run_select_record("SELECT * FROM Pacientes WHERE id = ?", [pte_id])
+query = run_update("UPDATE Pacientes SET paterno = ? WHERE id = ?", not "verbose", [paterno, pte_id])
+print_prepared_stats()
+
+# bulk insert,  5000 rows per transaction
+result = run_insert_many("Pacientes", ["nombres", "paterno"], [("Ana", "Diaz"), ("Luis", "Rojas")], 5000, "verbose")
+
+# prefix search indexes,  and query plan check
+ensure_indexes("Pacientes", ["nombres", "paterno", "materno"])
+check_query_plan("SELECT * FROM Pacientes WHERE paterno LIKE 'Gar%'")
+
+# fragments of any name column,  ranked
+ensure_fts_index("Pacientes", ["nombres", "paterno", "materno"])
+ids = run_fts_search("Pacientes", "arci mar", ["nombres", "paterno", "materno"])
+
+# has Pacientes changed since a result was read?
+version = result_version("Pacientes")
+...
+if result_version("Pacientes") != version:
+    reload()
+
+# browse a huge list a page at a time - constant cost per page,  unlike LIMIT/OFFSET
+page = run_select_page("Pacientes", "paterno LIKE ?", ["paterno COLLATE NOCASE", "nombres COLLATE NOCASE"], None, 200, False, None, ["Gar%"])
+next_page = run_select_page("Pacientes", "paterno LIKE ?", [...same order...], page.last_key, 200, False, None, ["Gar%"])
+previous_page = run_select_page("Pacientes", "paterno LIKE ?", [...same order...], next_page.first_key, 200, "reverse", None, ["Gar%"])
+
+# in a worker thread - own read only connection,  removed when the thread exits
+query = run_select(F"SELECT * FROM {table} {where_str} ", not "verbose", None, thread_connection("read only"))
+
 
 
 """
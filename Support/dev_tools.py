@@ -32,6 +32,12 @@ verbose = eval("__name__ == '__main__'")    #pylint:disable=eval-used
 if "imports":
     import sys
     import os
+    import importlib.util
+
+    try:
+        from Support.lazy_imports import LazyModule
+    except ModuleNotFoundError:
+        from lazy_imports import LazyModule
 
 if "get shell environment":
     _HOME = os.environ['HOME']
@@ -81,40 +87,105 @@ if "logging":
         print("[red]\n logging module not found - FATAL ERROR"
             "Should have been installed automatically with Python!")
         sys.exit()
+    from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+    import queue
+    import atexit
+    import json
 
     logging.getLogger('asyncio').setLevel(logging.WARNING)
 
     from rich.logging import RichHandler
 
-    logging.basicConfig(
-        level="DEBUG",
-        format = '%(filename)s:%(lineno)d   %(funcName)s      %(message)s',
-        datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True)]
-        )
+    if "logging mode,  from config.json":
+        """ "logging_mode": "development"  (default) - every level,  rendered by rich in the terminal,  as it happens
+            "logging_mode": "production"   - see production_logging() - settings below can be overridden with
+                "logging": {"level": "INFO", "file": "logs/project.log", ...}
+        Note: read with json directly - config_json imports this module"""
+        logging_settings = {
+            "level": "WARNING",              # lower levels are dropped by the logger itself - a log.debug() costs one cached check
+            "file": "logs/project.log",      # relative to the project folder
+            "max_bytes": 1_000_000,          # then rotated to project.log.1 ... project.log.<backup_count>
+            "backup_count": 5,
+            "console_level": "ERROR",        # also shown in the terminal,  through rich
+            }
+        try:
+            with open(F"{_PWD}/config.json", encoding="UTF-8") as config_file:
+                _config_dict = json.load(config_file)
+        except (OSError, ValueError):
+            _config_dict = {}
+        logging_mode = _config_dict.get("logging_mode", "development")
+        logging_settings.update(_config_dict.get("logging", {}))
+
+    class RecordQueueHandler(QueueHandler):
+        """hands records as they are to the listener thread - QueueHandler.prepare() would format the message here,
+        in the calling (GUI) thread,  which is the work this handler is meant to move away
+        Note: so arguments are formatted a little later - do not log objects that are changed right after"""
+        def prepare(self, record):
+            return record
+
+    def production_logging(settings):
+        """GUI thread only puts records in a queue - a QueueListener thread formats them and writes the rotating file
+        returns the listener - stopped (remaining records written) at exit"""
+        log_file = os.path.join(_PWD, settings["file"])
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        file_handler = RotatingFileHandler(log_file, maxBytes=settings["max_bytes"], backupCount=settings["backup_count"],
+                                           encoding="UTF-8", delay=True)
+        file_handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)-8s %(threadName)s %(filename)s:%(lineno)d   %(funcName)s      %(message)s'))
+        console_handler = RichHandler(rich_tracebacks=True, level=settings["console_level"])
+        console_handler.setFormatter(logging.Formatter('%(filename)s:%(lineno)d   %(funcName)s      %(message)s', "[%X]"))
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        logging.basicConfig(level=settings["level"], handlers=[RecordQueueHandler(log_queue)], force=True)
+        return listener
+
+    if logging_mode == "production":
+        log_listener = production_logging(logging_settings)
+    else:
+        log_listener = None
+        logging.basicConfig(
+            level="DEBUG",
+            format = '%(filename)s:%(lineno)d   %(funcName)s      %(message)s',
+            datefmt="[%X]",
+            handlers=[RichHandler(rich_tracebacks=True)]
+            )
 
     log = logging.getLogger("rich")
 
     if verbose:
-        print("\nlogging module        [green]is available and configured")
+        print(F"\nlogging module        [green]is available and configured[/green] - {logging_mode} mode")
         print("[blue]\nlogging examples:")
         log.debug("\ndebug msg")
         log.warning("\nwarning msg")
         log.info("\ninformation msg")
 
 if "ipython":
-    """Improved Python interpreter and debugger"""
+    """Improved Python interpreter and debugger
+    only looked up here - ipdb,  and IPython behind it,  are imported by the first bp() call"""
     # https://ipython.org/install.html
     # https://pypi.org/project/ipdb/
-    try:
-        import ipdb
-        bp = ipdb.set_trace
+    ipdb = LazyModule("ipdb")
+    ipdb_available = importlib.util.find_spec("ipdb") is not None
+
+    def bp():
+        """breakpoint in the calling function - ipdb if available,  else pdb"""
+        frame = sys._getframe(1)        #pylint:disable=protected-access
+        if ipdb_available:
+            ipdb.set_trace(frame)
+        else:
+            import pdb                  #pylint:disable=import-outside-toplevel
+            pdb.Pdb().set_trace(frame)
+
+    if ipdb_available:
         if verbose: print("\nipython and ipdb      [green]are available and configured")
-    except ModuleNotFoundError:
-        bp = breakpoint
+    else:
         print("[yellow]\nOptional IPython support was not found - consider running"
         "    pip3 install -U ipython ipdb")
-    if verbose: print(F"breakpoint() shortcut set to  bp() = {bp.__module__}.{bp.__name__}()\n")
+    if verbose: print(F"breakpoint() shortcut set to  bp() = {'ipdb' if ipdb_available else 'pdb'}.set_trace()\n")
 
 if "custom pylintrc":
     # https://pylint.pycqa.org/en/latest/
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Deferred imports - module proxies that import the real module on first attribute access
+
+For modules only some users ever need - printing,  debugging,  opening help - so startup does not pay for them.
+    P = LazyModule("PySide6.QtPrintSupport")
+    printer = P.QPrinter()            # QtPrintSupport is imported here,  the first time only
+
+Several names can be given,  tried in order - for the usual  Support.x / x  fallback when run from the Support folder
+    screen_print = LazyModule("Support.screen_print", "screen_print")
+
+Note:  `from x import name` can not be deferred this way - keep the module and use module.name
+See benchmarks/bench_imports.py for the import time saved.
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+    #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+
+if "imports":
+    import sys
+    import time
+    import importlib
+    import types
+
+if __name__ == '__main__':
+    print("\nlazy_imports.py not designed as a run alone module\n")
+    sys.exit(0)
+
+class LazyModule(types.ModuleType):
+    """stands in for a module until an attribute is read - then imports it,  and from then on reads from it"""
+
+    def __init__(self, *names):
+        types.ModuleType.__init__(self, names[0])
+        self.__dict__["_names"] = names
+        self.__dict__["_module"] = None
+        self.__dict__["import_ms"] = None       # time taken by the deferred import,  once done
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            start = time.perf_counter()
+            for name in self._names:
+                try:
+                    module = importlib.import_module(name)
+                    break
+                except ModuleNotFoundError as error:
+                    if name != error.name and not name.startswith(F"{error.name}."):
+                        raise      # a missing import inside the module itself - not ours to hide
+            else:
+                raise ModuleNotFoundError(F"No module named {' or '.join(self._names)}", name=self._names[0])
+            self.__dict__["_module"] = module
+            self.__dict__["import_ms"] = (time.perf_counter() - start) * 1000
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, name):    # only called for names not in the proxy itself
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded yet"
+        return F"<lazy module {' or '.join(self._names)} - {state}>"
+
+def loaded_modules(namespace):
+    """{name: import ms or None} of the LazyModules in a module's namespace - eg loaded_modules(vars(Windows))"""
+    return {name: value.import_ms for name, value in namespace.items() if isinstance(value, LazyModule)}
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Paginated PDF report of a (filtered) table,  drawn page by page on a worker thread
+
+Instead of building one QTextDocument holding every cell (see ListWindowDemo.generate_doc()),
+rows are read from a forward only query and painted with QPainter onto a QPdfWriter,  which writes
+each page out as the next one starts - memory use does not depend on the number of rows.
+Each page repeats the title and column headers,  and ends with  page n of N  (N from a COUNT(*)).
+
+Runs like db_export.ListExport - same signals,  cancel() and <file>.part handling.
+
+Usage:
+    from Support.pdf_report import start_pdf_report
+    handle = start_pdf_report("Pacientes", prj.filter_str, "pacientes.pdf", "Pacientes",
+                              None, [50, 300], "ORDER BY id", on_progress=..., on_finished=..., on_failed=...)
+    handle.cancel()
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+    #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+
+if "imports":
+    import os
+    import sys
+    import math
+    import time
+    import datetime
+    from itertools import accumulate
+    from types import SimpleNamespace
+    import PySide6.QtCore as C
+    import PySide6.QtGui as G
+    from PySide6.QtCore import Qt
+
+    try:
+        from Support.dev_tools import console, log, bp, print, inspect
+        from Support.db_methods import run_query
+        from Support.db_export import ListExport, query_rows, progress_seconds
+    except ModuleNotFoundError:
+        from dev_tools import console, log, bp, print, inspect
+        from db_methods import run_query
+        from db_export import ListExport, query_rows, progress_seconds
+
+if __name__ == '__main__':
+    console.clear()
+    print("[red][bold]\npdf_report.py not designed as a run alone module\n")
+    sys.exit(0)
+
+if "report style":
+    """widths_lst are relative - the list widths in pixels can be used as they are,  missing widths get their average"""
+    report_style = SimpleNamespace(
+        page_size=G.QPageSize.A4,
+        landscape=False,
+        margins_mm=(15, 15, 15, 15),      # left, top, right, bottom
+        resolution=300,                   # dpi of the painter coordinates
+        font_family="Helvetica",
+        font_size=9,
+        row_spacing=1.4,                  # row height,  as a multiple of the font height
+        stripe_color="#f0f0f0",           # background of every second row,  easier to follow across a page
+        )
+
+def _column_widths(widths_lst, columns, total_width):
+    widths_lst = list(widths_lst or [])[:columns]
+    default = sum(widths_lst) / len(widths_lst) if widths_lst else 1
+    widths_lst += [default] * (columns - len(widths_lst))
+    scale = total_width / sum(widths_lst)
+    return [int(width * scale) for width in widths_lst]
+
+def draw_report(rows, headers_lst, pdf_file, title="", widths_lst=None, progress=None, total_rows=-1):
+    """paints rows (any iterable of tuples) into pdf_file,  page by page - returns (rows drawn, pages)
+    progress(rows_drawn) is called now and then - raise from it to stop"""
+    style = report_style
+    writer = G.QPdfWriter(pdf_file)
+    writer.setPageSize(G.QPageSize(style.page_size))
+    writer.setPageOrientation(G.QPageLayout.Landscape if style.landscape else G.QPageLayout.Portrait)
+    writer.setPageMargins(C.QMarginsF(*style.margins_mm), G.QPageLayout.Millimeter)
+    writer.setResolution(style.resolution)
+    writer.setTitle(title)
+    writer.setCreator("single_table_template")
+
+    painter = G.QPainter()
+    if not painter.begin(writer):
+        raise OSError(F"can not write {pdf_file}")
+    try:
+        if "layout - in device pixels,  origin at the top left margin":
+            paint_rect = writer.pageLayout().paintRectPixels(writer.resolution())
+            width, height = paint_rect.width(), paint_rect.height()
+            font = G.QFont(style.font_family)
+            font.setPointSizeF(style.font_size)
+            bold_font = G.QFont(font)
+            bold_font.setBold(True)
+            painter.setFont(font)
+            metrics = painter.fontMetrics()
+            row_height = int(metrics.height() * style.row_spacing)
+            padding = metrics.averageCharWidth() // 2
+            header_top = row_height * 2            # title line,  then column headers
+            rows_top = header_top + row_height
+            footer_top = height - row_height
+            rows_per_page = max((footer_top - rows_top) // row_height, 1)
+            total_pages = math.ceil(total_rows / rows_per_page) if total_rows > 0 else None
+
+            widths = _column_widths(widths_lst, len(headers_lst), width)
+            lefts_lst = [0] + list(accumulate(widths))[:-1]
+            stripe_brush = G.QBrush(G.QColor(style.stripe_color))
+            date_str = F"{datetime.datetime.now():%Y-%m-%d %H:%M}"
+
+        def draw_cell(left, top, col_width, text, alignment):
+            cell = C.QRect(left + padding, top, col_width - 2 * padding, row_height)
+            painter.drawText(cell, alignment | Qt.AlignVCenter, metrics.elidedText(text, Qt.ElideRight, cell.width()))
+
+        def draw_page_header():
+            painter.setFont(bold_font)
+            draw_cell(0, 0, width, title, Qt.AlignLeft)
+            painter.setFont(font)
+            draw_cell(0, 0, width, date_str, Qt.AlignRight)
+            painter.setFont(bold_font)
+            for col, header in enumerate(headers_lst):
+                draw_cell(lefts_lst[col], header_top, widths[col], header, Qt.AlignLeft)
+            painter.setFont(font)
+            painter.drawLine(0, rows_top - 1, width, rows_top - 1)
+
+        def draw_page_footer(page):
+            painter.drawLine(0, footer_top, width, footer_top)
+            draw_cell(0, footer_top, width, F"page {page}" + (F" of {total_pages}" if total_pages else ""), Qt.AlignRight)
+
+        page = 0
+        row_in_page = rows_per_page   # first row starts the first page
+        drawn = 0
+        next_report = time.perf_counter() + progress_seconds
+        for row in rows:
+            if row_in_page == rows_per_page:
+                if page:
+                    draw_page_footer(page)
+                    writer.newPage()
+                page += 1
+                row_in_page = 0
+                draw_page_header()
+
+            top = rows_top + row_in_page * row_height
+            if row_in_page % 2:
+                painter.fillRect(0, top, width, row_height, stripe_brush)
+            for col, value in enumerate(row):
+                alignment = Qt.AlignRight if isinstance(value, (int, float)) else Qt.AlignLeft
+                draw_cell(lefts_lst[col], top, widths[col], "" if value is None else str(value), alignment)
+
+            row_in_page += 1
+            drawn += 1
+            if progress and not drawn % 500 and time.perf_counter() >= next_report:
+                progress(drawn)
+                next_report = time.perf_counter() + progress_seconds
+
+        if not page:   # no rows - still one page,  with headers
+            page = 1
+            draw_page_header()
+            draw_cell(0, rows_top, width, "no records", Qt.AlignLeft)
+        draw_page_footer(page)
+    finally:
+        painter.end()   # writes the last page and closes the file
+
+    if progress:
+        progress(drawn)
+    return drawn, page
+
+def write_pdf_report(select_str, values, path, title="", widths_lst=None, progress=None, conn=None, total_rows=-1):
+    """draws the rows of select_str into path (via path.part) - returns SimpleNamespace(path, rows, pages, size, seconds)"""
+    start = time.perf_counter()
+    query = run_query(select_str, values, conn, "forward only")
+    record = query.record()
+    headers_lst = [record.fieldName(col) for col in range(record.count())]
+
+    part_path = F"{path}.part"
+    try:
+        rows, pages = draw_report(query_rows(query), headers_lst, part_path, title, widths_lst, progress, total_rows)
+        os.replace(part_path, path)
+    except BaseException:
+        query.finish()
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return SimpleNamespace(path=path, rows=rows, pages=pages, size=os.path.getsize(path), seconds=time.perf_counter() - start)
+
+class PdfReport(ListExport):
+    """one report,  run by QThreadPool.globalInstance() - also the handle to cancel it
+    signals as db_export.ExportSignals - finished result also has .pages"""
+
+    def __init__(self, table_name, filter_str, path, title="", fields_lst=None, widths_lst=None, order_str=""):
+        ListExport.__init__(self, table_name, filter_str, path, fields_lst, order_str, "pdf")
+        self.title = title
+        self.widths_lst = widths_lst
+
+    def write(self, conn):
+        return write_pdf_report(self.select_str, None, self.path, self.title, self.widths_lst, self._rows_written, conn, self._total)
+
+def start_pdf_report(table_name, filter_str, path, title="", fields_lst=None, widths_lst=None, order_str="",
+                     on_progress=None, on_finished=None, on_failed=None):
+    """starts a PdfReport of table_name filtered by filter_str (as prj.filter_str) in QThreadPool.globalInstance()
+    returns its handle - on_... slots are connected before the worker starts,  so no signal is missed"""
+    handle = PdfReport(table_name, filter_str, path, title, fields_lst, widths_lst, order_str)
+    for signal, slot in ((handle.signals.progress, on_progress), (handle.signals.finished, on_finished),
+                         (handle.signals.failed, on_failed)):
+        if slot is not None:
+            signal.connect(slot)
+    C.QThreadPool.globalInstance().start(handle)
+    return handle
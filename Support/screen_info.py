@@ -5,6 +5,17 @@
 """module to set variables related to window dimensions and icons
     should be imported as
     import screen_info as scr
+
+Nothing is measured at import - the variables below are computed from QGuiApplication.screens()
+the first time they are read (so only after the QApplication exists),  then cached per screen.
+The cache is dropped when a screen is added or removed,  the primary screen changes,  or the
+geometry of any screen changes - the next read recomputes them for the new layout.
+
+    scr.window_rect         default QRect of windows - a copy,  can be changed freely
+    scr.msg_box_rect        default QRect of message boxes,  centered over window_rect
+    scr.screen_number       number of screens
+    scr.screen_width, scr.screen_height,  scr.win_width, scr.win_height,  scr.win_top_margin, scr.win_left_margin
+    scr.screen_rects(screen)     all of the above for a given QScreen
 """
 # pylint disables
     #pylint:disable=redefined-builtin
@@ -14,13 +25,14 @@ if "imports":
 
     import sys
     import os
-    import screeninfo
+    from types import SimpleNamespace
 
     import rich
     from rich import print
     from rich import inspect
     from rich.console import Console
     import PySide6.QtCore as C
+    import PySide6.QtGui as G
 
     console = Console()
 
@@ -29,43 +41,89 @@ if __name__ == '__main__':
     print("screen_info.py - [red]Not for solo run\n")
     sys.exit()
 
-if "screeninfo":
+if "settings":
     """The following variables can be used to position PySide6 windows in different monitors"""
     # https://doc.qt.io/qt-6/qscreen.html
-    # https://pypi.org/project/screeninfo/
-
-    if "set default window dimensiones globally,  for any project,  on any system":
-        """
-        Following calculates a default postion for windows and dependent message boxes, depending on current screen size(s).
-        Adjusts for dual (identical) monitors,  if present ...
-        """
-        screen_number = 0
-        for monitor in screeninfo.get_monitors():
-            #print(monitor)
-            screen_number = screen_number + 1
-
-        if "get screen dimensions":
-            screen_width = int(screeninfo.get_monitors()[0].width)
-            screen_height = int(screeninfo.get_monitors()[0].height)
-
-        if "calculate window dimensions based on screen dimensions":
-            win_width = int(screen_width*0.75)
-            win_height = int(screen_height*.80)
-
-        if "calculate window margins based on window dimensions":
-            win_top_margin = int((screen_height - win_height)/2)
-            win_left_margin = int((screen_width - win_width)/2)
-
-        if "adjust for second monitor,  if present":
-            """assumes dual monitors are equal, putting default windows on second screen"""
-            if screen_number > 1:
-                win_left_margin = screen_width + win_left_margin
-
-        #C.QRect(x, y, w, h)
-        window_rect = C.QRect(win_left_margin, win_top_margin, win_width, win_height)
-
-        msg_box_height = 300
-        msg_box_width = 400
-        _x = win_left_margin + (win_width - msg_box_width)/2
-        _y = win_top_margin + (win_height - msg_box_height)/2
-        msg_box_rect = C.QRect(_x, _y, msg_box_height, msg_box_width)
+
+    window_screen = 1            # index of the screen for default windows - the second one,  if present,  else the primary
+    win_width_ratio = 0.75       # of the available screen width
+    win_height_ratio = 0.80
+    msg_box_width = 400
+    msg_box_height = 300
+    fallback_geometry = C.QRect(0, 0, 1920, 1080)   # before the QApplication exists - not cached
+
+    _rects = {}                  # QScreen -> SimpleNamespace of rects,  see screen_rects()
+    _watched = set()             # QScreens whose signals are connected - names are not unique (eg empty)
+    _app_watched = False
+
+def invalidate(*_args):
+    """drops every cached rect - connected to the screen signals"""
+    _rects.clear()
+
+def _watch_screen(screen):
+    if screen not in _watched:
+        _watched.add(screen)
+        screen.geometryChanged.connect(invalidate)
+        screen.availableGeometryChanged.connect(invalidate)
+
+def _watch_app(app):
+    global _app_watched
+    if not _app_watched:
+        _app_watched = True
+        app.screenAdded.connect(_screen_added)
+        app.screenRemoved.connect(_screen_removed)
+        app.primaryScreenChanged.connect(invalidate)
+
+def _screen_added(screen):
+    _watch_screen(screen)
+    invalidate()
+
+def _screen_removed(screen):
+    _watched.discard(screen)   # a screen plugged in again is a new QScreen - connect that one
+    invalidate()
+
+def default_screen():
+    """QScreen of default windows - None before the QApplication exists"""
+    app = G.QGuiApplication.instance()
+    if app is None:
+        return None
+    _watch_app(app)
+    screens = G.QGuiApplication.screens()
+    return screens[window_screen] if len(screens) > window_screen else G.QGuiApplication.primaryScreen()
+
+def _compute_rects(geometry, screen_number):
+    """rects for a screen with available geometry - window centered on it,  message box centered on the window"""
+    win_width = int(geometry.width() * win_width_ratio)
+    win_height = int(geometry.height() * win_height_ratio)
+    win_left_margin = geometry.left() + (geometry.width() - win_width) // 2
+    win_top_margin = geometry.top() + (geometry.height() - win_height) // 2
+    window_rect = C.QRect(win_left_margin, win_top_margin, win_width, win_height)
+    msg_box_rect = C.QRect(win_left_margin + (win_width - msg_box_width) // 2,
+                           win_top_margin + (win_height - msg_box_height) // 2, msg_box_width, msg_box_height)
+    return SimpleNamespace(screen_number=screen_number, screen_width=geometry.width(), screen_height=geometry.height(),
+                           win_width=win_width, win_height=win_height,
+                           win_top_margin=win_top_margin, win_left_margin=win_left_margin,
+                           window_rect=window_rect, msg_box_rect=msg_box_rect)
+
+def screen_rects(screen=None):
+    """SimpleNamespace of the default rects on screen (default_screen() if None) - computed once per screen
+    Note: QRects in it are shared - copy before changing them,  as the module level names do"""
+    screen = screen or default_screen()
+    if screen is None:
+        return _compute_rects(fallback_geometry, 1)
+
+    rects = _rects.get(screen)
+    if rects is None:
+        _watch_screen(screen)
+        rects = _rects[screen] = _compute_rects(screen.availableGeometry(), len(G.QGuiApplication.screens()))
+    return rects
+
+def __getattr__(name):
+    """module level scr.window_rect etc,  read from the cache - see the module docstring"""
+    if name.startswith("__"):
+        raise AttributeError(name)
+    rects = screen_rects()
+    if not hasattr(rects, name):
+        raise AttributeError(F"module 'screen_info' has no attribute '{name}'")
+    value = getattr(rects, name)
+    return C.QRect(value) if isinstance(value, C.QRect) else value
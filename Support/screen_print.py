@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Screen capture printing - a window to printer,  PDF or PNG,  without blocking data entry
+
+Only the capture runs in the GUI thread:  the window is rendered into a QImage at (at least) twice its
+size,  so text stays sharp on paper,  and a QImage - unlike a QPixmap - can be handed to a worker thread.
+A worker of QThreadPool.globalInstance() then
+    scales the image to fit the page rectangle (only down - up scaling is left to the printer/PDF)
+    paints it on the printer or a QPdfWriter,  or encodes it as PNG
+    writes / spools the result - files go to <file>.part first,  renamed when complete
+and reports the time of each stage in result.timings (milliseconds).
+
+Usage:
+    from Support.screen_print import start_screen_print
+    start_screen_print(window, "pdf", "screen.pdf", None, on_finished, on_failed)
+    start_screen_print(window, "printer", None, printer_from_QPrintDialog, on_finished, on_failed)
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+    #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+
+if "imports":
+    import os
+    import sys
+    import time
+    from types import SimpleNamespace
+    import PySide6.QtCore as C
+    import PySide6.QtGui as G
+    from PySide6.QtCore import Qt
+
+    try:
+        from Support.dev_tools import console, log, bp, print, inspect
+    except ModuleNotFoundError:
+        from dev_tools import console, log, bp, print, inspect
+
+if __name__ == '__main__':
+    console.clear()
+    print("[red][bold]\nscreen_print.py not designed as a run alone module\n")
+    sys.exit(0)
+
+if "page setup of PDF targets":
+    pdf_page_size = G.QPageSize.A4
+    pdf_margins_mm = (10, 10, 10, 10)   # left, top, right, bottom
+    pdf_resolution = 300
+
+def _ms(start):
+    return (time.perf_counter() - start) * 1000
+
+def grab_image(widget, scale=None):
+    """widget rendered into a QImage,  scale times its size - default 2,  or the screen's device pixel ratio if higher"""
+    scale = scale or max(2.0, widget.devicePixelRatioF())
+    image = G.QImage(round(widget.width() * scale), round(widget.height() * scale), G.QImage.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(scale)
+    image.fill(Qt.white)
+    widget.render(image)
+    return image
+
+def fit_rect(image_size, page_rect):
+    """largest rect with the proportions of image_size inside page_rect,  at its top,  centered"""
+    size = image_size.scaled(page_rect.size(), Qt.KeepAspectRatio)
+    return C.QRect(page_rect.left() + (page_rect.width() - size.width()) // 2, page_rect.top(), size.width(), size.height())
+
+class ScreenPrintSignals(C.QObject):
+    finished = C.Signal(object)       # SimpleNamespace(target, path, size, timings)
+    failed = C.Signal(str)
+
+class ScreenPrintJob(C.QRunnable):
+    """scales,  paints/encodes and writes one captured image - run by QThreadPool.globalInstance()"""
+
+    def __init__(self, image, target, path=None, printer=None, timings=None):
+        C.QRunnable.__init__(self)
+        self.setAutoDelete(False)   # python owns the handle - it outlives run()
+        self.signals = ScreenPrintSignals()
+        self.image = image
+        self.target = target        # "printer", "pdf" or "png"
+        self.path = path
+        self.printer = printer      # configured (QPrintDialog) in the GUI thread,  only painted here
+        self.timings = dict(timings or {})
+
+    def _paint_pages(self, device):
+        painter = G.QPainter()
+        if not painter.begin(device):
+            raise OSError(F"can not print to {self.path or 'printer'}")
+        try:
+            start = time.perf_counter()
+            page_rect = device.pageLayout().paintRectPixels(device.resolution())
+            target_rect = fit_rect(self.image.size(), C.QRect(0, 0, page_rect.width(), page_rect.height()))
+            image = self.image
+            if image.width() > target_rect.width():   # never send more pixels than the page can show
+                image = image.scaled(target_rect.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.timings["scale"] = _ms(start)
+
+            start = time.perf_counter()
+            painter.drawImage(target_rect, image)
+            self.timings["render"] = _ms(start)
+        finally:
+            start = time.perf_counter()
+            painter.end()   # encodes and writes the PDF,  or spools the print job
+            self.timings["write"] = _ms(start)
+
+    def run(self):
+        part_path = F"{self.path}.part" if self.path else None
+        try:
+            if self.target == "png":
+                start = time.perf_counter()
+                if not self.image.save(part_path, "PNG"):
+                    raise OSError(F"can not write {self.path}")
+                self.timings["write"] = _ms(start)
+            elif self.target == "pdf":
+                writer = G.QPdfWriter(part_path)
+                writer.setPageSize(G.QPageSize(pdf_page_size))
+                wide = self.image.width() > self.image.height()
+                writer.setPageOrientation(G.QPageLayout.Landscape if wide else G.QPageLayout.Portrait)
+                writer.setPageMargins(C.QMarginsF(*pdf_margins_mm), G.QPageLayout.Millimeter)
+                writer.setResolution(pdf_resolution)
+                writer.setCreator("single_table_template")
+                self._paint_pages(writer)
+            else:
+                self._paint_pages(self.printer)
+
+            if part_path:
+                os.replace(part_path, self.path)
+            size = os.path.getsize(self.path) if self.path else 0
+            self.signals.finished.emit(SimpleNamespace(target=self.target, path=self.path, size=size, timings=self.timings))
+        except OSError as error:
+            if part_path and os.path.exists(part_path):
+                os.remove(part_path)
+            self.signals.failed.emit(F"screen print failed - {error}")
+
+def start_screen_print(widget, target, path=None, printer=None, on_finished=None, on_failed=None, scale=None):
+    """captures widget (in the calling,  GUI thread),  then prints it on a worker - returns the job
+    target "printer" (printer needed),  "pdf" or "png" (path needed)"""
+    start = time.perf_counter()
+    image = grab_image(widget, scale)
+    job = ScreenPrintJob(image, target, path, printer, {"grab": _ms(start)})
+    for signal, slot in ((job.signals.finished, on_finished), (job.signals.failed, on_failed)):
+        if slot is not None:
+            signal.connect(slot)
+    C.QThreadPool.globalInstance().start(job)
+    return job
+
+def timings_str(timings):
+    """'grab 12 ms, scale 3 ms, ...' - grab is the only stage in the GUI thread"""
+    return ", ".join(F"{stage} {ms:.0f} ms" for stage, ms in timings.items())
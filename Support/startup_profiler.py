@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+
+"""Startup profiler - where the time goes between launching a project and its main menu being usable
+
+Enabled by  --profile-startup  on the command line (--profile-startup=startup.json also saves the report),
+otherwise every call below does nothing.  It records wall time of
+    each import of a Support module,  PySide6 module and the main third party packages  (an import hook)
+    any step wrapped in  with profiler.timed("label", "category"):
+    any method wrapped by  profiler.time_method(cls, "name")
+    windows built by profile_windows()
+then report() prints the steps,  slowest first,  and saves them as JSON - to compare releases.
+Nested steps (an import inside an import) are shown with their own time (self) as well as total.
+
+Must be imported before any other Support module,  so it has no imports of its own beyond the standard library.
+
+Usage,  in the main module:
+    from Support.startup_profiler import profiler
+    import Support.check_environ         # timed
+    ...
+    with profiler.timed("open_database", "database"):
+        open_database("archivos.db")
+    profiler.report()
+"""
+# pylint disables
+    #pylint:disable=redefined-builtin
+    #pylint:disable=unused-import
+    #pylint:disable=empty-docstring, missing-function-docstring, missing-class-docstring, useless-suppression
+
+if "imports":
+    import os
+    import sys
+    import time
+    import json
+    import datetime
+    import functools
+    import contextlib
+
+if __name__ == '__main__':
+    print("\nstartup_profiler.py not designed as a run alone module\n")
+    sys.exit(0)
+
+if "settings":
+    profile_option = "--profile-startup"
+    tracked_packages = {"PySide6", "rich", "ipdb", "IPython", "pyAesCrypt", "num2words", "sqlite3"}
+
+def _tracked(fullname):
+    """Support modules,  the tracked packages and PySide6.QtXxx modules - not every submodule of rich etc"""
+    return fullname.startswith("Support.") or fullname in tracked_packages \
+        or (fullname.startswith("PySide6.") and fullname.count(".") == 1)
+
+class _ImportTimer():
+    """sys.meta_path finder that finds nothing itself - it asks the other finders,  then wraps the loader's exec_module()"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        if not _tracked(fullname):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if loader is not None and hasattr(loader, "exec_module"):
+            exec_module = loader.exec_module
+
+            def timed_exec_module(module):
+                with self.profiler.timed(fullname, "import"):
+                    exec_module(module)
+            loader.exec_module = timed_exec_module
+        return spec
+
+class StartupProfiler():
+    """see module docstring - one instance,  profiler,  enabled from the command line"""
+
+    def __init__(self, argv):
+        self.start = time.perf_counter()
+        self.entries_lst = []      # dicts:  label, category, start_ms, ms, self_ms
+        self._stack = []           # children time of the steps now running
+        self.json_file = None
+        self.enabled = False
+        for arg in argv:
+            if arg == profile_option or arg.startswith(F"{profile_option}="):
+                self.enabled = True
+                self.json_file = arg.partition("=")[2] or None
+        if self.enabled:
+            sys.meta_path.insert(0, _ImportTimer(self))
+
+    def _ms(self, start):
+        return (time.perf_counter() - start) * 1000
+
+    @contextlib.contextmanager
+    def timed(self, label, category="step"):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            yield
+        finally:
+            children_ms = self._stack.pop()
+            ms = self._ms(start)
+            if self._stack:
+                self._stack[-1] += ms
+            self.entries_lst.append({"label": label, "category": category, "start_ms": round((start - self.start) * 1000, 2),
+                                     "ms": round(ms, 2), "self_ms": round(ms - children_ms, 2)})
+
+    def time_method(self, cls, name, label=None):
+        """replaces cls.name by a timed version - only when enabled"""
+        if not self.enabled:
+            return
+        method = getattr(cls, name)
+
+        @functools.wraps(method)
+        def timed_method(*args, **kwargs):
+            with self.timed(label or F"{cls.__name__}.{name}", "method"):
+                return method(*args, **kwargs)
+        setattr(cls, name, timed_method)
+
+    def summary(self):
+        return {
+            "date": F"{datetime.datetime.now():%Y-%m-%d %H:%M:%S}",
+            "python": sys.version.split()[0],
+            "argv": sys.argv,
+            "total_ms": round(self._ms(self.start), 2),
+            "entries": sorted(self.entries_lst, key=lambda entry: entry["self_ms"], reverse=True),
+            }
+
+    def report(self, limit=40):
+        """prints the slowest steps (by their own time),  saves all of them to the --profile-startup=<file> given"""
+        if not self.enabled:
+            return None
+        summary = self.summary()
+        print(F"\nstartup profile - {summary['total_ms']:.0f} ms from first import to report,  "
+              F"{len(self.entries_lst)} steps,  slowest first")
+        print(F"  {'self ms':>9} {'total ms':>9} {'at ms':>8}  {'category':<10} step")
+        for entry in summary["entries"][:limit]:
+            print(F"  {entry['self_ms']:9.1f} {entry['ms']:9.1f} {entry['start_ms']:8.0f}  {entry['category']:<10} {entry['label']}")
+        by_category = {}
+        for entry in self.entries_lst:
+            by_category[entry["category"]] = by_category.get(entry["category"], 0.0) + entry["self_ms"]
+        print("  by category: " + ",  ".join(F"{category} {ms:.0f} ms" for category, ms in
+                                              sorted(by_category.items(), key=lambda item: item[1], reverse=True)))
+        if self.json_file:
+            with open(self.json_file, "w", encoding="UTF-8") as file:
+                json.dump(summary, file, indent=2)
+            print(F"  saved to {os.path.abspath(self.json_file)}")
+        return summary
+
+def profile_windows(namespaces_lst):
+    """builds every window still pending in namespaces_lst (see Windows.LazyNamespace) now,  timing each constructor
+    - only when enabled:  the profile then covers all windows,  instead of leaving them to prewarm()"""
+    if not profiler.enabled:
+        return
+    for namespace in namespaces_lst:
+        for name in namespace.pending():
+            with profiler.timed(name, "window"):
+                namespace.build(name)
+
+profiler = StartupProfiler(sys.argv)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark - daily full gzip backups (db_backup.OnlineBackup) against the incremental page store (backup_store)
+
+Creates a throw away Pacientes database,  then simulates a number of office days - each day some records
+are edited and some added - and after each day takes both kinds of backup,  printing time per backup
+and total disk used so far.  Finally restores the last snapshot and checks it.
+
+Run from the project folder:
+    python3 benchmarks/bench_backup_store.py [rows] [days]
+"""
+#pylint:disable=redefined-builtin, wrong-import-position
+
+if "imports":
+    import os
+    import sys
+    import gzip
+    import shutil
+    import random
+    import sqlite3
+    import tempfile
+    import datetime
+    import time
+
+    sys.path.insert(0, os.getcwd())
+    from Support.db_backup import online_copy, check_integrity
+    from Support.backup_store import add_snapshot, restore_snapshot, store_size
+    from Support.dev_tools import print
+
+edits_per_day = 300
+inserts_per_day = 200
+
+def fake_row(rnd, row):
+    names = ["Maria", "Jose", "Juan", "Ana", "Luis", "Carmen", "Pedro", "Rosa", "Jorge", "Elena"]
+    surnames = ["Garcia", "Rodriguez", "Lopez", "Diaz", "Rojas", "Perez", "Gonzalez", "Sanchez", "Ramirez", "Torres"]
+    return (rnd.choice(names), rnd.choice(surnames), rnd.choice(surnames),
+            F"19{rnd.randrange(30, 99)}-{rnd.randrange(1, 13):02}-{rnd.randrange(1, 29):02}",
+            str(1000000 + row), F"2022-{rnd.randrange(1, 13):02}-{rnd.randrange(1, 29):02}")
+
+def office_day(db_file, rnd, total_rows):
+    conn = sqlite3.connect(db_file)
+    for _edit in range(edits_per_day):
+        conn.execute("UPDATE Pacientes SET ultima = ? WHERE id = ?",
+                     (F"2023-{rnd.randrange(1, 13):02}-{rnd.randrange(1, 29):02}", rnd.randrange(1, total_rows)))
+    conn.executemany("INSERT INTO Pacientes (nombres, paterno, materno, cumpleanos, carnet, ultima) VALUES (?, ?, ?, ?, ?, ?)",
+                     [fake_row(rnd, total_rows + row) for row in range(inserts_per_day)])
+    conn.commit()
+    conn.close()
+    return total_rows + inserts_per_day
+
+def full_backup(db_file, folder, day):
+    backup_path = os.path.join(folder, F"archivos_{day:%Y-%m-%d}.db")
+    online_copy(db_file, backup_path, 1024, None, 0)
+    check_integrity(backup_path)
+    with open(backup_path, "rb") as file, gzip.open(F"{backup_path}.gz", "wb", compresslevel=6) as gz_file:
+        shutil.copyfileobj(file, gz_file, 1024 * 1024)
+    os.remove(backup_path)
+
+def incremental_backup(db_file, store, day):
+    os.makedirs(store, exist_ok=True)
+    copy_file = os.path.join(store, "copy.db")
+    online_copy(db_file, copy_file, 1024, None, 0)
+    check_integrity(copy_file)
+    result = add_snapshot(store, copy_file, "archivos", day)
+    os.remove(copy_file)
+    return result
+
+def folder_size(folder):
+    return sum(os.path.getsize(os.path.join(path, name)) for path, _dirs, files in os.walk(folder) for name in files)
+
+def run_benchmark(total_rows, days, folder):
+    db_file = os.path.join(folder, "archivos.db")
+    full_folder = os.path.join(folder, "full")
+    store = os.path.join(folder, "store")
+    os.makedirs(full_folder)
+    rnd = random.Random(42)
+
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE Pacientes (id INTEGER PRIMARY KEY, nombres TEXT, paterno TEXT, materno TEXT, "
+                 "cumpleanos TEXT, carnet TEXT, ultima TEXT)")
+    conn.executemany("INSERT INTO Pacientes (nombres, paterno, materno, cumpleanos, carnet, ultima) VALUES (?, ?, ?, ?, ?, ?)",
+                     (fake_row(rnd, row) for row in range(total_rows)))
+    conn.commit()
+    conn.close()
+
+    print(F"\n[bold]{total_rows:,} rows,  {os.path.getsize(db_file) / 2**20:.1f} MB database,  "
+          F"{edits_per_day} edits + {inserts_per_day} inserts a day")
+    print("  day   avg s    full MB total   avg s    new pages     incr MB total")
+    first_day = datetime.datetime(2024, 1, 1, 20, 0)
+    full_seconds = incr_seconds = 0.0
+    for day_number in range(days):
+        day = first_day + datetime.timedelta(days=day_number)
+        if day_number:
+            total_rows = office_day(db_file, rnd, total_rows)
+
+        start = time.perf_counter()
+        full_backup(db_file, full_folder, day)
+        full_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = incremental_backup(db_file, store, day)
+        incr_seconds += time.perf_counter() - start
+
+        print(F"  {day_number + 1:3}   {full_seconds / (day_number + 1):6.2f}   {folder_size(full_folder) / 2**20:13.1f}    "
+              F"{incr_seconds / (day_number + 1):6.2f}   {result.new_pages:5} / {result.pages:<5}  {store_size(store) / 2**20:13.1f}")
+
+    start = time.perf_counter()
+    restored_file = os.path.join(folder, "restored.db")
+    restore_snapshot(store, result.manifest, restored_file)
+    check_integrity(restored_file)
+    print(F"  restore of last snapshot + integrity check {time.perf_counter() - start:.2f} s")
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 14
+    with tempfile.TemporaryDirectory() as tmp_folder:
+        run_benchmark(rows, days, tmp_folder)
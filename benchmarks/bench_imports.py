@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark - import time of the project's startup modules,  with and without deferred imports (Support/lazy_imports)
+
+Each run is a fresh interpreter that imports what single_table_template.py imports at startup, then
+    lazy     as shipped - printing, debugging and help modules left to LazyModule proxies
+    eager    the same,  plus an explicit import of those modules - as every startup paid before
+and prints the median import time of each,  and which deferred modules a lazy startup loaded anyway.
+
+Run from the project folder:
+    python3 benchmarks/bench_imports.py [runs]
+"""
+#pylint:disable=redefined-builtin, wrong-import-position
+
+if "imports":
+    import os
+    import sys
+    import json
+    import statistics
+    import subprocess
+    import importlib.util
+
+    sys.path.insert(0, os.getcwd())
+    from Support.dev_tools import print
+
+startup_imports = ("import PySide6.QtWidgets, PySide6.QtSql, Support.dev_tools, Support.screen_info, Support.msg_boxes, "
+                   "Support.db_methods, Support.Windows, Support.LoginMenus, Support.csv_import, Support.db_async, "
+                   "Support.db_backup, Support.db_export, Support.TypeAhead")
+deferred_modules = ["PySide6.QtPrintSupport", "Support.screen_print", "Support.pdf_report",
+                    "subprocess", "ipdb"]     # ipdb also imports IPython
+
+child_code = """
+import sys, time, json
+sys.path.insert(0, {cwd!r})
+start = time.perf_counter()
+{imports}
+ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": ms, "loaded": [name for name in {deferred!r} + ["IPython"] if name in sys.modules]}}))
+"""
+
+def run_child(imports):
+    code = child_code.format(cwd=os.getcwd(), imports=imports, deferred=deferred_modules)
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                               env=dict(os.environ, QT_QPA_PLATFORM="offscreen"))
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run_benchmark(runs):
+    available = [name for name in deferred_modules if importlib.util.find_spec(name.split(".")[0]) is not None]
+    eager_imports = F"{startup_imports}\nimport {', '.join(available)}"
+    lazy_ms, eager_ms = [], []
+    loaded = set()
+    run_child(startup_imports)      # warm the file system cache and __pycache__ first
+    for _run in range(runs):        # alternated,  so both see the same machine load
+        result = run_child(startup_imports)
+        lazy_ms.append(result["ms"])
+        loaded.update(result["loaded"])
+        eager_ms.append(run_child(eager_imports)["ms"])
+
+    lazy, eager = statistics.median(lazy_ms), statistics.median(eager_ms)
+    print(F"\n[bold]startup imports,  median of {runs} fresh interpreters")
+    print(F"  eager   {eager:7.1f} ms   (also imports {', '.join(available)})")
+    print(F"  lazy    {lazy:7.1f} ms   saves {eager - lazy:.1f} ms  ({(eager - lazy) / eager:.0%})")
+    print(F"  deferred modules loaded anyway by a lazy startup: {', '.join(sorted(loaded)) or 'none'}")
+    missing = sorted(set(deferred_modules) - set(available))
+    if missing:
+        print(F"  not installed,  so not measured: {', '.join(missing)}")
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark - prefix filters of the form list window,  before and after ensure_indexes()
+
+Creates a throw away Pacientes table with 100k and 1M rows,  then times the
+    SELECT * FROM Pacientes WHERE paterno LIKE 'Gar%'
+style queries generated by PteFields.pte_update_filters(),  as a full table SCAN
+and again as an index SEARCH (NOCASE indexes from db_methods.ensure_indexes())
+
+Run from the project folder:
+    python3 benchmarks/bench_prefix_indexes.py [rows ...]
+"""
+#pylint:disable=redefined-builtin, wrong-import-position
+
+if "imports":
+    import os
+    import sys
+    import random
+    import tempfile
+    import time
+
+    sys.path.insert(0, os.getcwd())
+    import PySide6.QtCore as C
+    from Support.db_methods import open_database, close_all_connections, run_query, run_insert_many, ensure_indexes, explain_query_plan
+    from Support.dev_tools import print
+
+columns_lst = ["nombres", "paterno", "materno", "cumpleanos", "carnet", "ultima"]
+filters_lst = [  # typical typed prefixes,  each matching well under 1% of rows
+    "paterno LIKE 'garcia12%'",
+    "paterno LIKE 'Rojas5%' AND materno LIKE 'Diaz7%'",
+    "cumpleanos LIKE '1975-06-1%'",
+    "carnet LIKE '12345%'",
+    ]
+repeats = 5
+
+def fake_rows(total_rows):
+    names = ["Maria", "Jose", "Juan", "Ana", "Luis", "Carmen", "Pedro", "Rosa", "Jorge", "Elena"]
+    surnames = ["Garcia", "Rodriguez", "Lopez", "Diaz", "Rojas", "Perez", "Gonzalez", "Sanchez", "Ramirez", "Torres"]
+    rnd = random.Random(42)
+    for row in range(total_rows):
+        yield (
+            rnd.choice(names),
+            rnd.choice(surnames) + str(rnd.randrange(1000)),   # keeps prefix matches selective
+            rnd.choice(surnames) + str(rnd.randrange(1000)),
+            F"19{rnd.randrange(30, 99)}-{rnd.randrange(1, 13):02}-{rnd.randrange(1, 29):02}",
+            str(1000000 + row),
+            F"2022-{rnd.randrange(1, 13):02}-{rnd.randrange(1, 29):02}",
+            )
+
+def time_filter(filter_str):
+    best = None
+    for _repeat in range(repeats):
+        start = time.perf_counter()
+        query = run_query(F"SELECT * FROM Pacientes WHERE {filter_str}")
+        rows = 0
+        while query.next():
+            rows += 1
+        query.finish()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rows
+
+def run_benchmark(total_rows, folder):
+    open_database(os.path.join(folder, F"bench_{total_rows}.db"), not "verbose", "office")
+    run_query("CREATE TABLE Pacientes (id INTEGER PRIMARY KEY, nombres TEXT, paterno TEXT, materno TEXT, "
+              "cumpleanos TEXT, carnet TEXT, ultima TEXT)")
+    run_insert_many("Pacientes", columns_lst, fake_rows(total_rows), 20000)
+
+    print(F"\n[bold]{total_rows:,} rows")
+    scans = {filter_str: time_filter(filter_str) for filter_str in filters_lst}
+    ensure_indexes("Pacientes", columns_lst)
+    for filter_str in filters_lst:
+        scan_seconds, rows = scans[filter_str]
+        seek_seconds, _rows = time_filter(filter_str)
+        plan_str = "; ".join(explain_query_plan(F"SELECT * FROM Pacientes WHERE {filter_str}"))
+        print(F"  {filter_str.ljust(50)} {rows:>6} rows   scan {scan_seconds*1000:8.1f} ms   "
+              F"seek {seek_seconds*1000:7.2f} ms   x{scan_seconds/seek_seconds:5.0f}")
+        print(F"  [blue]{plan_str}")
+    close_all_connections()
+
+if __name__ == '__main__':
+    app = C.QCoreApplication(sys.argv[:1])
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            run_benchmark(size, tmp_folder)
@@ -40,27 +40,38 @@ if "imports":
         print("/Support  folder was not found!!")
         sys.exit()
 
+    from Support.startup_profiler import profiler, profile_windows   # first - times the imports below,  with --profile-startup[=file.json]
     import Support.check_environ               #  optional - checks if assumed base environment is available, makes certain initializations
     import Support.screen_info as scr          #  automatically resizes default window relative to dimensions/number of monitor(s)
     import Support.msg_boxes as mbx            #  customized convenience versions of QMessageBox
     from Support.db_methods import *           #  generic wrappers for sqlite SELECT, INSERT, UPDATE commands
     from Support.dev_tools import bp, inspect, console, log, print   # customized development tools
 
-    import webbrowser
-    import subprocess
-    import configparser
     import datetime
-    from shutil import copyfile
 
     import PySide6.QtWidgets      as W
     import PySide6.QtCore         as C
     import PySide6.QtGui          as G
-    import PySide6.QtPrintSupport as P
     import PySide6.QtSql          as S
     from PySide6.QtCore           import Qt
-    from Support.Windows import prj, win, icn   # these are global namespaces, created by and used in Support/Windows and LoginMenu classes
-    from Support.Windows import WindowsNewForm, WindowsUpdateForm, WindowsFormList, WindowsFilterForm, WindowsList, PrintPreview, PrintScreen
-    from Support.LoginMenus import LoginMenu, PasswordEditor, LoginDialog
+    from Support.Windows import prj, win, icn, prewarm, oxygen_folder   # these are global namespaces, created by and used in Support/Windows and LoginMenu classes
+    from Support.Windows import WindowsNewForm, WindowsUpdateForm, WindowsFormList, WindowsFilterForm, WindowsList, ListPager, PrintPreview, PrintScreen
+    from Support.LoginMenus import LoginMenu, PasswordEditor, LoginDialog, DecryptPasswords
+    from Support.csv_import import start_import
+    from Support.db_async import cancel_all_selects
+    from Support.db_backup import start_backup
+    from Support.db_export import start_export
+    from Support.TypeAhead import TypeAhead, prefix_filter_str
+    from Support.lazy_imports import LazyModule
+
+    # pdf reports - imported on first use only,  see Support/lazy_imports.py
+    pdf_report = LazyModule("Support.pdf_report")
+
+if "icons":
+    icn.add(
+        backup_db=F"{oxygen_folder}/categories/system-help.png",
+        export=F"{oxygen_folder}/actions/document-export.png",
+        )
 
 # Pacientes classes
 
@@ -196,56 +207,21 @@ class PteFields():
         self.carnet_led.setText(record.value(5))
         self.ultima_led.setText(record.value(6))
 
+    def pte_filter_values(self):
+        """{column: field text} of the form fields - see TypeAhead.prefix_filter_str()"""
+        return {
+            "id":         self.id_led.text(),
+            "nombres":    self.nombres_led.text(),
+            "paterno":    self.paterno_led.text(),
+            "materno":    self.materno_led.text(),
+            "cumpleanos": self.cumpleanos_led.text(),
+            "carnet":     self.carnet_led.text(),
+            "ultima":     self.ultima_led.text(),
+            }
+
     def pte_update_filters(self):
         """Note: following searches for matches only from begining of field strings """
-        _tmp = ""
-        _str = self.id_led.text().strip()
-        if _str:
-            _tmp = F"id = {int(self.id_led.text())}"
-
-        _str = self.nombres_led.text().strip()
-        if _str:
-            if _tmp:
-                _tmp += F"AND nombres LIKE '{_str}%'"
-            else:
-                _tmp += F"nombres LIKE '{_str}%'"
-
-        _str = self.paterno_led.text().strip()
-        if _str:
-            if _tmp:
-                _tmp += F"AND paterno LIKE '{_str}%'"
-            else:
-                _tmp += F"paterno LIKE '{_str}%'"
-
-        _str =  self.materno_led.text().strip()
-        if _str:
-            if _tmp:
-                _tmp += F"AND materno LIKE '{_str}%'"
-            else:
-                _tmp += F"materno LIKE '{_str}%'"
-
-        _str = self.cumpleanos_led.text().strip()
-        if _str:
-            if _tmp:
-                _tmp += F"AND cumpleanos LIKE '{_str}%'"
-            else:
-                _tmp += F"cumpleanos LIKE '{_str}%'"
-
-        _str = self.carnet_led.text().strip()
-        if _str:
-            if _tmp:
-                _tmp += F"AND carnet LIKE '{_str}%'"
-            else:
-                _tmp += F"carnet LIKE '{_str}%'"
-
-        _str = self.ultima_led.text().strip()
-        if _str:
-            if _tmp:
-                _tmp += F"AND ultima LIKE '{_str}%'"
-            else:
-                _tmp += F"ultima LIKE '{_str}%'"
-
-        return _tmp
+        return prefix_filter_str(self.pte_filter_values())
 
 class PteQueries():
     """Provides methods using SQL to
@@ -258,6 +234,17 @@ class PteQueries():
         self.table_fields_str = "id, nombres, paterno, materno, cumpleanos, carnet, ultima"  # include all table fields
         self.table_name = "Pacientes"
 
+    def pte_field_values(self):
+        """form values in table_fields_str order,  excluding id - bound to ? placeholders in prepared queries"""
+        return [
+            self.nombres_led.text(),
+            self.paterno_led.text(),
+            self.materno_led.text(),
+            self.cumpleanos_led.text(),
+            self.carnet_led.text(),
+            self.ultima_led.text(),
+            ]
+
     def data_is_valid(self):
         if self.paterno_led.text().strip():  # paterno input is required
             return True
@@ -268,17 +255,12 @@ class PteQueries():
     def insert_handler(self):
 
         if self.data_is_valid():
-            insert_values_str = F"\
-                NULL,\
-                '{self.nombres_led.text()}',\
-                '{self.paterno_led.text()}',\
-                '{self.materno_led.text()}',\
-                '{self.cumpleanos_led.text()}',\
-                '{self.carnet_led.text()}',\
-                '{self.ultima_led.text()}' "
-
-            insert_str = F"INSERT INTO Pacientes ({self.table_fields_str}) VALUES ({insert_values_str})"
-            query = run_insert(insert_str, not "verbose")
+            insert_str = F"INSERT INTO {self.table_name} ({self.table_fields_str}) VALUES (NULL, ?, ?, ?, ?, ?, ?)"
+            try:
+                query = run_insert(insert_str, not "verbose", self.pte_field_values())
+            except DatabaseBusy as error:
+                mbx.warning(F"Insert UNsuccessful - database busy,  try again<br>{error}")
+                return
             if query:
                 mbx.notify("Insert successful")
                 self.previous_win_handler()
@@ -290,8 +272,12 @@ class PteQueries():
             mbx.unauthorized(prj.current_user_name)
             return
         if mbx.confirm("Confirm?"):
-            delete_str = F"DELETE FROM Pacientes WHERE  id = {int(self.id_led.text())}"
-            query = run_delete(delete_str, not "verbose")
+            delete_str = F"DELETE FROM {self.table_name} WHERE id = ?"
+            try:
+                query = run_delete(delete_str, not "verbose", [int(self.id_led.text())])
+            except DatabaseBusy as error:
+                mbx.warning(F"Record NOT deleted - database busy,  try again<br>{error}")
+                return
             if query:
                 mbx.notify("Record deleted")
                 self.previous_win_handler()
@@ -301,14 +287,13 @@ class PteQueries():
     def update_handler(self):
         if self.data_is_valid():
             update_str = F"UPDATE {self.table_name} SET\
-                nombres = '{self.nombres_led.text()}',\
-                paterno = '{self.paterno_led.text()}',\
-                materno = '{self.materno_led.text()}',\
-                cumpleanos = '{self.cumpleanos_led.text()}', \
-                carnet = '{self.carnet_led.text()}',\
-                ultima = '{self.ultima_led.text()}'\
-                WHERE id = {int(self.id_led.text())}"
-            query = run_update(update_str, not "verbose")
+                nombres = ?, paterno = ?, materno = ?, cumpleanos = ?, carnet = ?, ultima = ?\
+                WHERE id = ?"
+            try:
+                query = run_update(update_str, not "verbose", self.pte_field_values() + [int(self.id_led.text())])
+            except DatabaseBusy as error:
+                mbx.warning(F"Update NOT saved - database busy,  try again<br>{error}")
+                return
             if query:
                 mbx.notify("Update saved")
                 self.previous_win_handler()
@@ -327,20 +312,94 @@ class LoginMenuDemo(LoginMenu, PteMenus):
         # update root menu
 
         self.backup_db_act = G.QAction("Respaldar database")
-        self.backup_db_act.setIcon(G.QIcon("Support/icons/system-help.png"))
+        self.backup_db_act.setIcon(icn.backup_db)
         self.backup_db_act.triggered.connect(self.backup_db_handler)
         self.root_mnu.addAction(self.backup_db_act)
 
+        self.import_csv_act = G.QAction("Importar pacientes (csv)")
+        self.import_csv_act.setIcon(icn.default_icon)
+        self.import_csv_act.triggered.connect(self.import_csv_handler)
+        self.root_mnu.addAction(self.import_csv_act)
+
     def backup_db_handler(self):
-        """Note:  copyfile() silently overwites any prexisting file with same name"""
-        try:
-            os.mkdir("db_backups")
-        except FileExistsError:
-            ...
-        src = "archivos.db"
-        dest = F"db_backups/archivos_{str(datetime.date.today())}.db"
-        copyfile(src, dest)
-        mbx.notify(F"COPIED - archivos.db copied to \n{dest}")
+        """online backup - consistent even while others keep writing,  see Support/db_backup.py"""
+        if getattr(self, "backup_handle", None) is not None:
+            mbx.notify("A backup is already running")
+            return
+
+        self.backup_progress_dlg = W.QProgressDialog("Copia de seguridad de archivos.db", "Cancelar", 0, 100, self)
+        self.backup_progress_dlg.setWindowTitle("Backup")
+        self.backup_progress_dlg.setMinimumDuration(0)
+        self.backup_progress_dlg.canceled.connect(self.backup_cancel_handler)
+        self.backup_progress_dlg.show()
+        self.backup_handle = start_backup("archivos.db", "db_backups", 256, True, None,
+                                          self.backup_progress_handler, self.backup_stage_handler,
+                                          self.backup_finished_handler, self.backup_failed_handler,
+                                          "db_backups/store")   # incremental - only changed pages are written
+
+    def backup_cancel_handler(self):
+        if self.backup_handle is not None:
+            self.backup_handle.cancel()
+
+    def backup_progress_handler(self, pages_done, pages_total):
+        self.backup_progress_dlg.setMaximum(pages_total)
+        self.backup_progress_dlg.setValue(pages_done)
+
+    def backup_stage_handler(self, stage_str):
+        self.backup_progress_dlg.setLabelText(F"Copia de seguridad de archivos.db - {stage_str}")
+        if stage_str != "copying":
+            self.backup_progress_dlg.setRange(0, 0)   # busy indicator,  no page count
+
+    def backup_finished_handler(self, result):
+        self.backup_handle = None
+        self.backup_progress_dlg.reset()
+        mbx.notify(F"COPIED - archivos.db saved as <br>{result.path}<br>"
+                   F"{result.pages} pages,  {result.size / 2**20:.2f} MB written,  {result.seconds:.1f} s<br>"
+                   F"{len(result.deleted_lst)} old backups rotated out<br>"
+                   F"restore with:  python3 Support/backup_store.py restore {os.path.basename(result.path)} <new file>")
+
+    def backup_failed_handler(self, error_str):
+        self.backup_handle = None
+        self.backup_progress_dlg.reset()
+        mbx.warning(error_str)
+
+    def import_csv_handler(self):
+        """csv columns must be  nombres, paterno, materno, cumpleanos, carnet, ultima  - in this order without a header row,
+        in any order with one (other columns,  like the id of an exported list,  are ignored)
+        runs on a worker thread - see Support/csv_import.py"""
+        if getattr(self, "import_handle", None) is not None:
+            mbx.notify("An import is already running")
+            return
+        csv_file, _filter = W.QFileDialog.getOpenFileName(self, "Importar pacientes", os.getcwd(), "CSV (*.csv)")
+        if not csv_file:
+            return
+
+        self.import_progress_dlg = W.QProgressDialog(F"Importando {os.path.basename(csv_file)}", "Cancelar", 0, 0, self)
+        self.import_progress_dlg.setWindowTitle("Import")
+        self.import_progress_dlg.setMinimumDuration(500)
+        self.import_progress_dlg.canceled.connect(self.import_cancel_handler)
+        columns_lst = ["nombres", "paterno", "materno", "cumpleanos", "carnet", "ultima"]
+        self.import_handle = start_import(csv_file, "Pacientes", columns_lst, 5000,
+                                          self.import_progress_handler, self.import_finished_handler, self.import_failed_handler)
+
+    def import_cancel_handler(self):
+        if self.import_handle is not None:
+            self.import_handle.cancel()
+
+    def import_progress_handler(self, rows_done, rows_per_second):
+        self.import_progress_dlg.setLabelText(F"Importando - {rows_done} rows,  {rows_per_second:.0f} rows/s")
+
+    def import_finished_handler(self, result):
+        self.import_handle = None
+        self.import_progress_dlg.reset()
+        mbx.notify(F"{result.rows_ok} rows imported,  {result.rows_per_second:.0f} rows/s<br>"
+                   F"{result.rows_failed} rows in {len(result.failed_chunks)} failed chunks rolled back<br>"
+                   F"{len(result.rejected_lines)} malformed lines skipped")
+
+    def import_failed_handler(self, error_str):
+        self.import_handle = None
+        self.import_progress_dlg.reset()
+        mbx.warning(error_str)
 
 class NewFormDemo(PteQueries, PteFields, WindowsNewForm):
     """Window with an empty form to accept data for a new Paciente record"""
@@ -423,20 +482,48 @@ class UpdateFormDemo(PteQueries, PteFields, WindowsUpdateForm, PrintScreen):
 class FormListWindowDemo(PteFields, WindowsFormList):
     """A dual Form and List Window <p>
     to display a list of records, <p>
-    filtered by contents of the form fields"""
+    filtered by contents of the form fields,<p>
+    or by fragments of any name typed in the quick search box"""
     def __init__(self):
         WindowsFormList.__init__(self)
         PteFields.__init__(self)
 
+        # quick search - needs full text index,  see ensure_fts_index() at startup
+
+        self.quick_search_lbl = W.QLabel("buscar nombre")
+        self.quick_search_led = W.QLineEdit()
+        self.quick_search_led.setPlaceholderText("parte de nombres, paterno o materno")
+        self.quick_search_led.setFixedWidth(440)
+        self.quick_search_led.setVisible(prj.fts_available)
+        self.quick_search_lbl.setVisible(prj.fts_available)
+        self.form_grid_layout.addWidget(self.quick_search_lbl, 0, 0)
+        self.form_grid_layout.addWidget(self.quick_search_led, 0, 1)
+        self.quick_search_led.installEventFilter(self)
+
         for field in iter(self.form_fields_lst):
             field.installEventFilter(self)
 
+        # type ahead - list is refreshed when typing pauses,  not on every key release
+
+        self.fields_type_ahead = TypeAhead(self.list_widget, self.fields_load_handler)
+        self.quick_search_type_ahead = TypeAhead(self.list_widget, self.quick_search_load_handler, 150, not "narrow")
+
     def eventFilter(self, obj, event):
 
+        if obj is self.quick_search_led and event.type() is C.QEvent.KeyRelease:
+            self.fields_type_ahead.cancel()
+            self.remove_filter_act.setEnabled(True)
+            if any(field.text() for field in self.form_fields_lst):
+                self.set_form_fields_to_default_values()
+            self.quick_search_type_ahead.request({"nombre": self.quick_search_led.text()})
+
         if obj in self.form_fields_lst and event.type() is C.QEvent.KeyRelease:
+            self.quick_search_type_ahead.cancel()
+            if self.quick_search_led.text():
+                self.quick_search_led.clear()
             self.remove_filter_act.setEnabled(True)
             self.cal01.setVisible(False)
-            self.update_list_widget("Pacientes", self.pte_update_filters(), [], [50, 300], not "verbose")
+            self.fields_type_ahead.request(self.pte_filter_values())
 
         if obj is self.ultima_led and event.type() is C.QEvent.MouseButtonRelease:
             self.cal01.setVisible(True)
@@ -445,21 +532,34 @@ class FormListWindowDemo(PteFields, WindowsFormList):
 
     def showEvent(self, event):
         self.cal01.setVisible(False)
-        self.set_form_fields_to_default_values()
-        self.update_list_widget("Pacientes", "", None, [50, 300], not "verbose")
-        self.set_toolbar_to_default_mode()
-        self.remove_filter_handler()
+        self.remove_filter_handler()   # also (re)loads the unfiltered list - from the result cache if Pacientes unchanged
 
     # handlers
 
+    def fields_load_handler(self, filters_dict):
+        self.update_list_widget("Pacientes", prefix_filter_str(filters_dict), None, [50, 300], not "verbose")
+
+    def quick_search_load_handler(self, filters_dict):
+        if filters_dict:
+            ids = run_fts_search("Pacientes", filters_dict["nombre"], ["nombres", "paterno", "materno"])
+            ids_str = ",".join(map(str, ids))
+            # IN () has no order of its own - keep the best matches (bm25 rank) first
+            self.update_list_widget("Pacientes", F"id IN ({ids_str})", None, [50, 300], not "verbose",
+                                    F"ORDER BY instr(',{ids_str},', ',' || id || ',')")
+        else:
+            self.update_list_widget("Pacientes", "", None, [50, 300], not "verbose")
+
     def remove_filter_handler(self):
+        self.fields_type_ahead.cancel()
+        self.quick_search_type_ahead.cancel()
+        self.quick_search_led.clear()
         self.update_list_widget("Pacientes", "", None, [50, 300], not "verbose")
         self.set_form_fields_to_default_values()
         self.set_toolbar_to_default_mode()
 
     def list_widget_click_handler(self, row, col):
         pte_id = self.list_widget.item(row, 0).text()
-        prj.current_record = run_select(F"SELECT * FROM Pacientes WHERE id = {pte_id}")
+        prj.current_record = run_select_record("SELECT * FROM Pacientes WHERE id = ?", [int(pte_id)])
         self.next_win_handler(prj.update_form_demo)
 
     def open_new_form_handler(self):
@@ -471,8 +571,9 @@ class FormListWindowDemo(PteFields, WindowsFormList):
     def pte_update_ultima_handler(self):
         self.ultima_led.setText(self.cal01.selectedDate().toString(Qt.ISODate))
         self.cal01.setVisible(False)
-        self.remove_filters_act.setEnabled(True)
-        self.update_list_widget("Pacientes", self.pte_update_filters(), None, [50, 300], not "verbose")
+        self.remove_filter_act.setEnabled(True)
+        self.fields_type_ahead.request(self.pte_filter_values())
+        self.fields_type_ahead.refresh()
         self.set_toolbar_to_edit_mode()
 
     def about_win_handler(self):
@@ -524,16 +625,69 @@ class FilterFormDemo(PteFields, WindowsFilterForm):
     def about_win_handler(self):
         mbx.notify(self.__doc__)
 
-class ListWindowDemo(WindowsList, PrintPreview):
-    """Window to show a list of (possibly filtered) records<p>
-     with option to preview/print list as a document"""
+class ListWindowDemo(WindowsList, ListPager, PrintPreview):
+    """Window to show a list of (possibly filtered) records,  a page at a time<p>
+     with option to preview/print the whole filtered list as a document,  or export the whole filtered list to CSV/JSONL/PDF"""
     def __init__(self):
         WindowsList.__init__(self)
+        ListPager.__init__(self, 200)
         PrintPreview.__init__(self)
 
+        self.export_handle = None
+        self.export_act = G.QAction()
+        self.export_act.setIcon(icn.export)
+        self.export_act.triggered.connect(self.export_list_handler)
+        self.export_act.setText({'en':'Export List (CSV, JSONL, PDF)',
+                                 'es':'Exportar Lista (CSV, JSONL, PDF)'}[prj.locale])
+
         self.tool_bar.addAction(self.print_preview_act)
+        self.tool_bar.addAction(self.export_act)
         self.run_filter_act.setVisible(False)
 
+    def export_list_handler(self):
+        """streams every row of prj.filter_str to a file on a worker thread - see Support/db_export.py
+        a .pdf file is a paginated report instead,  drawn page by page - see Support/pdf_report.py"""
+        if self.export_handle is not None:
+            mbx.notify("An export is already running")
+            return
+        export_file, _filter = W.QFileDialog.getSaveFileName(self, "Exportar pacientes", os.path.join(os.getcwd(), "pacientes.csv"),
+                                                              "CSV (*.csv);;JSON lines (*.jsonl);;PDF report (*.pdf)")
+        if not export_file:
+            return
+
+        self.export_progress_dlg = W.QProgressDialog(F"Exportando {os.path.basename(export_file)}", "Cancelar", 0, 0, self)
+        self.export_progress_dlg.setWindowTitle("Export")
+        self.export_progress_dlg.setMinimumDuration(500)
+        self.export_progress_dlg.canceled.connect(self.export_cancel_handler)
+        if export_file.lower().endswith(".pdf"):
+            self.export_handle = pdf_report.start_pdf_report("Pacientes", prj.filter_str, export_file, F"Pacientes - {prj.filter_str}",
+                                                             None, self.list_widths_lst, "ORDER BY id",
+                                                             self.export_progress_handler, self.export_finished_handler, self.export_failed_handler)
+        else:
+            self.export_handle = start_export("Pacientes", prj.filter_str, export_file, None, "ORDER BY id", None,
+                                              self.export_progress_handler, self.export_finished_handler, self.export_failed_handler)
+
+    def export_cancel_handler(self):
+        if self.export_handle is not None:
+            self.export_handle.cancel()
+
+    def export_progress_handler(self, rows_written, rows_total):
+        if rows_total >= 0:
+            self.export_progress_dlg.setMaximum(max(rows_total, 1))
+            self.export_progress_dlg.setValue(min(rows_written, rows_total))
+
+    def export_finished_handler(self, result):
+        self.export_handle = None
+        self.export_progress_dlg.reset()
+        mbx.notify(F"EXPORTED - {result.rows} rows saved as <br>{result.path}<br>"
+                   F"{F'{result.pages} pages,  ' if hasattr(result, 'pages') else ''}"
+                   F"{result.size / 2**20:.2f} MB,  {result.seconds:.1f} s")
+
+    def export_failed_handler(self, error_str):
+        self.export_handle = None
+        self.export_progress_dlg.reset()
+        mbx.warning(error_str)
+
     def generate_doc(self):
         document = G.QTextDocument()
         cursor = G.QTextCursor(document)
@@ -579,27 +733,43 @@ class ListWindowDemo(WindowsList, PrintPreview):
 
         table_format.setColumnWidthConstraints(constraints)
 
-        # create QTextTable
-
-        rows = self.list_widget.rowCount()
-        cols = self.list_widget.columnCount()
-        table = cursor.insertTable(rows, cols, table_format)  # pylint: disable = unused-variable
-        cursor.setCharFormat(char_format)
+        # create QTextTable,  then insert every row of the filtered list - not only the page on screen
+        # rows are read a page at a time,  in the order shown,  so no more than one page of query rows is held
+
+        page = self.list_page
+        table = None
+        after_key = None
+        while True:
+            result = run_select_page(page.table_name, page.where_str, page.order_lst, after_key, 1000, False, page.fields_lst)
+            if not result.rows:
+                break
+            if table is None:
+                table = cursor.insertTable(len(result.rows), len(result.headers_lst), table_format)
+                cursor.setCharFormat(char_format)
+            else:
+                table.appendRows(len(result.rows))
 
-        # insert data to table
+            for row in result.rows:
+                for value in row:
+                    cursor.insertText("" if value is None else str(value))
+                    cursor.movePosition(G.QTextCursor.NextCell)
 
-        for row in range(rows):
-            for col in range(cols):
-                cursor.insertText(self.list_widget.item(row, col).text())
-                cursor.movePosition(G.QTextCursor.NextCell)
+            if not result.has_more:
+                break
+            after_key = result.last_key
 
         return document
 
+    def preview_cache_key(self):
+        page = self.list_page
+        return (page.table_name, page.where_str, tuple(page.order_lst), result_version(page.table_name))
+
     def showEvent(self, event):
         table_name = "Pacientes"
         table_fields_lst = None
         table_fields_width_lst = [50, 300]
-        self.update_list_widget(table_name, prj.filter_str, table_fields_lst, table_fields_width_lst, not "verbose")
+        order_lst = ["id"]
+        self.show_list_page(table_name, prj.filter_str, order_lst, table_fields_lst, table_fields_width_lst)
 
     def about_win_handler(self):
         mbx.notify(self.__doc__)
@@ -629,31 +799,50 @@ if "setStyleSheet for project":
 
 if "start pyside6 application":
 
-    app = W.QApplication()
-    app.setStyleSheet(global_style)
+    with profiler.timed("QApplication()", "qt"):
+        app = W.QApplication()
+        app.setStyleSheet(global_style)
 
     mbx.notify(__doc__)
 
     # open demo database
 
     #log.debug("database opening")
-    open_database("archivos.db", not "verbose")  # update to `True` or `"verbose"` for terminal output
-
-    # create project windows
-
-    prj.update_form_demo = UpdateFormDemo()
-    prj.list_window_demo = ListWindowDemo()
-    prj.form_list_demo = FormListWindowDemo()
-    prj.filter_form_demo = FilterFormDemo()
-    prj.new_form_demo = NewFormDemo()
+    with profiler.timed("open_database", "database"):
+        open_database("archivos.db", not "verbose")  # update to `True` or `"verbose"` for terminal output
+    app.aboutToQuit.connect(cancel_all_selects)      # background list queries first,  they use their own connections
+    app.aboutToQuit.connect(close_all_connections)
+    with profiler.timed("ensure_indexes", "database"):
+        ensure_indexes("Pacientes", ["nombres", "paterno", "materno", "cumpleanos", "carnet", "ultima"])  # for prefix filters
+    with profiler.timed("ensure_fts_index", "database"):
+        prj.fts_available = ensure_fts_index("Pacientes", ["nombres", "paterno", "materno"])           # for quick search
+
+    # register project windows - each is built on first use,  eg by next_win_handler(prj.list_window_demo)
+
+    prj.register("update_form_demo", UpdateFormDemo)
+    prj.register("list_window_demo", ListWindowDemo)
+    prj.register("form_list_demo", FormListWindowDemo)
+    prj.register("filter_form_demo", FilterFormDemo)
+    prj.register("new_form_demo", NewFormDemo)
+
+    win.register("password_editor_win", PasswordEditor)
+    win.register("login_dialog", LoginDialog)
 
     # open main menu
 
-    win.password_editor_win = PasswordEditor()
-    win.login_dialog = LoginDialog()
+    profiler.time_method(DecryptPasswords, "get_password_list")
+    with profiler.timed("main_menu_demo", "window"):
+        prj.main_menu_demo = LoginMenuDemo()
+        prj.main_menu_demo.show()
+
+    # then build the other windows while the event loop is idle,  so their first visit is instant too
 
-    prj.main_menu_demo = LoginMenuDemo()
-    prj.main_menu_demo.show()
+    prj.prewarm_windows = True   # False  ->  each window is only built when first opened
+    if profiler.enabled:
+        profile_windows([prj, win])          # all now,  each timed
+        C.QTimer.singleShot(0, profiler.report)   # once the main menu is painted
+    elif prj.prewarm_windows:
+        prewarm([prj, win], 500, not "verbose")
 
     # set auto logout time
 
@@ -0,0 +1,41 @@
+"""pytest fixtures - run from the project folder:   python3 -m pytest tests"""
+#pylint:disable=redefined-outer-name
+
+import os
+import sys
+import sqlite3
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(scope="session")
+def app():
+    import PySide6.QtWidgets as W     #pylint:disable=import-outside-toplevel
+    return W.QApplication.instance() or W.QApplication([])
+
+@pytest.fixture
+def pacientes_db(tmp_path):
+    """path of a small archivos.db like database - 500 Pacientes"""
+    db_file = str(tmp_path / "archivos.db")
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE Pacientes (id INTEGER PRIMARY KEY, nombres TEXT, paterno TEXT, materno TEXT, "
+                 "cumpleanos TEXT, carnet TEXT, ultima TEXT)")
+    conn.executemany("INSERT INTO Pacientes VALUES (NULL, ?, ?, ?, ?, ?, ?)",
+                     [(F"Nombre{n}", F"Paterno{n % 50}", F"Materno{n % 7}", "2000-01-01", str(n), "2024-01-01")
+                      for n in range(500)])
+    conn.commit()
+    conn.close()
+    return db_file
+
+@pytest.fixture
+def default_connection(app, pacientes_db):
+    """pacientes_db opened as the default connection by db_methods.open_database()"""
+    from PySide6.QtCore import QThreadPool       #pylint:disable=import-outside-toplevel
+    from Support import db_methods, db_async     #pylint:disable=import-outside-toplevel
+    db_methods.open_database(pacientes_db)
+    yield pacientes_db
+    db_async.cancel_all_selects()
+    QThreadPool.globalInstance().waitForDone()   # exports,  imports,  backups
+    db_methods.close_all_connections()
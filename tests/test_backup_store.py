@@ -0,0 +1,38 @@
+"""backup_store - a prune while a snapshot is being written must not delete that snapshot's pages"""
+
+import threading
+
+from Support import backup_store
+
+def test_prune_during_snapshot_keeps_its_pages(pacientes_db, tmp_path, monkeypatch):
+    store = str(tmp_path / "store")
+    first_page_written = threading.Event()
+    finish_snapshot = threading.Event()
+    write_atomic = backup_store._write_atomic     #pylint:disable=protected-access
+
+    def slow_write_atomic(path, data):
+        write_atomic(path, data)
+        if not first_page_written.is_set():
+            first_page_written.set()
+            finish_snapshot.wait(10)
+    monkeypatch.setattr(backup_store, "_write_atomic", slow_write_atomic)
+
+    result = {}
+    snapshot_thread = threading.Thread(target=lambda: result.update(
+        snapshot=backup_store.add_snapshot(store, pacientes_db, "archivos")))
+    snapshot_thread.start()
+    assert first_page_written.wait(10)
+
+    prune_thread = threading.Thread(target=lambda: result.update(prune=backup_store.prune_store(store)))
+    prune_thread.start()
+    prune_thread.join(0.5)
+    assert prune_thread.is_alive(), "prune must wait for the snapshot being written"
+
+    finish_snapshot.set()
+    snapshot_thread.join(10)
+    prune_thread.join(10)
+    assert result["prune"] == ([], 0)
+
+    restored_file = str(tmp_path / "restored.db")
+    backup_store.restore_snapshot(store, result["snapshot"].manifest, restored_file)
+    backup_store.check_integrity(restored_file)
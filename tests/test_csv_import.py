@@ -0,0 +1,41 @@
+"""csv_import - header rows,  and imports on a worker thread"""
+
+import time
+
+import pytest
+import PySide6.QtCore as C
+
+from Support import db_methods
+from Support.csv_import import import_csv, start_import, CsvHeaderError
+
+columns_lst = ["nombres", "paterno", "materno", "cumpleanos", "carnet", "ultima"]
+
+def count_pacientes():
+    record = db_methods.run_select_record("SELECT COUNT(*) FROM Pacientes")
+    return record.value(0)
+
+def test_header_with_a_misspelled_column_is_not_imported(default_connection, tmp_path):
+    csv_file = tmp_path / "legacy.csv"
+    csv_file.write_text("nombres,paterno,materno,cumpleaños,carnet,ultima\nAna,Diaz,Lopez,2000-01-01,1,2020-01-01\n",
+                        encoding="UTF-8")
+    before = count_pacientes()
+    with pytest.raises(CsvHeaderError, match="cumpleanos"):
+        import_csv(str(csv_file), "Pacientes", columns_lst)
+    assert count_pacientes() == before
+
+def test_start_import_runs_on_a_worker(app, default_connection, tmp_path):
+    csv_file = tmp_path / "legacy.csv"
+    csv_file.write_text("id,nombres,paterno,materno,cumpleanos,carnet,ultima\n" +
+                        "".join(F"{n},Ana,Diaz{n},Lopez,2000-01-01,{n},2020-01-01\n" for n in range(1200)), encoding="UTF-8")
+    before = count_pacientes()
+    results, progress = [], []
+    handle = start_import(str(csv_file), "Pacientes", columns_lst, 500, lambda rows, _rate: progress.append(rows),
+                          results.append, results.append)
+    deadline = time.perf_counter() + 10
+    while not results and time.perf_counter() < deadline:
+        app.processEvents(C.QEventLoop.AllEvents, 50)
+    C.QThreadPool.globalInstance().waitForDone()
+    assert results and results[0].rows_ok == 1200, results
+    assert progress == [500, 1000, 1200]
+    assert handle.rows_done == 1200
+    assert count_pacientes() == before + 1200
@@ -0,0 +1,23 @@
+"""db_methods.run_fts_search - short words mixed with long ones"""
+
+import pytest
+
+from Support import db_methods
+
+columns_lst = ["nombres", "paterno", "materno"]
+
+@pytest.fixture
+def fts_index(default_connection):
+    if not db_methods.ensure_fts_index("Pacientes", columns_lst):
+        pytest.skip("SQLite without FTS5 trigram tokenizer")
+
+def test_short_word_keeps_ranking_of_long_words(fts_index):
+    ranked = db_methods.run_fts_search("Pacientes", "Paterno1", columns_lst, 1000)
+    mixed = db_methods.run_fts_search("Pacientes", "Paterno1 No", columns_lst, 1000)
+    assert mixed and mixed == [row_id for row_id in ranked if row_id in set(mixed)]
+    assert not db_methods.run_fts_search("Pacientes", "Paterno1 Zz", columns_lst, 1000)
+
+def test_words_of_only_wildcards_are_ignored(fts_index):
+    assert db_methods.run_fts_search("Pacientes", "% _%", columns_lst) == []
+    assert db_methods.run_fts_search("Pacientes", "%% Paterno1", columns_lst, 1000) == \
+        db_methods.run_fts_search("Pacientes", "Paterno1", columns_lst, 1000)
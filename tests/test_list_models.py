@@ -0,0 +1,37 @@
+"""QueryTableModel result cache"""
+
+import time
+
+import PySide6.QtCore as C
+
+from Support import db_async
+from Support.ListModels import QueryTableModel, result_cache_stats
+
+def wait_until(app, condition, seconds=10):
+    deadline = time.perf_counter() + seconds
+    while not condition() and time.perf_counter() < deadline:
+        app.processEvents(C.QEventLoop.AllEvents, 50)
+    return condition()
+
+def test_failed_async_load_is_not_cached(app, default_connection, monkeypatch):
+    exec_query = db_async.AsyncSelect._exec     #pylint:disable=protected-access
+
+    def failing_exec(self, _offset):
+        self.signals.failed.emit("simulated failure")
+        return None
+    monkeypatch.setattr(db_async.AsyncSelect, "_exec", failing_exec)
+
+    model = QueryTableModel(256, asynchronous=True)
+    failures = []
+    model.load_failed.connect(failures.append)
+    model.set_query("Pacientes", " WHERE paterno LIKE 'Paterno1%'", ["id", "paterno"])
+    assert wait_until(app, lambda: failures)
+    assert model.rowCount() == 0
+
+    monkeypatch.setattr(db_async.AsyncSelect, "_exec", exec_query)
+    hits = result_cache_stats.hits
+    model.set_query("Pacientes", "", ["id"])     # keeps the failed load in the result cache,  if it were complete
+    model.set_query("Pacientes", " WHERE paterno LIKE 'Paterno1%'", ["id", "paterno"])
+    assert result_cache_stats.hits == hits, "a failed load must not be served from the result cache"
+    assert wait_until(app, lambda: model.is_complete())
+    assert model.rowCount() == 110      # Paterno1 and Paterno10..19 - 11 of every 50